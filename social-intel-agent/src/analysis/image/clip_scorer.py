@@ -0,0 +1,167 @@
+import hashlib
+import os
+import threading
+import torch
+from src.analysis.model_registry import model_registry
+from src.analysis.image.preprocessing import PreparedImages
+from src.config.settings import settings
+from src.config.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+DEFAULT_HYPOTHESIS_TEMPLATE = "This is a photo of {}."
+
+class TorchClipEncoder:
+    """CLIP image and text towers of the registry's PyTorch pipeline"""
+
+    backend = "torch"
+
+    def __init__(self, pipe):
+        self._pipe = pipe
+        self.model = pipe.model
+        self.tokenizer = pipe.tokenizer
+        self.image_processor = pipe.image_processor
+        self.logit_scale = self.model.logit_scale.exp().item()
+        self.revision = pipe.revision
+
+    def image_features(self, pixel_values):
+        with self._pipe.lock, torch.inference_mode():
+            return self.model.get_image_features(pixel_values=pixel_values.to(self.model.device)).float().cpu()
+
+    def text_features(self, inputs):
+        with self._pipe.lock, torch.inference_mode():
+            return self.model.get_text_features(**inputs.to(self.model.device)).float().cpu()
+
+
+def load_clip_encoder(model_id: str):
+    """Encoder for the configured inference backend, shared through the model registry"""
+    if settings.inference_backend == "onnx":
+        try:
+            from src.analysis.onnx_backend import OnnxClipEncoder
+            return model_registry.get(f"{model_id}:onnx", lambda: OnnxClipEncoder(model_id), kind="clip-onnx")
+        except Exception as e:
+            logger.warning(f"ONNX backend unavailable for {model_id}, falling back to PyTorch: {e}")
+    return TorchClipEncoder(model_registry.get_pipeline("zero-shot-image-classification", model_id))
+
+
+class ClipScorer:
+    """Scores images against fixed CLIP label sets with one vision pass per image.
+
+    Label sets are encoded once when registered (and persisted to disk), so
+    scoring an image costs a single image-encoder forward pass plus one
+    similarity matrix that is softmaxed per label set.
+    """
+
+    def __init__(self, model_id: str = "openai/clip-vit-base-patch32",
+                 hypothesis_template: str = DEFAULT_HYPOTHESIS_TEMPLATE):
+        self.model_id = model_id
+        self.hypothesis_template = hypothesis_template
+        self.encoder = load_clip_encoder(model_id)
+        self.tokenizer = self.encoder.tokenizer
+        self.image_processor = self.encoder.image_processor
+        self.logit_scale = self.encoder.logit_scale
+        self._label_sets = {}
+        self._text_matrix = None
+        self._lock = threading.Lock()
+
+    def register_label_set(self, name: str, labels: list):
+        """Encode ``labels`` once (or load them from disk) under ``name``"""
+        with self._lock:
+            existing = self._label_sets.get(name)
+            if existing and existing["labels"] == list(labels):
+                return
+            embeds = self._load_or_encode(list(labels))
+            self._label_sets[name] = {"labels": list(labels), "embeds": embeds}
+            self._rebuild_text_matrix()
+
+    def embed_images(self, images):
+        """L2-normalised image embeddings, one row per image, in a single forward pass.
+
+        ``images`` is a list of PIL images or a PreparedImages batch shared
+        with the other image models.
+        """
+        prepared = images if isinstance(images, PreparedImages) else PreparedImages(images)
+        embeds = self.encoder.image_features(prepared.pixel_values(self.image_processor))
+        return embeds / embeds.norm(dim=-1, keepdim=True)
+
+    def score_images(self, images, set_names: list = None):
+        """Per image, a ``{set_name: {"labels", "scores"}}`` dict sorted by score"""
+        if not len(images):
+            return []
+        return self.score_embeddings(self.embed_images(images), set_names)
+
+    def score_embeddings(self, image_embeds, set_names: list = None):
+        with self._lock:
+            text_matrix = self._text_matrix
+            label_sets = dict(self._label_sets)
+        if text_matrix is None:
+            return [{} for _ in range(image_embeds.shape[0])]
+
+        # One similarity matrix against every registered label at once
+        logits = self.logit_scale * image_embeds @ text_matrix["embeds"].T
+
+        results = []
+        for row in logits:
+            per_set = {}
+            for name, (start, end) in text_matrix["slices"].items():
+                if set_names and name not in set_names:
+                    continue
+                scores = row[start:end].softmax(dim=-1).tolist()
+                ranked = sorted(zip(label_sets[name]["labels"], scores), key=lambda item: item[1], reverse=True)
+                per_set[name] = {
+                    "labels": [label for label, _ in ranked],
+                    "scores": [score for _, score in ranked]
+                }
+            results.append(per_set)
+        return results
+
+    def _rebuild_text_matrix(self):
+        slices = {}
+        blocks = []
+        offset = 0
+        for name, label_set in self._label_sets.items():
+            count = label_set["embeds"].shape[0]
+            slices[name] = (offset, offset + count)
+            blocks.append(label_set["embeds"])
+            offset += count
+        self._text_matrix = {"embeds": torch.cat(blocks), "slices": slices}
+
+    def _load_or_encode(self, labels: list):
+        path = self._cache_path(labels)
+        if os.path.exists(path):
+            try:
+                return torch.load(path)
+            except Exception as e:
+                logger.warning(f"Ignoring unreadable CLIP label cache {path}: {e}")
+
+        embeds = self._encode_texts([self.hypothesis_template.format(label) for label in labels])
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            torch.save(embeds, path)
+        except Exception as e:
+            logger.warning(f"Could not persist CLIP label embeddings to {path}: {e}")
+        return embeds
+
+    def _encode_texts(self, texts: list):
+        inputs = self.tokenizer(texts, padding=True, return_tensors="pt")
+        embeds = self.encoder.text_features(inputs)
+        return embeds / embeds.norm(dim=-1, keepdim=True)
+
+    def _cache_path(self, labels: list) -> str:
+        # Quantized towers produce slightly different embeddings, so each backend has its own cache;
+        # the revision keeps a re-pinned checkpoint under the same id from reusing old embeddings
+        key = [self.model_id, self.encoder.revision, self.encoder.backend, self.hypothesis_template] + labels
+        digest = hashlib.sha1("\n".join(key).encode()).hexdigest()[:16]
+        safe_model = self.model_id.replace("/", "--")
+        return os.path.join(settings.clip_embedding_cache_dir, f"{safe_model}-{digest}.pt")
+
+
+_scorers = {}
+_scorers_lock = threading.Lock()
+
+def get_clip_scorer(model_id: str = "openai/clip-vit-base-patch32"):
+    """Shared scorer for ``model_id``; the underlying weights come from the model registry"""
+    with _scorers_lock:
+        if model_id not in _scorers:
+            _scorers[model_id] = ClipScorer(model_id)
+        return _scorers[model_id]
@@ -1,9 +1,16 @@
-import requests
 from PIL import Image
 from io import BytesIO
 from bs4 import BeautifulSoup
+from src.services.http_client import http_client
+from src.services.inference_executor import inference_executor
+from src.config.settings import settings
+from src.config.logger import setup_logger
+
+logger = setup_logger(__name__)
 
 class ImageExtractor:
+    HEADERS = {'User-Agent': 'Mozilla/5.0', 'Referer': 'https://www.reddit.com/'}
+    
     def extract_images(self, html: str, base_url: str) -> list:
         soup = BeautifulSoup(html, 'html.parser')
         images = []
@@ -25,13 +32,69 @@ class ImageExtractor:
         valid_exts = ('.jpg', '.jpeg', '.png', '.gif', '.webp')
         return any(url.lower().endswith(ext) for ext in valid_exts) or 'image' in url.lower()
     
-    def download_image(self, url: str):
+    async def download_image(self, url: str):
+        """Decoded image at ``url``, or None; decoding runs in the inference pool"""
+        data = await self.fetch_image(url)
+        if data is None:
+            return None
+        return await inference_executor.run(self.decode_image, data)
+    
+    async def fetch_image(self, url: str):
+        """Image bytes streamed over the shared HTTP client, or None.
+        
+        The content type and declared length are checked before any of the
+        body is read, and the stream is abandoned as soon as it passes
+        ``image_max_bytes``.
+        """
+        try:
+            async with http_client.stream(url, headers=self.HEADERS, timeout=settings.image_download_timeout) as response:
+                if response.status != 200 or not self._acceptable(response.headers):
+                    return None
+                data = bytearray()
+                async for chunk in response.content.iter_chunked(64 * 1024):
+                    data.extend(chunk)
+                    if len(data) > settings.image_max_bytes:
+                        logger.warning(f"Image over {settings.image_max_bytes} bytes, skipped: {url}")
+                        return None
+                return bytes(data)
+        except Exception as e:
+            logger.warning(f"Image download failed for {url}: {e}")
+            return None
+    
+    def decode_image(self, data: bytes, size: int = None):
+        """RGB image whose longer side is at most ``size``, or None when ``data`` is not an image.
+        
+        JPEGs are decoded straight at the nearest DCT scale (1/2, 1/4, 1/8)
+        with ``draft``. Other formats always decode at full size before
+        ``reduce``'s box filter shrinks them, so they are held to the lower
+        ``image_max_full_decode_pixels`` cap.
+        """
+        size = size or settings.image_decode_size
         try:
-            headers = {'User-Agent': 'Mozilla/5.0', 'Referer': 'https://www.reddit.com/'}
-            response = requests.get(url, timeout=5, headers=headers, stream=True)  # Reduced timeout
-            img = Image.open(BytesIO(response.content)).convert('RGB')
+            img = Image.open(BytesIO(data))
+            pixels = img.width * img.height
+            if pixels > settings.image_max_pixels:
+                return None
+            if img.format != 'JPEG' and pixels > settings.image_max_full_decode_pixels:
+                return None
+            img.draft('RGB', (size, size))
+            factor = min(img.width, img.height) // (size * 2)
+            if factor >= 2:
+                # reduce only supports L, RGB and RGBA; palette, bilevel and 16-bit images are converted first
+                if img.mode not in ('RGB', 'RGBA', 'L'):
+                    img = img.convert('RGB')
+                img = img.reduce(factor)
+            img = img.convert('RGB')
             # Normalize size for consistent model input
-            img = img.resize((512, 512), Image.Resampling.LANCZOS)
+            img.thumbnail((size, size), Image.Resampling.BICUBIC)
             return img
         except Exception as e:
             return None
+    
+    def _acceptable(self, headers) -> bool:
+        content_type = headers.get('Content-Type', '').split(';')[0].strip().lower()
+        # Some CDNs send images as octet-stream; anything else (HTML error pages, video) is rejected
+        if content_type and not (content_type.startswith('image/') or content_type == 'application/octet-stream'):
+            return False
+        length = headers.get('Content-Length')
+        return not (length and length.isdigit() and int(length) > settings.image_max_bytes)
@@ -1,26 +1,46 @@
 import warnings
 warnings.filterwarnings('ignore', message='.*image_processor_type.*')
 
-from transformers import pipeline
+import torch
+from src.analysis.model_registry import model_registry
+from src.analysis.image.preprocessing import PreparedImages
 
 class NSFWImageDetector:
+    # Lightweight and accurate NSFW detector
+    MODEL_ID = "Falconsai/nsfw_image_detection"
+    
     def __init__(self):
         try:
-            # Lightweight and accurate NSFW detector
-            self.classifier = pipeline("image-classification", model="Falconsai/nsfw_image_detection")
+            self.classifier = model_registry.get_pipeline("image-classification", self.MODEL_ID)
         except:
             self.classifier = None
     
     def detect(self, image):
         if not self.classifier or image is None:
-            return {"is_nsfw": False, "is_explicit": False, "is_sexual": False, "confidence": 0.0}
+            return self._default_result()
+        return self.detect_batch([image])[0]
+    
+    def detect_batch(self, images):
+        """Classify a list of images (or a shared PreparedImages batch) in one forward pass"""
+        prepared = images if isinstance(images, PreparedImages) else PreparedImages(images)
+        if not self.classifier:
+            return [self._default_result() for _ in range(len(prepared))]
         
         try:
-            result = self.classifier(image)
-            
-            # Parse results for different NSFW categories
-            scores = {r['label'].lower(): r['score'] for r in result}
-            
+            pixel_values = prepared.pixel_values(self.classifier.image_processor)
+            model = self.classifier.model
+            with self.classifier.lock, torch.inference_mode():
+                logits = model(pixel_values=pixel_values.to(model.device)).logits.float().cpu()
+            probabilities = logits.softmax(dim=-1).tolist()
+            return [
+                self._to_result({model.config.id2label[i].lower(): score for i, score in enumerate(row)})
+                for row in probabilities
+            ]
+        except:
+            return [self._default_result() for _ in range(len(prepared))]
+    
+    def _to_result(self, scores: dict):
+        try:
             nsfw_score = scores.get('nsfw', 0.0)
             explicit_score = scores.get('explicit', nsfw_score)
             sexual_score = scores.get('sexual', nsfw_score)
@@ -33,4 +53,7 @@ class NSFWImageDetector:
                 "scores": scores
             }
         except:
-            return {"is_nsfw": False, "is_explicit": False, "is_sexual": False, "confidence": 0.0}
+            return self._default_result()
+    
+    def _default_result(self):
+        return {"is_nsfw": False, "is_explicit": False, "is_sexual": False, "confidence": 0.0}
@@ -1,22 +1,54 @@
+import threading
 import easyocr
 import numpy as np
+from src.analysis.model_registry import model_registry
+from src.analysis.image.clip_scorer import get_clip_scorer
+from src.config.settings import settings
 from src.config.logger import setup_logger
 
 logger = setup_logger(__name__)
 
+# EasyOCR readers are not safe for concurrent use
+_reader_lock = threading.Lock()
+
+def _load_reader():
+    # Try GPU first, fallback to CPU if needed
+    try:
+        reader = easyocr.Reader(['en'], gpu=True, verbose=False)
+        logger.info("EasyOCR initialized with GPU acceleration")
+    except:
+        reader = easyocr.Reader(['en'], gpu=False, verbose=False)
+        logger.info("EasyOCR initialized with CPU (GPU unavailable)")
+    return reader
+
 class OCRExtractor:
+    # CLIP prompts used to guess whether an image holds any text worth reading
+    TEXT_LABELS = ["a meme with a caption", "a screenshot of text", "a poster or sign with writing"]
+    NO_TEXT_LABELS = ["a photo with no text", "a picture without any writing"]
+    TEXT_LABEL_SET = "text_presence"
+    
     def __init__(self):
         try:
-            # Try GPU first, fallback to CPU if needed
-            try:
-                self.reader = easyocr.Reader(['en'], gpu=True, verbose=False)
-                logger.info("EasyOCR initialized with GPU acceleration")
-            except:
-                self.reader = easyocr.Reader(['en'], gpu=False, verbose=False)
-                logger.info("EasyOCR initialized with CPU (GPU unavailable)")
+            # One reader per process, shared by every OCRExtractor
+            self.reader = model_registry.get("easyocr:en", _load_reader, kind="ocr")
         except Exception as e:
             logger.error(f"EasyOCR init failed: {e}")
             self.reader = None
+        
+        try:
+            self.scorer = get_clip_scorer("openai/clip-vit-base-patch32")
+            self.scorer.register_label_set(self.TEXT_LABEL_SET, self.TEXT_LABELS + self.NO_TEXT_LABELS)
+        except:
+            self.scorer = None
+    
+    def likely_has_text(self, clip_scores: dict = None) -> bool:
+        """Cheap gate in front of the OCR detector; images without CLIP scores always pass"""
+        if not settings.ocr_text_gate_enabled or not clip_scores or self.TEXT_LABEL_SET not in clip_scores:
+            return True
+        result = clip_scores[self.TEXT_LABEL_SET]
+        text_probability = sum(score for label, score in zip(result["labels"], result["scores"])
+                               if label in self.TEXT_LABELS)
+        return text_probability >= settings.ocr_text_gate_threshold
     
     def extract_text(self, image):
         if image is None or self.reader is None:
@@ -27,8 +59,51 @@ class OCRExtractor:
             if not isinstance(image, np.ndarray):
                 image = np.array(image)
             
-            results = self.reader.readtext(image)
+            with _reader_lock:
+                return self._to_result(self.reader.readtext(image))
+        except Exception as e:
+            logger.error(f"OCR extraction failed: {e}")
+            return {"text": "", "confidence": 0.0}
+    
+    def extract_batch(self, images: list, clip_scores: list = None):
+        """OCR every image with one batched detector and recognizer call.
+        
+        With ``clip_scores`` (one entry per image, from ClipScorer.score_images)
+        images CLIP considers text-free skip OCR and come back ``gated``.
+        The rest are zero-padded at the bottom and right to a common size, so
+        nothing is rescaled and text keeps its geometry.
+        """
+        if self.reader is None or not images:
+            return [{"text": "", "confidence": 0.0} for _ in images]
+        
+        clip_scores = clip_scores or [None] * len(images)
+        results = [{"text": "", "confidence": 0.0, "gated": True} for _ in images]
+        selected = [i for i, scores in enumerate(clip_scores) if self.likely_has_text(scores)]
+        if not selected:
+            return results
+        
+        try:
+            arrays = [images[i] if isinstance(images[i], np.ndarray) else np.asarray(images[i]) for i in selected]
+            with _reader_lock:
+                if len(arrays) == 1:
+                    outputs = [self.reader.readtext(arrays[0])]
+                else:
+                    height = max(array.shape[0] for array in arrays)
+                    width = max(array.shape[1] for array in arrays)
+                    batch = np.zeros((len(arrays), height, width, 3), dtype=np.uint8)
+                    for i, array in enumerate(arrays):
+                        batch[i, :array.shape[0], :array.shape[1]] = array[..., :3]
+                    outputs = self.reader.readtext_batched(batch)
             
+            for i, output in zip(selected, outputs):
+                results[i] = self._to_result(output)
+            return results
+        except Exception as e:
+            logger.error(f"Batched OCR extraction failed: {e}")
+            return [{"text": "", "confidence": 0.0} for _ in images]
+    
+    def _to_result(self, results):
+        try:
             if not results:
                 logger.info("No text detected in image")
                 return {"text": "", "confidence": 0.0}
@@ -0,0 +1,42 @@
+import numpy as np
+from PIL import Image
+
+HASH_SIZE = 8
+# pHash keeps the lowest 8x8 DCT frequencies of a 32x32 greyscale thumbnail
+PHASH_SIZE = HASH_SIZE * 4
+
+def _dct_matrix(n: int):
+    k = np.arange(n)[:, None]
+    i = np.arange(n)[None, :]
+    matrix = np.cos(np.pi * (2 * i + 1) * k / (2 * n)) * np.sqrt(2.0 / n)
+    matrix[0] /= np.sqrt(2.0)
+    return matrix
+
+DCT_MATRIX = _dct_matrix(PHASH_SIZE)
+
+def _to_int(bits) -> int:
+    value = 0
+    for bit in bits:
+        value = (value << 1) | int(bit)
+    return value
+
+def phash(image) -> int:
+    """64-bit DCT perceptual hash; robust to rescaling, recompression and small edits"""
+    gray = image.convert("L").resize((PHASH_SIZE, PHASH_SIZE), Image.Resampling.LANCZOS)
+    pixels = np.asarray(gray, dtype=np.float64)
+    low = (DCT_MATRIX @ pixels @ DCT_MATRIX.T)[:HASH_SIZE, :HASH_SIZE].flatten()
+    # The DC term only carries overall brightness
+    return _to_int(low > np.median(low[1:]))
+
+def dhash(image) -> int:
+    """64-bit gradient hash; cheap second opinion that rejects pHash collisions"""
+    gray = image.convert("L").resize((HASH_SIZE + 1, HASH_SIZE), Image.Resampling.BILINEAR)
+    pixels = np.asarray(gray, dtype=np.int16)
+    return _to_int((pixels[:, 1:] > pixels[:, :-1]).flatten())
+
+def image_hashes(image) -> tuple:
+    """``(phash, dhash)`` of ``image``"""
+    return phash(image), dhash(image)
+
+def hamming(a: int, b: int) -> int:
+    return bin(a ^ b).count("1")
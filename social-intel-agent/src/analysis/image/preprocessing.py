@@ -0,0 +1,95 @@
+"""One preprocessing pass per decoded image, shared by the NSFW ViT, CLIP and OCR.
+
+Each model's input geometry and normalisation are read from its HF image
+processor once. Images are resized once per distinct geometry, cropped and
+transposed as numpy views, normalised, and stacked into a single batch
+tensor that torch wraps without copying. OCR reads the decoded RGB buffer.
+"""
+import threading
+import numpy as np
+import torch
+from PIL import Image
+
+class InputSpec:
+    """Geometry and normalisation of one image processor"""
+
+    def __init__(self, processor):
+        size = processor.size if isinstance(processor.size, dict) else {"shortest_edge": processor.size}
+        self.shortest_edge = size.get("shortest_edge")
+        self.size = None if self.shortest_edge else (size["height"], size["width"])
+        crop = getattr(processor, "crop_size", None)
+        self.crop = (crop["height"], crop["width"]) if getattr(processor, "do_center_crop", False) and crop else None
+        # HF stores Pillow's resampling codes
+        self.resample = Image.Resampling(int(getattr(processor, "resample", Image.Resampling.BICUBIC)))
+        self.rescale = processor.rescale_factor if getattr(processor, "do_rescale", True) else 1.0
+        normalize = getattr(processor, "do_normalize", True)
+        self.mean = np.asarray(processor.image_mean, dtype=np.float32) if normalize else np.zeros(3, np.float32)
+        self.std = np.asarray(processor.image_std, dtype=np.float32) if normalize else np.ones(3, np.float32)
+
+    @property
+    def geometry(self):
+        return (self.shortest_edge, self.size, self.crop, self.resample)
+
+    def resize(self, image) -> np.ndarray:
+        """uint8 HxWx3 array at the model's input size, resized once"""
+        if self.size:
+            height, width = self.size
+        else:
+            scale = self.shortest_edge / min(image.width, image.height)
+            width, height = max(round(image.width * scale), 1), max(round(image.height * scale), 1)
+        array = np.asarray(image.resize((width, height), self.resample))
+        if self.crop:
+            top = max((height - self.crop[0]) // 2, 0)
+            left = max((width - self.crop[1]) // 2, 0)
+            # Slicing is a view, no copy
+            array = array[top:top + self.crop[0], left:left + self.crop[1]]
+        return array
+
+    def normalize(self, array: np.ndarray) -> np.ndarray:
+        """float32 3xHxW; the transpose is a view until the batch is stacked"""
+        scale = self.rescale / self.std
+        offset = self.mean / self.std
+        return (array.astype(np.float32) * scale - offset).transpose(2, 0, 1)
+
+
+def _rgb(image):
+    return image if image.mode == "RGB" else image.convert("RGB")
+
+_specs = {}
+_specs_lock = threading.Lock()
+
+def input_spec(processor) -> InputSpec:
+    with _specs_lock:
+        spec = _specs.get(id(processor))
+        if spec is None:
+            spec = _specs[id(processor)] = InputSpec(processor)
+        return spec
+
+
+class PreparedImages:
+    """Model inputs for a batch of decoded images, each computed at most once"""
+
+    def __init__(self, images: list):
+        self.images = list(images)
+        self._arrays = [None] * len(self.images)
+        self._resized = {}
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.images)
+
+    def array(self, index: int) -> np.ndarray:
+        """Decoded RGB buffer of one image as uint8 HxWx3, the layout OCR reads"""
+        if self._arrays[index] is None:
+            self._arrays[index] = np.asarray(_rgb(self.images[index]))
+        return self._arrays[index]
+
+    def pixel_values(self, processor) -> torch.Tensor:
+        """Nx3xHxW batch for the model behind ``processor``"""
+        spec = input_spec(processor)
+        with self._lock:
+            resized = self._resized.get(spec.geometry)
+            if resized is None:
+                # Models with the same geometry share the resized buffers
+                resized = self._resized[spec.geometry] = [spec.resize(_rgb(image)) for image in self.images]
+        return torch.from_numpy(np.stack([spec.normalize(array) for array in resized]))
@@ -1,36 +1,62 @@
-from transformers import pipeline
+from src.analysis.image.clip_scorer import get_clip_scorer
 
 class ReligiousHateDetector:
+    # Religious symbols
+    SYMBOL_LABELS = ["mosque", "quran", "kaaba", "islamic symbol", "crescent moon", 
+                     "cross", "jesus", "church", "bible", "christian symbol",
+                     "om symbol", "hindu god", "shiva", "hindu temple",
+                     "menorah", "torah", "synagogue", "star of david",
+                     "buddha", "buddhist temple", "sikh khanda", "safe content"]
+    
+    # Hate context
+    HATE_LABELS = ["anti-muslim hate", "anti-hindu hate", "anti-christian hate", 
+                   "anti-jewish hate", "religious hate meme", "insulting god", 
+                   "religious violence", "safe content"]
+    
+    # Extremist symbols
+    EXTREMIST_LABELS = ["isis flag", "nazi symbol", "kkk logo", "swastika", 
+                        "extremist symbol", "safe content"]
+    
     def __init__(self):
         try:
-            self.classifier = pipeline("zero-shot-image-classification", model="openai/clip-vit-base-patch32")
+            # Shares one CLIP image embedding with ViolenceDetector, label embeddings cached
+            self.scorer = get_clip_scorer("openai/clip-vit-base-patch32")
+            self.scorer.register_label_set("religious_symbols", self.SYMBOL_LABELS)
+            self.scorer.register_label_set("religious_hate", self.HATE_LABELS)
+            self.scorer.register_label_set("religious_extremist", self.EXTREMIST_LABELS)
         except:
-            self.classifier = None
+            self.scorer = None
+    
+    def detect(self, image, nsfw_result=None, clip_scores: dict = None):
+        """Classify ``image``; pass ``clip_scores`` from ClipScorer.score_images to reuse its embedding"""
+        if not self.scorer or image is None:
+            return self._default_result()
+        return self.detect_batch([image], [nsfw_result], [clip_scores] if clip_scores is not None else None)[0]
+    
+    def detect_batch(self, images, nsfw_results: list = None, clip_scores: list = None):
+        """Classify a list of images (or a PreparedImages batch) with one CLIP forward pass.
+        
+        ``nsfw_results`` and ``clip_scores`` hold one entry per image; passing
+        the CLIP scores already computed for ViolenceDetector skips the model.
+        """
+        if not self.scorer:
+            return [self._default_result() for _ in range(len(images))]
+        if clip_scores is None:
+            try:
+                clip_scores = self.scorer.score_images(images)
+            except:
+                return [self._default_result() for _ in range(len(images))]
+        nsfw_results = nsfw_results or [None] * len(clip_scores)
+        return [self._to_result(scores, nsfw) for scores, nsfw in zip(clip_scores, nsfw_results)]
     
-    def detect(self, image, nsfw_result=None):
-        if not self.classifier or image is None:
-            return {"is_religious_hate": False, "confidence": 0.0, "targets": [], "symbols": []}
+    def _to_result(self, clip_scores: dict, nsfw_result=None):
+        if not clip_scores:
+            return self._default_result()
         
         try:
-            # Religious symbols
-            symbol_labels = ["mosque", "quran", "kaaba", "islamic symbol", "crescent moon", 
-                           "cross", "jesus", "church", "bible", "christian symbol",
-                           "om symbol", "hindu god", "shiva", "hindu temple",
-                           "menorah", "torah", "synagogue", "star of david",
-                           "buddha", "buddhist temple", "sikh khanda", "safe content"]
-            
-            # Hate context
-            hate_labels = ["anti-muslim hate", "anti-hindu hate", "anti-christian hate", 
-                          "anti-jewish hate", "religious hate meme", "insulting god", 
-                          "religious violence", "safe content"]
-            
-            # Extremist symbols
-            extremist_labels = ["isis flag", "nazi symbol", "kkk logo", "swastika", 
-                              "extremist symbol", "safe content"]
-            
-            symbols_result = self.classifier(image, candidate_labels=symbol_labels)
-            hate_result = self.classifier(image, candidate_labels=hate_labels)
-            extremist_result = self.classifier(image, candidate_labels=extremist_labels)
+            symbols_result = clip_scores["religious_symbols"]
+            hate_result = clip_scores["religious_hate"]
+            extremist_result = clip_scores["religious_extremist"]
             
             detected_symbols = [l for l, s in zip(symbols_result['labels'], symbols_result['scores']) 
                               if l != "safe content" and s > 0.25]
@@ -65,7 +91,10 @@ class ReligiousHateDetector:
                 "targets": self._extract_targets(detected_hate)
             }
         except:
-            return {"is_religious_hate": False, "confidence": 0.0, "targets": [], "symbols": []}
+            return self._default_result()
+    
+    def _default_result(self):
+        return {"is_religious_hate": False, "confidence": 0.0, "targets": [], "symbols": []}
     
     def _extract_targets(self, hate_labels):
         targets = []
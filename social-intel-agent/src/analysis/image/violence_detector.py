@@ -1,29 +1,58 @@
 import warnings
 warnings.filterwarnings('ignore', message='.*image_processor_type.*')
 
-from transformers import pipeline
+from src.analysis.image.clip_scorer import get_clip_scorer
 
 class ViolenceDetector:
+    # Comprehensive visual content labels
+    VIOLENCE_LABELS = ["weapons", "guns", "knives", "violence", "blood", "gore", "physical fight", "war"]
+    HATE_LABELS = ["hateful symbols", "hate speech visual", "discriminatory imagery", "offensive gestures"]
+    SPAM_LABELS = ["spam advertisement", "clickbait", "promotional banner", "fake news thumbnail"]
+    SAFE_LABELS = ["safe content", "normal image"]
+    LABEL_SET = "violence"
+    
     def __init__(self):
         try:
-            # Lightweight CLIP model for zero-shot classification
-            self.classifier = pipeline("zero-shot-image-classification", model="openai/clip-vit-base-patch32")
+            # Lightweight CLIP model for zero-shot classification, label embeddings cached
+            self.scorer = get_clip_scorer("openai/clip-vit-base-patch32")
+            self.scorer.register_label_set(
+                self.LABEL_SET,
+                self.VIOLENCE_LABELS + self.HATE_LABELS + self.SPAM_LABELS + self.SAFE_LABELS
+            )
         except:
-            self.classifier = None
+            self.scorer = None
+    
+    def detect(self, image, clip_scores: dict = None):
+        """Classify ``image``; pass ``clip_scores`` from ClipScorer.score_images to reuse its embedding"""
+        if not self.scorer or image is None:
+            return self._default_result()
+        return self.detect_batch([image], [clip_scores] if clip_scores is not None else None)[0]
     
-    def detect(self, image):
-        if not self.classifier or image is None:
-            return {"is_violent": False, "is_hateful_visual": False, "is_spam": False, "confidence": 0.0}
+    def detect_batch(self, images, clip_scores: list = None):
+        """Classify a list of images (or a PreparedImages batch) with one CLIP forward pass.
+        
+        ``clip_scores`` (one entry per image, from ClipScorer.score_images)
+        skips the forward pass entirely.
+        """
+        if not self.scorer:
+            return [self._default_result() for _ in range(len(images))]
+        if clip_scores is None:
+            try:
+                clip_scores = self.scorer.score_images(images)
+            except:
+                return [self._default_result() for _ in range(len(images))]
+        return [self._to_result(scores) for scores in clip_scores]
+    
+    def _to_result(self, clip_scores: dict):
+        if not clip_scores:
+            return self._default_result()
         
         try:
-            # Comprehensive visual content labels
-            violence_labels = ["weapons", "guns", "knives", "violence", "blood", "gore", "physical fight", "war"]
-            hate_labels = ["hateful symbols", "hate speech visual", "discriminatory imagery", "offensive gestures"]
-            spam_labels = ["spam advertisement", "clickbait", "promotional banner", "fake news thumbnail"]
-            safe_labels = ["safe content", "normal image"]
+            violence_labels = self.VIOLENCE_LABELS
+            hate_labels = self.HATE_LABELS
+            spam_labels = self.SPAM_LABELS
             
-            all_labels = violence_labels + hate_labels + spam_labels + safe_labels
-            result = self.classifier(image, candidate_labels=all_labels)
+            result = clip_scores[self.LABEL_SET]
             
             scores_dict = {label: score for label, score in zip(result['labels'], result['scores'])}
             
@@ -52,4 +81,7 @@ class ViolenceDetector:
                 "all_scores": scores_dict
             }
         except:
-            return {"is_violent": False, "is_hateful_visual": False, "is_spam": False, "confidence": 0.0}
+            return self._default_result()
+    
+    def _default_result(self):
+        return {"is_violent": False, "is_hateful_visual": False, "is_spam": False, "confidence": 0.0}
@@ -0,0 +1,160 @@
+import os
+import threading
+import time
+from transformers import pipeline
+from src.config.settings import settings
+from src.config.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+class SharedPipeline:
+    """Process-wide handle around a loaded HF pipeline.
+
+    Calls are serialized per model so fast tokenizers are never borrowed
+    by two threads at once; everything else is delegated to the pipeline.
+    """
+
+    def __init__(self, pipe, backend: str = "torch"):
+        self._pipe = pipe
+        self._lock = threading.RLock()
+        self.backend = backend
+
+    def __call__(self, *args, **kwargs):
+        with self._lock:
+            return self._pipe(*args, **kwargs)
+
+    @property
+    def lock(self):
+        return self._lock
+
+    @property
+    def pipeline(self):
+        return self._pipe
+
+    @property
+    def revision(self) -> str:
+        """Hub commit of the loaded weights, used to invalidate cached outputs"""
+        config = getattr(getattr(self._pipe, "model", None), "config", None)
+        revision = getattr(config, "_commit_hash", None) or getattr(config, "transformers_version", None) or "unknown"
+        return revision if self.backend == "torch" else f"{revision}+{self.backend}"
+
+    def __getattr__(self, name):
+        return getattr(self._pipe, name)
+
+
+class ModelRegistry:
+    """Loads every model once per process and hands out the shared instance"""
+
+    def __init__(self):
+        self._entries = {}
+        self._failures = {}
+        self._lock = threading.Lock()
+        self._key_locks = {}
+
+    def get_pipeline(self, task: str, model: str, **kwargs):
+        """Return the shared pipeline for ``model``, loading it on first use"""
+        return self.get(model, lambda: self._load_pipeline(task, model, **kwargs), kind=task)
+
+    def get(self, key: str, loader, kind: str = "custom"):
+        """Return the object registered under ``key``, creating it with ``loader`` once"""
+        entry = self._entries.get(key)
+        if entry is not None:
+            return entry["instance"]
+
+        with self._key_lock(key):
+            entry = self._entries.get(key)
+            if entry is not None:
+                return entry["instance"]
+
+            logger.info(f"Loading model {key} ({kind})")
+            started = time.perf_counter()
+            try:
+                instance = loader()
+            except Exception as e:
+                self._failures[key] = str(e)
+                logger.error(f"Failed to load model {key}: {e}")
+                raise
+
+            self._entries[key] = {
+                "instance": instance,
+                "kind": kind,
+                "loaded_at": time.time(),
+                "load_seconds": round(time.perf_counter() - started, 2),
+                "memory_bytes": self._estimate_memory(instance)
+            }
+            self._failures.pop(key, None)
+            logger.info(f"Loaded model {key} in {self._entries[key]['load_seconds']}s")
+            return instance
+
+    def _load_pipeline(self, task: str, model: str, **kwargs):
+        if settings.inference_backend == "onnx":
+            from src.analysis import onnx_backend
+            if task in onnx_backend.SUPPORTED_TASKS:
+                try:
+                    backend = "onnx-int8" if settings.onnx_quantize else "onnx"
+                    return SharedPipeline(onnx_backend.load_pipeline(task, model), backend=backend)
+                except Exception as e:
+                    logger.warning(f"ONNX backend unavailable for {model}, falling back to PyTorch: {e}")
+        return SharedPipeline(pipeline(task, model=model, **kwargs))
+
+    def is_loaded(self, key: str) -> bool:
+        return key in self._entries
+
+    def loaded_models(self):
+        """Describe every loaded model and the memory its weights occupy"""
+        models = []
+        for key, entry in list(self._entries.items()):
+            models.append({
+                "model": key,
+                "kind": entry["kind"],
+                "backend": getattr(entry["instance"], "backend", "torch"),
+                "load_seconds": entry["load_seconds"],
+                "memory_mb": round(entry["memory_bytes"] / (1024 * 1024), 1),
+                "loaded_at": entry["loaded_at"]
+            })
+        return models
+
+    def stats(self):
+        models = self.loaded_models()
+        return {
+            "loaded_count": len(models),
+            "total_memory_mb": round(sum(m["memory_mb"] for m in models), 1),
+            "models": models,
+            "failed": dict(self._failures)
+        }
+
+    def _key_lock(self, key: str):
+        with self._lock:
+            if key not in self._key_locks:
+                self._key_locks[key] = threading.Lock()
+            return self._key_locks[key]
+
+    def _estimate_memory(self, instance) -> int:
+        """Sum parameter and buffer sizes of the underlying torch module(s) or ONNX files"""
+        target = instance.pipeline if isinstance(instance, SharedPipeline) else instance
+        modules = []
+        model = getattr(target, "model", None)
+        if model is not None:
+            modules.append(model)
+        modules.extend(getattr(target, "torch_modules", []))
+        onnx_paths = list(getattr(target, "onnx_paths", []))
+
+        total = 0
+        for module in modules:
+            if getattr(module, "model_path", None):
+                # ORT models hold their weights in the session, roughly the file size
+                onnx_paths.append(module.model_path)
+                continue
+            try:
+                for tensor in list(module.parameters()) + list(module.buffers()):
+                    total += tensor.numel() * tensor.element_size()
+            except Exception:
+                continue
+        for path in onnx_paths:
+            if os.path.exists(path):
+                total += os.path.getsize(path)
+        return total
+
+
+# Global model registry instance
+model_registry = ModelRegistry()
@@ -0,0 +1,201 @@
+import gc
+import os
+import platform
+import torch
+from src.config.settings import settings
+from src.config.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+# Pipeline tasks that can be served by an exported ONNX model
+SUPPORTED_TASKS = {
+    "sentiment-analysis": "sequence-classification",
+    "text-classification": "sequence-classification",
+    "zero-shot-classification": "sequence-classification",
+    "image-classification": "image-classification"
+}
+
+QUANTIZED_FILE = "model_quantized.onnx"
+
+def session_options():
+    """ONNX Runtime session options tuned for several sessions sharing a CPU node"""
+    import onnxruntime as ort
+
+    options = ort.SessionOptions()
+    options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+    options.execution_mode = ort.ExecutionMode.ORT_SEQUENTIAL
+    # Each inference worker runs its own session call; split the cores between them
+    intra_threads = settings.onnx_intra_op_threads or max(1, (os.cpu_count() or 1) // settings.inference_max_workers)
+    options.intra_op_num_threads = intra_threads
+    options.inter_op_num_threads = settings.onnx_inter_op_threads
+    # Spinning threads burn CPU that the other workers' sessions need
+    options.add_session_config_entry("session.intra_op.allow_spinning", "0")
+    return options
+
+def load_pipeline(task: str, model_id: str):
+    """HF-compatible pipeline for ``model_id`` running on an int8 ONNX export"""
+    from optimum.pipelines import pipeline as ort_pipeline
+    from transformers import AutoImageProcessor, AutoTokenizer
+
+    kind = SUPPORTED_TASKS[task]
+    model_dir = export_model(model_id, kind)
+    model_cls = _ort_model_class(kind)
+    model = model_cls.from_pretrained(
+        model_dir,
+        file_name=QUANTIZED_FILE if settings.onnx_quantize else "model.onnx",
+        session_options=session_options(),
+        provider="CPUExecutionProvider"
+    )
+
+    if kind == "image-classification":
+        return ort_pipeline(task, model=model, feature_extractor=AutoImageProcessor.from_pretrained(model_dir),
+                            accelerator="ort")
+    return ort_pipeline(task, model=model, tokenizer=AutoTokenizer.from_pretrained(model_dir), accelerator="ort")
+
+def export_model(model_id: str, kind: str) -> str:
+    """Export ``model_id`` to ONNX (and quantize it) once; returns the model directory"""
+    from optimum.onnxruntime import ORTQuantizer
+    from transformers import AutoImageProcessor, AutoTokenizer
+
+    model_dir = _model_dir(model_id)
+    exported = os.path.join(model_dir, "model.onnx")
+    quantized = os.path.join(model_dir, QUANTIZED_FILE)
+
+    if not os.path.exists(exported):
+        logger.info(f"Exporting {model_id} to ONNX")
+        model = _ort_model_class(kind).from_pretrained(model_id, export=True)
+        model.save_pretrained(model_dir)
+        if kind == "image-classification":
+            AutoImageProcessor.from_pretrained(model_id).save_pretrained(model_dir)
+        else:
+            AutoTokenizer.from_pretrained(model_id).save_pretrained(model_dir)
+        del model
+        gc.collect()
+
+    if settings.onnx_quantize and not os.path.exists(quantized):
+        logger.info(f"Quantizing {model_id} to int8")
+        quantizer = ORTQuantizer.from_pretrained(model_dir, file_name="model.onnx")
+        quantizer.quantize(save_dir=model_dir, quantization_config=_quantization_config())
+
+    return model_dir
+
+
+class OnnxClipEncoder:
+    """CLIP image and text towers exported as separate ONNX sessions"""
+
+    def __init__(self, model_id: str):
+        import onnxruntime as ort
+        from transformers import AutoConfig, AutoTokenizer, AutoImageProcessor
+
+        vision_path, text_path, logit_scale = export_clip(model_id)
+        options = session_options()
+        self.vision = ort.InferenceSession(vision_path, options, providers=["CPUExecutionProvider"])
+        self.text = ort.InferenceSession(text_path, options, providers=["CPUExecutionProvider"])
+        self.tokenizer = AutoTokenizer.from_pretrained(model_id)
+        self.image_processor = AutoImageProcessor.from_pretrained(model_id)
+        self.logit_scale = logit_scale
+        self.onnx_paths = [vision_path, text_path]
+        self.backend = "onnx-int8" if settings.onnx_quantize else "onnx"
+        # Hub commit of the weights the towers were exported from
+        config = AutoConfig.from_pretrained(model_id)
+        revision = getattr(config, "_commit_hash", None) or getattr(config, "transformers_version", None) or "unknown"
+        self.revision = f"{revision}+{self.backend}"
+
+    def image_features(self, pixel_values):
+        outputs = self.vision.run(None, {"pixel_values": pixel_values.numpy()})
+        return torch.from_numpy(outputs[0]).float()
+
+    def text_features(self, inputs):
+        feed = {"input_ids": inputs["input_ids"].numpy(), "attention_mask": inputs["attention_mask"].numpy()}
+        return torch.from_numpy(self.text.run(None, feed)[0]).float()
+
+
+class _ClipVisionTower(torch.nn.Module):
+    def __init__(self, model):
+        super().__init__()
+        self.model = model
+
+    def forward(self, pixel_values):
+        return self.model.get_image_features(pixel_values=pixel_values)
+
+
+class _ClipTextTower(torch.nn.Module):
+    def __init__(self, model):
+        super().__init__()
+        self.model = model
+
+    def forward(self, input_ids, attention_mask):
+        return self.model.get_text_features(input_ids=input_ids, attention_mask=attention_mask)
+
+
+def export_clip(model_id: str):
+    """Export CLIP's towers to (quantized) ONNX once; returns both paths and the logit scale"""
+    from onnxruntime.quantization import QuantType, quantize_dynamic
+
+    model_dir = _model_dir(model_id)
+    suffix = "_quantized.onnx" if settings.onnx_quantize else ".onnx"
+    vision_path = os.path.join(model_dir, "vision" + suffix)
+    text_path = os.path.join(model_dir, "text" + suffix)
+    scale_path = os.path.join(model_dir, "logit_scale.txt")
+
+    if not (os.path.exists(vision_path) and os.path.exists(text_path) and os.path.exists(scale_path)):
+        from transformers import CLIPModel
+
+        logger.info(f"Exporting {model_id} vision and text towers to ONNX")
+        os.makedirs(model_dir, exist_ok=True)
+        model = CLIPModel.from_pretrained(model_id).eval()
+        size = model.config.vision_config.image_size
+        exports = [
+            (_ClipVisionTower(model), (torch.zeros(1, 3, size, size),), ["pixel_values"], "vision"),
+            (_ClipTextTower(model), (torch.ones(1, 8, dtype=torch.long), torch.ones(1, 8, dtype=torch.long)),
+             ["input_ids", "attention_mask"], "text")
+        ]
+        for tower, dummy, input_names, name in exports:
+            fp32_path = os.path.join(model_dir, f"{name}.onnx")
+            dynamic_axes = {input_name: {0: "batch"} for input_name in input_names}
+            if name == "text":
+                dynamic_axes = {input_name: {0: "batch", 1: "sequence"} for input_name in input_names}
+            dynamic_axes["embeds"] = {0: "batch"}
+            with torch.no_grad():
+                torch.onnx.export(tower, dummy, fp32_path, input_names=input_names, output_names=["embeds"],
+                                  dynamic_axes=dynamic_axes, opset_version=14)
+            if settings.onnx_quantize:
+                # Only the transformer matmuls; the patch embedding conv stays fp32
+                quantize_dynamic(fp32_path, os.path.join(model_dir, f"{name}_quantized.onnx"),
+                                 weight_type=QuantType.QInt8, op_types_to_quantize=["MatMul", "Gemm"])
+
+        with open(scale_path, "w") as f:
+            f.write(str(model.logit_scale.exp().item()))
+        del model
+        gc.collect()
+
+    with open(scale_path) as f:
+        logit_scale = float(f.read())
+    return vision_path, text_path, logit_scale
+
+def _ort_model_class(kind: str):
+    from optimum.onnxruntime import ORTModelForImageClassification, ORTModelForSequenceClassification
+
+    if kind == "image-classification":
+        return ORTModelForImageClassification
+    return ORTModelForSequenceClassification
+
+def _quantization_config():
+    from optimum.onnxruntime.configuration import AutoQuantizationConfig
+
+    # Dynamic int8: activations are quantized on the fly, so no calibration set is needed
+    if platform.machine().lower() in ("arm64", "aarch64"):
+        return AutoQuantizationConfig.arm64(is_static=False, per_channel=False)
+    if _cpu_has("avx512_vnni"):
+        return AutoQuantizationConfig.avx512_vnni(is_static=False, per_channel=False)
+    return AutoQuantizationConfig.avx2(is_static=False, per_channel=False)
+
+def _cpu_has(flag: str) -> bool:
+    try:
+        with open("/proc/cpuinfo") as f:
+            return flag in f.read()
+    except OSError:
+        return False
+
+def _model_dir(model_id: str) -> str:
+    return os.path.join(settings.onnx_model_dir, model_id.replace("/", "--"))
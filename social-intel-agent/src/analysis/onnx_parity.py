@@ -0,0 +1,188 @@
+"""Accuracy parity and latency of the ONNX backend against the PyTorch pipelines.
+
+Usage (from social-intel-agent/):
+    python -m src.analysis.onnx_parity [--corpus PATH] [--images DIR] [--repeats N] [--json OUT]
+
+Every model is loaded twice, once per backend, outside the model registry.
+The run exits non-zero when a model's top-label agreement falls below
+``--min-agreement``.
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+import numpy as np
+import torch
+from PIL import Image
+from transformers import pipeline
+from src.analysis import onnx_backend
+from src.analysis.image.clip_scorer import TorchClipEncoder
+from src.analysis.image.violence_detector import ViolenceDetector
+from src.analysis.text.intent_detector import IntentDetector
+from src.analysis.text.nsfw_detector import NSFWDetector
+
+DEFAULT_CORPUS = os.path.join(os.path.dirname(__file__), "fixtures", "parity_corpus.jsonl")
+
+TEXT_MODELS = [
+    ("zero-shot-classification", "facebook/bart-large-mnli", IntentDetector.INTENT_LABELS),
+    ("zero-shot-classification", "cross-encoder/nli-distilroberta-base", NSFWDetector.NSFW_LABELS),
+    ("text-classification", "Hate-speech-CNERG/dehatebert-mono", None),
+    ("text-classification", "martin-ha/toxic-comment-model", None),
+    ("sentiment-analysis", "distilbert-base-uncased-finetuned-sst-2-english", None)
+]
+IMAGE_MODEL = "Falconsai/nsfw_image_detection"
+CLIP_MODEL = "openai/clip-vit-base-patch32"
+
+def load_corpus(path: str) -> list:
+    with open(path) as f:
+        return [json.loads(line)["text"] for line in f if line.strip()]
+
+def load_images(directory: str = None, count: int = 8) -> list:
+    """Images from ``directory``, or deterministic synthetic ones when none are given"""
+    if directory:
+        names = sorted(os.listdir(directory))
+        return [Image.open(os.path.join(directory, name)).convert("RGB") for name in names]
+
+    rng = np.random.default_rng(0)
+    images = []
+    for i in range(count):
+        gradient = np.linspace(0, 255, 224, dtype=np.float32)
+        base = np.stack([np.outer(gradient, np.ones(224)) * ((i + c) % 3) / 2 for c in range(3)], axis=-1)
+        noise = rng.normal(0, 20 + 10 * i, size=(224, 224, 3))
+        images.append(Image.fromarray(np.clip(base + noise, 0, 255).astype(np.uint8)))
+    return images
+
+def as_distribution(output) -> dict:
+    """``{label: score}`` from a classification or zero-shot pipeline output"""
+    if isinstance(output, dict) and "labels" in output:
+        return dict(zip(output["labels"], output["scores"]))
+    return {item["label"]: item["score"] for item in output}
+
+def compare(torch_outputs: list, onnx_outputs: list) -> dict:
+    agree = 0
+    diffs = []
+    for reference, candidate in zip(torch_outputs, onnx_outputs):
+        reference, candidate = as_distribution(reference), as_distribution(candidate)
+        if max(reference, key=reference.get) == max(candidate, key=candidate.get):
+            agree += 1
+        diffs.extend(abs(reference[label] - candidate.get(label, 0.0)) for label in reference)
+    return {
+        "top_label_agreement": round(agree / len(torch_outputs), 4),
+        "max_abs_score_diff": round(max(diffs), 4),
+        "mean_abs_score_diff": round(statistics.mean(diffs), 4)
+    }
+
+def time_calls(fn, inputs: list, repeats: int) -> dict:
+    """Per-item latency of single calls plus one call over the whole batch"""
+    fn(inputs[:1])
+    single = []
+    for _ in range(repeats):
+        for item in inputs:
+            started = time.perf_counter()
+            fn([item])
+            single.append((time.perf_counter() - started) * 1000)
+    started = time.perf_counter()
+    fn(inputs)
+    batch_ms = (time.perf_counter() - started) * 1000
+    single.sort()
+    return {
+        "p50_ms": round(statistics.median(single), 2),
+        "p95_ms": round(single[int(len(single) * 0.95) - 1], 2),
+        "batch_per_item_ms": round(batch_ms / len(inputs), 2)
+    }
+
+def run_pipeline(pipe, task: str, labels: list):
+    if task == "zero-shot-classification":
+        return lambda items: pipe(items, candidate_labels=labels, batch_size=len(items))
+    return lambda items: pipe(items, top_k=None, truncation=True, batch_size=len(items))
+
+def check_text_model(task: str, model_id: str, labels: list, corpus: list, repeats: int) -> dict:
+    torch_pipe = pipeline(task, model=model_id)
+    onnx_pipe = onnx_backend.load_pipeline(task, model_id)
+    torch_fn, onnx_fn = run_pipeline(torch_pipe, task, labels), run_pipeline(onnx_pipe, task, labels)
+    return {
+        "model": model_id,
+        **compare(torch_fn(corpus), onnx_fn(corpus)),
+        "torch": time_calls(torch_fn, corpus, repeats),
+        "onnx": time_calls(onnx_fn, corpus, repeats)
+    }
+
+def check_image_model(images: list, repeats: int) -> dict:
+    torch_pipe = pipeline("image-classification", model=IMAGE_MODEL)
+    onnx_pipe = onnx_backend.load_pipeline("image-classification", IMAGE_MODEL)
+    torch_fn = lambda items: torch_pipe(items, top_k=None)
+    onnx_fn = lambda items: onnx_pipe(items, top_k=None)
+    return {
+        "model": IMAGE_MODEL,
+        **compare(torch_fn(images), onnx_fn(images)),
+        "torch": time_calls(torch_fn, images, repeats),
+        "onnx": time_calls(onnx_fn, images, repeats)
+    }
+
+def check_clip(images: list, repeats: int) -> dict:
+    """Embedding similarity and violence label-set agreement of the two CLIP encoders"""
+    reference = TorchClipEncoder(pipeline("zero-shot-image-classification", model=CLIP_MODEL))
+    candidate = onnx_backend.OnnxClipEncoder(CLIP_MODEL)
+    labels = ViolenceDetector.VIOLENCE_LABELS + ViolenceDetector.SAFE_LABELS
+    prompts = [f"This is a photo of {label}." for label in labels]
+
+    def encode(encoder, items):
+        pixel_values = encoder.image_processor(images=items, return_tensors="pt")["pixel_values"]
+        embeds = encoder.image_features(pixel_values)
+        return embeds / embeds.norm(dim=-1, keepdim=True)
+
+    def text(encoder):
+        embeds = encoder.text_features(encoder.tokenizer(prompts, padding=True, return_tensors="pt"))
+        return embeds / embeds.norm(dim=-1, keepdim=True)
+
+    ref_images, cand_images = encode(reference, images), encode(candidate, images)
+    ref_probs = (reference.logit_scale * ref_images @ text(reference).T).softmax(dim=-1)
+    cand_probs = (candidate.logit_scale * cand_images @ text(candidate).T).softmax(dim=-1)
+    cosine = (ref_images * cand_images).sum(dim=-1)
+    diffs = (ref_probs - cand_probs).abs()
+    return {
+        "model": CLIP_MODEL,
+        "top_label_agreement": round((ref_probs.argmax(-1) == cand_probs.argmax(-1)).float().mean().item(), 4),
+        "max_abs_score_diff": round(diffs.max().item(), 4),
+        "mean_abs_score_diff": round(diffs.mean().item(), 4),
+        "min_embedding_cosine": round(cosine.min().item(), 4),
+        "torch": time_calls(lambda items: encode(reference, items), images, repeats),
+        "onnx": time_calls(lambda items: encode(candidate, items), images, repeats)
+    }
+
+def main(argv: list = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--corpus", default=DEFAULT_CORPUS, help="JSONL file of {\"text\": ...} lines")
+    parser.add_argument("--images", help="Directory of images; synthetic images are used otherwise")
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--min-agreement", type=float, default=0.95)
+    parser.add_argument("--json", help="Also write the full report to this path")
+    args = parser.parse_args(argv)
+
+    torch.set_grad_enabled(False)
+    corpus = load_corpus(args.corpus)
+    images = load_images(args.images)
+
+    results = [check_text_model(task, model_id, labels, corpus, args.repeats)
+               for task, model_id, labels in TEXT_MODELS]
+    results.append(check_image_model(images, args.repeats))
+    results.append(check_clip(images, args.repeats))
+
+    print(f"{'model':<50} {'agree':>6} {'maxdiff':>8} {'torch p50':>10} {'onnx p50':>9} {'speedup':>8}")
+    failed = False
+    for result in results:
+        speedup = result["torch"]["p50_ms"] / max(result["onnx"]["p50_ms"], 1e-6)
+        print(f"{result['model']:<50} {result['top_label_agreement']:>6.3f} {result['max_abs_score_diff']:>8.4f} "
+              f"{result['torch']['p50_ms']:>9.1f}ms {result['onnx']['p50_ms']:>7.1f}ms {speedup:>7.2f}x")
+        failed = failed or result["top_label_agreement"] < args.min_agreement
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,29 +1,43 @@
-from transformers import pipeline
+from src.analysis.text.nli_engine import NLITask, get_nli_engine
 from src.config.logger import setup_logger
 
 logger = setup_logger(__name__)
 
 class SocialMediaAnalyzer:
+    # Social media specific labels
+    SOCIAL_LABELS = [
+        "viral content", "clickbait", "engagement bait", "misinformation",
+        "conspiracy theory", "fake news", "scam", "spam", "bot content",
+        "influencer promotion", "normal social post"
+    ]
+    
+    # Phrase lists behind the engagement intent checks (also used by the text pre-screen)
+    ENGAGEMENT_BAIT_PHRASES = ["like if", "share if", "comment if", "tag someone"]
+    VIRAL_PHRASES = ["going viral", "share this", "spread the word"]
+    PROMOTIONAL_PHRASES = ["buy now", "limited time", "discount", "promo code"]
+    MISINFORMATION_PHRASES = ["they don't want you to know", "hidden truth", "wake up"]
+    
     def __init__(self):
         try:
-            self.classifier = pipeline("zero-shot-classification", model="facebook/bart-large-mnli")
+            self.engine = get_nli_engine("facebook/bart-large-mnli")
         except:
-            self.classifier = None
+            self.engine = None
     
-    def analyze_social_content(self, text: str, platform: str):
+    def nli_tasks(self, text: str) -> list:
+        """NLI work for ``text``, for fused scoring with other detectors"""
+        if not self.engine:
+            return []
+        return [NLITask("social", text, self.SOCIAL_LABELS)]
+    
+    def analyze_social_content(self, text: str, platform: str, nli_results: dict = None):
         """Analyze social media specific patterns"""
-        if not self.classifier:
+        if not self.engine:
             return {"social_patterns": [], "engagement_intent": "unknown"}
         
         try:
-            # Social media specific labels
-            social_labels = [
-                "viral content", "clickbait", "engagement bait", "misinformation",
-                "conspiracy theory", "fake news", "scam", "spam", "bot content",
-                "influencer promotion", "normal social post"
-            ]
-            
-            result = self.classifier(text, candidate_labels=social_labels)
+            if nli_results is None:
+                nli_results = self.engine.run(self.nli_tasks(text))
+            result = nli_results["social"]
             
             detected_patterns = []
             for label, score in zip(result['labels'], result['scores']):
@@ -50,19 +64,19 @@ class SocialMediaAnalyzer:
         text_lower = text.lower()
         
         # Engagement bait patterns
-        if any(phrase in text_lower for phrase in ["like if", "share if", "comment if", "tag someone"]):
+        if any(phrase in text_lower for phrase in self.ENGAGEMENT_BAIT_PHRASES):
             return "engagement_bait"
         
         # Viral attempt patterns
-        if any(phrase in text_lower for phrase in ["going viral", "share this", "spread the word"]):
+        if any(phrase in text_lower for phrase in self.VIRAL_PHRASES):
             return "viral_attempt"
         
         # Promotional content
-        if any(phrase in text_lower for phrase in ["buy now", "limited time", "discount", "promo code"]):
+        if any(phrase in text_lower for phrase in self.PROMOTIONAL_PHRASES):
             return "promotional"
         
         # Misinformation patterns
-        if any(phrase in text_lower for phrase in ["they don't want you to know", "hidden truth", "wake up"]):
+        if any(phrase in text_lower for phrase in self.MISINFORMATION_PHRASES):
             return "misinformation"
         
         return "normal"
@@ -0,0 +1,254 @@
+import math
+from src.analysis.text import preprocessing
+from src.analysis.text.prescreen import lexicon_hits
+from src.config.settings import settings
+
+class DocumentWindow:
+    """A token-bounded slice of a long document"""
+
+    def __init__(self, index: int, text: str, start: int, end: int, tokens: int):
+        self.index = index
+        self.text = text
+        self.start = start
+        self.end = end
+        self.tokens = tokens
+
+    def describe(self):
+        return {"window": self.index, "start": self.start, "end": self.end, "tokens": self.tokens}
+
+
+def split_windows(text: str, tokenizer=None, window_tokens: int = None, stride: int = None,
+                  max_windows: int = None, lock=None) -> tuple:
+    """Overlapping windows of at most ``window_tokens`` tokens, capped at ``max_windows``.
+
+    Returns ``(windows, total_windows)``. When the document has more windows
+    than the cap, windows containing lexicon hits are kept first and the
+    rest are spread evenly over the document. Each window's slice of the
+    document encoding is stored in the shared encodings, so detectors on the
+    same tokenizer do not tokenize it again.
+    """
+    window_tokens = window_tokens or settings.document_window_tokens
+    stride = stride if stride is not None else settings.document_window_stride
+    max_windows = max_windows or settings.document_max_windows
+
+    encoding = _encode(text, tokenizer, lock)
+    offsets = encoding.offsets if encoding else _word_offsets(text)
+    if not offsets:
+        return [DocumentWindow(0, text, 0, len(text), 0)], 1
+
+    step = max(window_tokens - stride, 1)
+    spans = []
+    for first in range(0, len(offsets), step):
+        last = min(first + window_tokens, len(offsets)) - 1
+        spans.append((first, last))
+        if last == len(offsets) - 1:
+            break
+
+    total = len(spans)
+    if total > max_windows:
+        spans = [spans[i] for i in _select(spans, offsets, text, max_windows)]
+
+    windows = []
+    for i, (first, last) in enumerate(spans):
+        start, end = offsets[first][0], offsets[last][1]
+        windows.append(DocumentWindow(i, text[start:end], start, end, last - first + 1))
+        if encoding and len(spans) > 1:
+            preprocessing.store(tokenizer, text[start:end], preprocessing.Encoding(
+                encoding.ids[first:last + 1],
+                [(a - start, b - start) for a, b in offsets[first:last + 1]]
+            ))
+    return windows, total
+
+def pool(scores: list, method: str = None) -> float:
+    """Combine per-window scores with max, mean or attention (softmax-weighted) pooling"""
+    if not scores:
+        return 0.0
+    method = method or settings.document_pooling
+    if method == "max":
+        return max(scores)
+    if method == "mean":
+        return sum(scores) / len(scores)
+    # Attention: every window contributes, weighted towards the most confident ones
+    temperature = settings.document_attention_temperature
+    weights = [math.exp(score / temperature) for score in scores]
+    return sum(w * s for w, s in zip(weights, scores)) / sum(weights)
+
+def _encode(text: str, tokenizer, lock):
+    """Shared encoding of ``text`` when a fast tokenizer gives character offsets"""
+    if tokenizer is None:
+        return None
+    try:
+        encoding = preprocessing.encode(tokenizer, text, lock)
+    except Exception:
+        return None
+    if not encoding.offsets:
+        return None
+    # Zero-width tokens cannot bound a window
+    keep = [i for i, (start, end) in enumerate(encoding.offsets) if end > start]
+    return preprocessing.Encoding([encoding.ids[i] for i in keep], [encoding.offsets[i] for i in keep])
+
+def _word_offsets(text: str) -> list:
+    """Character span of every whitespace-separated word"""
+    offsets = []
+    position = 0
+    for word in text.split():
+        start = text.index(word, position)
+        position = start + len(word)
+        offsets.append((start, position))
+    return offsets
+
+def _select(spans: list, offsets: list, text: str, limit: int) -> list:
+    flagged = [i for i, (first, last) in enumerate(spans) if lexicon_hits(text[offsets[first][0]:offsets[last][1]])]
+    chosen = set(flagged[:limit])
+    remaining = limit - len(chosen)
+    if remaining > 0:
+        others = [i for i in range(len(spans)) if i not in chosen]
+        stride = len(others) / remaining
+        chosen.update(others[int(k * stride)] for k in range(remaining))
+    return sorted(chosen)
+
+
+class DocumentAggregator:
+    """Folds per-window detector results into one document-level result.
+
+    Each aggregated result keeps the detector's usual shape, so the risk
+    scorer and summary work unchanged, and gains a ``document`` block with
+    the pooled score, every window's score and the offending spans. Single
+    window documents get the same block; their detector fields are kept
+    as the detector returned them.
+    """
+
+    def __init__(self, content_classifier, toxic_threshold: float = 0.5, nsfw_threshold: float = 0.5,
+                 pooling: str = None):
+        self.content_classifier = content_classifier
+        self.toxic_threshold = toxic_threshold
+        self.nsfw_threshold = nsfw_threshold
+        self.pooling = pooling or settings.document_pooling
+
+    def aggregate(self, name: str, results: list, windows: list) -> dict:
+        """Document-level result of detector ``name`` given one result per window"""
+        if name == "intent":
+            return self._intent(results)
+        if name == "content_categories":
+            return self._content_categories(results, windows)
+        if name == "social_analysis":
+            return self._social(results)
+
+        harm, threshold = self._harm_function(name)
+        scores = [harm(result) for result in results]
+        pooled = pool(scores, self.pooling)
+        worst = max(range(len(results)), key=scores.__getitem__)
+        result = dict(results[worst])
+        flagged = pooled > threshold
+
+        # A single window's result already describes the whole document
+        if len(results) > 1:
+            if name == "sentiment":
+                result["label"] = "NEGATIVE" if flagged else "POSITIVE"
+                result["score"] = pooled if flagged else 1.0 - pooled
+            elif name == "toxicity":
+                result.update(is_toxic=flagged, confidence=pooled if flagged else 1.0 - pooled, toxic_score=pooled)
+            elif name == "hate_speech":
+                result.update(is_hate_speech=flagged, confidence=pooled if flagged else 1.0 - pooled)
+            elif name == "nsfw":
+                result.update(is_nsfw=flagged, confidence=pooled,
+                              categories=self._union(results, "categories", scores, threshold))
+            elif name == "misinformation":
+                result.update(is_misinformation=flagged, confidence=pooled,
+                              detected_patterns=self._union(results, "detected_patterns"),
+                              categories=self._union(results, "categories", scores, threshold))
+
+        spans = [] if name == "sentiment" else self._spans(name, scores, threshold, windows)
+        result["document"] = self._document_block(scores, pooled, worst, spans)
+        return result
+
+    def _harm_function(self, name: str):
+        if name == "sentiment":
+            return (lambda r: r.get("score", 0.0) if r.get("label") == "NEGATIVE" else 1.0 - r.get("score", 1.0)), 0.5
+        if name == "toxicity":
+            return (lambda r: r.get("toxic_score", r.get("confidence", 0.0) if r.get("is_toxic") else 0.0)), \
+                self.toxic_threshold
+        if name == "hate_speech":
+            return (lambda r: r.get("confidence", 0.0) if r.get("is_hate_speech") else 1.0 - r.get("confidence", 1.0)), 0.5
+        if name == "nsfw":
+            return (lambda r: max([score for label, score in r.get("scores", {}).items() if label != "safe content"]
+                                  or [r.get("confidence", 0.0)])), self.nsfw_threshold
+        return (lambda r: r.get("confidence", 0.0)), 0.5
+
+    def _intent(self, results: list):
+        # Intent describes the whole document, so windows are averaged whatever the pooling
+        scored = [result["all_scores"] for result in results if result.get("all_scores")]
+        if len(scored) <= 1:
+            return {**results[0], "document": {"pooling": "mean", "windows": len(results)}}
+        averaged = {key: sum(scores[key] for scores in scored) / len(scored) for key in scored[0]}
+        primary = max(averaged, key=averaged.get)
+        return {
+            "intent": primary,
+            "confidence": averaged[primary],
+            "all_scores": averaged,
+            "document": {"pooling": "mean", "windows": len(scored)}
+        }
+
+    def _content_categories(self, results: list, windows: list):
+        scored = [result.get("category_scores", {}) for result in results]
+        categories = {key for scores in scored for key in scores}
+        if not categories:
+            return dict(results[0])
+
+        if len(results) == 1:
+            result = dict(results[0])
+        else:
+            pooled = {key: round(pool([scores.get(key, 0.0) for scores in scored], self.pooling), 3) for key in categories}
+            result = self.content_classifier.summarize(pooled)
+
+        # A window's harm is its strongest non-neutral category
+        neutral = self.content_classifier.NEUTRAL_CATEGORIES
+        window_scores = [max([score for key, score in scores.items() if key not in neutral] or [0.0]) for scores in scored]
+        worst = max(range(len(results)), key=window_scores.__getitem__)
+        spans = self._spans("content_categories", window_scores, self.content_classifier.DETECTION_THRESHOLD, windows)
+        result["document"] = self._document_block(window_scores, pool(window_scores, self.pooling), worst, spans)
+        return result
+
+    def _social(self, results: list):
+        patterns = {}
+        for result in results:
+            for pattern in result.get("social_patterns", []):
+                patterns[pattern["pattern"]] = max(patterns.get(pattern["pattern"], 0.0), pattern["confidence"])
+        intents = [result.get("engagement_intent") for result in results if result.get("engagement_intent") not in (None, "normal")]
+        merged = dict(results[0])
+        merged["social_patterns"] = [
+            {"pattern": pattern, "confidence": confidence}
+            for pattern, confidence in sorted(patterns.items(), key=lambda item: item[1], reverse=True)
+        ]
+        merged["engagement_intent"] = max(set(intents), key=intents.count) if intents else merged.get("engagement_intent", "normal")
+        return merged
+
+    def _document_block(self, scores: list, pooled: float, worst: int, spans: list):
+        return {
+            "pooling": self.pooling,
+            "pooled_score": round(pooled, 4),
+            "max_window": worst,
+            "window_scores": [round(score, 4) for score in scores],
+            "offending_spans": spans
+        }
+
+    def _spans(self, name: str, scores: list, threshold: float, windows: list):
+        return [
+            {
+                "detector": name,
+                **window.describe(),
+                "score": round(score, 4),
+                "excerpt": window.text[:200] + ("..." if len(window.text) > 200 else "")
+            }
+            for window, score in zip(windows, scores) if score > threshold
+        ]
+
+    def _union(self, results: list, key: str, scores: list = None, threshold: float = None):
+        merged = []
+        for i, result in enumerate(results):
+            if scores is not None and scores[i] <= threshold:
+                continue
+            for item in result.get(key, []):
+                if item not in merged:
+                    merged.append(item)
+        return merged
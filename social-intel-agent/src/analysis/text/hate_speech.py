@@ -1,21 +1,39 @@
-from transformers import pipeline
+from src.analysis.model_registry import model_registry
+from src.analysis.text import preprocessing
+from src.services.inference_cache import fingerprint
 
 class HateSpeechDetector:
+    MODEL_ID = "Hate-speech-CNERG/dehatebert-mono"
+    HATE_LABELS = ["hate", "offensive", "hateful"]
+    
     def __init__(self):
         try:
-            self.classifier = pipeline("text-classification", model="Hate-speech-CNERG/dehatebert-mono")
+            self.classifier = model_registry.get_pipeline("text-classification", self.MODEL_ID)
         except:
             self.classifier = None
     
+    def cache_fingerprint(self):
+        """Everything besides the text that determines this detector's output"""
+        if not self.classifier:
+            return None
+        return fingerprint(model=self.MODEL_ID, revision=self.classifier.revision, hate_labels=self.HATE_LABELS)
+    
     def detect(self, text: str):
+        return self.detect_batch([text])[0]
+    
+    def detect_batch(self, texts: list):
+        """Score several texts in one padded forward pass"""
         if not self.classifier:
-            return {"is_hate_speech": False, "confidence": 0.0, "label": "unknown"}
+            return [{"is_hate_speech": False, "confidence": 0.0, "label": "unknown"} for _ in texts]
         
-        result = self.classifier(text[:512])
-        is_hate = result[0]["label"].lower() in ["hate", "offensive", "hateful"]
+        results = preprocessing.classify(self.classifier, texts)
+        return [self._to_result(result) for result in results]
+    
+    def _to_result(self, result):
+        is_hate = result["label"].lower() in self.HATE_LABELS
         
         return {
             "is_hate_speech": is_hate,
-            "confidence": result[0]["score"],
-            "label": result[0]["label"]
+            "confidence": result["score"],
+            "label": result["label"]
         }
@@ -1,38 +1,49 @@
-from transformers import pipeline
-import re
+from src.analysis.text.nli_engine import NLITask, get_nli_engine
+from src.analysis.text.preprocessing import normalize_text
 
 class IntentDetector:
     """Detects if content is reporting vs endorsing harmful content"""
     
+    INTENT_LABELS = [
+        "this text is reporting news about harmful content",
+        "this text is endorsing harmful content",
+        "this text is neutral discussion",
+        "this text describes a personal experience"
+    ]
+    
     def __init__(self):
         try:
-            self.classifier = pipeline("zero-shot-classification", model="facebook/bart-large-mnli")
+            self.engine = get_nli_engine("facebook/bart-large-mnli")
         except:
-            self.classifier = None
+            self.engine = None
+    
+    def nli_tasks(self, text: str) -> list:
+        """One NLI task per chunk, for fused scoring with other detectors"""
+        if not self.engine or not text or len(text) < 10:
+            return []
+        
+        # Fix 4: Split long text into chunks for better intent detection
+        chunks = self._split_into_chunks(text, max_tokens=300)
+        return [NLITask(f"intent:{i}", chunk, self.INTENT_LABELS) for i, chunk in enumerate(chunks)]
     
-    def detect(self, text: str):
-        if not self.classifier or not text or len(text) < 10:
+    def detect(self, text: str, nli_results: dict = None):
+        if not self.engine or not text or len(text) < 10:
             return {"intent": "unknown", "confidence": 0.0}
         
         try:
-            # Fix 4: Split long text into chunks for better intent detection
-            chunks = self._split_into_chunks(text, max_tokens=300)
+            tasks = self.nli_tasks(text)
             
-            if len(chunks) == 0:
+            if len(tasks) == 0:
                 return {"intent": "unknown", "confidence": 0.0}
             
-            # Analyze each chunk
-            labels = [
-                "this text is reporting news about harmful content",
-                "this text is endorsing harmful content",
-                "this text is neutral discussion",
-                "this text describes a personal experience"
-            ]
+            # All chunks are scored together unless already scored in a fused pass
+            if nli_results is None:
+                nli_results = self.engine.run(tasks)
             
             intent_scores = {"reporting": [], "endorsing": [], "neutral": [], "personal": []}
             
-            for chunk in chunks:
-                result = self.classifier(chunk, labels)
+            for task in tasks:
+                result = nli_results[task.key]
                 
                 for label, score in zip(result['labels'], result['scores']):
                     if "reporting news" in label:
@@ -62,8 +73,7 @@ class IntentDetector:
     def _split_into_chunks(self, text: str, max_tokens: int = 300) -> list:
         """Split text into chunks of approximately max_tokens words"""
         # Clean text first
-        text = re.sub(r'@\w+|u/\w+', '', text)
-        text = re.sub(r'http\S+|www\S+', '', text)
+        text = normalize_text(text)
         
         words = text.split()
         chunks = []
@@ -73,4 +83,5 @@ class IntentDetector:
             if len(chunk.strip()) > 20:  # Minimum chunk size
                 chunks.append(chunk)
         
-        return chunks if chunks else [text[:512]]
+        # The engine truncates a single short chunk in tokens
+        return chunks if chunks else [text]
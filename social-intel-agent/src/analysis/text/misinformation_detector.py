@@ -1,30 +1,50 @@
-from transformers import pipeline
+from src.analysis.text.nli_engine import NLITask, get_nli_engine
 import re
 from src.config.logger import setup_logger
 
 logger = setup_logger(__name__)
 
 class MisinformationDetector:
+    # Misinformation labels
+    MISINFO_LABELS = [
+        "conspiracy theory", "fake news", "medical misinformation", 
+        "political misinformation", "scientific misinformation",
+        "hoax", "propaganda", "factual information"
+    ]
+    
+    # Phrase lists behind the pattern checks (also used by the text pre-screen)
+    CONSPIRACY_PHRASES = [
+        "they don't want you to know", "hidden truth", "wake up sheeple",
+        "mainstream media lies", "cover up", "deep state", "new world order"
+    ]
+    URGENCY_PHRASES = [
+        "urgent", "breaking", "shocking truth", "must share", "before it's too late"
+    ]
+    AUTHORITY_PHRASES = [
+        "doctors hate this", "scientists don't want", "government hiding"
+    ]
+    
     def __init__(self):
         try:
-            self.classifier = pipeline("zero-shot-classification", model="facebook/bart-large-mnli")
+            self.engine = get_nli_engine("facebook/bart-large-mnli")
         except:
-            self.classifier = None
+            self.engine = None
     
-    def detect(self, text: str):
+    def nli_tasks(self, text: str) -> list:
+        """NLI work for ``text``, for fused scoring with other detectors"""
+        if not self.engine:
+            return []
+        return [NLITask("misinformation", text, self.MISINFO_LABELS)]
+    
+    def detect(self, text: str, nli_results: dict = None):
         """Detect misinformation patterns"""
-        if not self.classifier:
+        if not self.engine:
             return {"is_misinformation": False, "confidence": 0.0}
         
         try:
-            # Misinformation labels
-            labels = [
-                "conspiracy theory", "fake news", "medical misinformation", 
-                "political misinformation", "scientific misinformation",
-                "hoax", "propaganda", "factual information"
-            ]
-            
-            result = self.classifier(text, candidate_labels=labels)
+            if nli_results is None:
+                nli_results = self.engine.run(self.nli_tasks(text))
+            result = nli_results["misinformation"]
             
             # Check for misinformation patterns
             misinfo_patterns = self._check_patterns(text)
@@ -55,25 +75,15 @@ class MisinformationDetector:
         patterns = []
         
         # Conspiracy patterns
-        conspiracy_phrases = [
-            "they don't want you to know", "hidden truth", "wake up sheeple",
-            "mainstream media lies", "cover up", "deep state", "new world order"
-        ]
-        if any(phrase in text_lower for phrase in conspiracy_phrases):
+        if any(phrase in text_lower for phrase in self.CONSPIRACY_PHRASES):
             patterns.append("conspiracy_language")
         
         # Urgency/fear patterns
-        urgency_phrases = [
-            "urgent", "breaking", "shocking truth", "must share", "before it's too late"
-        ]
-        if any(phrase in text_lower for phrase in urgency_phrases):
+        if any(phrase in text_lower for phrase in self.URGENCY_PHRASES):
             patterns.append("urgency_manipulation")
         
         # False authority patterns
-        authority_phrases = [
-            "doctors hate this", "scientists don't want", "government hiding"
-        ]
-        if any(phrase in text_lower for phrase in authority_phrases):
+        if any(phrase in text_lower for phrase in self.AUTHORITY_PHRASES):
             patterns.append("false_authority")
         
         # Emotional manipulation
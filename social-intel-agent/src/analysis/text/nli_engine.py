@@ -0,0 +1,152 @@
+import threading
+import torch
+from src.analysis.model_registry import model_registry
+from src.analysis.text import preprocessing
+from src.config.settings import settings
+from src.config.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+DEFAULT_HYPOTHESIS_TEMPLATE = "This example is {}."
+
+class NLITask:
+    """One premise scored against a set of candidate labels"""
+
+    def __init__(self, key: str, premise: str, labels: list, multi_label: bool = False,
+                 hypothesis_template: str = DEFAULT_HYPOTHESIS_TEMPLATE):
+        self.key = key
+        self.premise = premise
+        self.labels = list(labels)
+        # Same rule as the HF pipeline: a single label is always scored independently
+        self.multi_label = multi_label or len(self.labels) == 1
+        self.hypothesis_template = hypothesis_template
+
+
+class ZeroShotNLIEngine:
+    """Scores premise/hypothesis pairs from many detectors in shared padded batches.
+
+    Produces the same ``{"sequence", "labels", "scores"}`` dicts as the
+    ``zero-shot-classification`` pipeline, but each distinct premise and
+    hypothesis is tokenized once (premises through the shared encodings, so
+    other calls over the same text reuse them) and all pairs go through the
+    model together.
+    """
+
+    def __init__(self, model_id: str = "facebook/bart-large-mnli", batch_size: int = None):
+        self.model_id = model_id
+        self.batch_size = batch_size or settings.nli_batch_size
+        self._pipe = model_registry.get_pipeline("zero-shot-classification", model_id)
+        self.tokenizer = self._pipe.tokenizer
+        self.model = self._pipe.model
+        self.entailment_id = self._find_entailment_id()
+        self.contradiction_id = -1 if self.entailment_id == 0 else 0
+        self.max_length = min(settings.nli_max_length, self.tokenizer.model_max_length or settings.nli_max_length)
+        self._pair_overhead = self.tokenizer.num_special_tokens_to_add(pair=True)
+        self._hypothesis_ids = {}
+
+    @property
+    def revision(self) -> str:
+        return self._pipe.revision
+
+    def run(self, tasks: list) -> dict:
+        """Score every task and return results keyed by ``task.key``"""
+        if not tasks:
+            return {}
+
+        # The tokenizer is not safe for concurrent use, so hold the model lock throughout
+        with self._pipe.lock:
+            # Tokenize each distinct premise once, hypotheses are cached across calls
+            premise_ids = {}
+            pairs = []
+            for task_index, task in enumerate(tasks):
+                if task.premise not in premise_ids:
+                    premise_ids[task.premise] = preprocessing.encode(self.tokenizer, task.premise, self._pipe.lock).ids
+                for label_index, label in enumerate(task.labels):
+                    hypothesis = self._encode_hypothesis(task.hypothesis_template.format(label))
+                    pairs.append((task_index, label_index, self._build_pair(premise_ids[task.premise], hypothesis)))
+
+            logits = self._forward([input_ids for _, _, input_ids in pairs])
+
+        per_task = [[None] * len(task.labels) for task in tasks]
+        for (task_index, label_index, _), row in zip(pairs, logits):
+            per_task[task_index][label_index] = row
+
+        return {task.key: self._to_result(task, torch.stack(rows)) for task, rows in zip(tasks, per_task)}
+
+    def run_many(self, task_lists: list) -> list:
+        """Score several independent task lists (e.g. from different requests) together"""
+        flat = []
+        for index, tasks in enumerate(task_lists):
+            for task in tasks:
+                flat.append(NLITask(f"{index}|{task.key}", task.premise, task.labels,
+                                    task.multi_label, task.hypothesis_template))
+
+        results = [{} for _ in task_lists]
+        for key, result in self.run(flat).items():
+            index, task_key = key.split("|", 1)
+            results[int(index)][task_key] = result
+        return results
+
+    def _forward(self, sequences: list):
+        """Run all pair sequences through the model in length-sorted batches"""
+        order = sorted(range(len(sequences)), key=lambda i: len(sequences[i]))
+        outputs = [None] * len(sequences)
+
+        with torch.inference_mode():
+            for start in range(0, len(order), self.batch_size):
+                batch_index = order[start:start + self.batch_size]
+                batch = self.tokenizer.pad(
+                    {"input_ids": [sequences[i] for i in batch_index]},
+                    padding=True,
+                    return_tensors="pt"
+                )
+                batch = {k: v.to(self.model.device) for k, v in batch.items()}
+                batch_logits = self.model(**batch).logits.float().cpu()
+                for row, i in zip(batch_logits, batch_index):
+                    outputs[i] = row
+
+        return outputs
+
+    def _to_result(self, task: NLITask, logits):
+        if task.multi_label:
+            entail_contr = logits[:, [self.contradiction_id, self.entailment_id]]
+            scores = entail_contr.softmax(dim=-1)[:, 1]
+        else:
+            scores = logits[:, self.entailment_id].softmax(dim=-1)
+
+        scores = scores.tolist()
+        ranked = sorted(zip(task.labels, scores), key=lambda item: item[1], reverse=True)
+        return {
+            "sequence": task.premise,
+            "labels": [label for label, _ in ranked],
+            "scores": [score for _, score in ranked]
+        }
+
+    def _encode_hypothesis(self, hypothesis: str) -> list:
+        ids = self._hypothesis_ids.get(hypothesis)
+        if ids is None:
+            ids = self.tokenizer(hypothesis, add_special_tokens=False)["input_ids"]
+            self._hypothesis_ids[hypothesis] = ids
+        return ids
+
+    def _build_pair(self, premise_ids: list, hypothesis_ids: list) -> list:
+        # Truncate the premise only, like truncation="only_first" in the pipeline
+        budget = max(self.max_length - len(hypothesis_ids) - self._pair_overhead, 1)
+        return self.tokenizer.build_inputs_with_special_tokens(premise_ids[:budget], hypothesis_ids)
+
+    def _find_entailment_id(self) -> int:
+        for label, index in self.model.config.label2id.items():
+            if label.lower().startswith("entail"):
+                return index
+        return -1
+
+
+_engines = {}
+_engines_lock = threading.Lock()
+
+def get_nli_engine(model_id: str = "facebook/bart-large-mnli"):
+    """Shared engine for ``model_id``; the underlying weights come from the model registry"""
+    with _engines_lock:
+        if model_id not in _engines:
+            _engines[model_id] = ZeroShotNLIEngine(model_id)
+        return _engines[model_id]
@@ -1,27 +1,50 @@
-from transformers import pipeline
+from src.analysis.text.nli_engine import NLITask, get_nli_engine
+from src.services.inference_cache import fingerprint
 
 class NSFWDetector:
     """Detects sexual and explicit adult content"""
     
+    MODEL_ID = "cross-encoder/nli-distilroberta-base"
+    NSFW_LABELS = ["sexual content", "explicit adult content", "pornography", "safe content"]
+    NSFW_THRESHOLD = 0.5
+    
     def __init__(self):
         try:
-            self.classifier = pipeline("zero-shot-classification", model="cross-encoder/nli-distilroberta-base")
+            self.engine = get_nli_engine(self.MODEL_ID)
         except:
-            self.classifier = None
+            self.engine = None
+    
+    def cache_fingerprint(self):
+        """Everything besides the text that determines this detector's output"""
+        if not self.engine:
+            return None
+        return fingerprint(
+            model=self.MODEL_ID,
+            revision=self.engine.revision,
+            labels=self.NSFW_LABELS,
+            threshold=self.NSFW_THRESHOLD
+        )
     
-    def detect(self, text: str):
-        if not self.classifier or not text or len(text) < 10:
+    def nli_tasks(self, text: str, key: str = "nsfw") -> list:
+        """NLI work for ``text``; give each text its own ``key`` when batching several"""
+        if not self.engine or not text or len(text) < 10:
+            return []
+        return [NLITask(key, text, self.NSFW_LABELS)]
+    
+    def detect(self, text: str, nli_results: dict = None, key: str = "nsfw"):
+        if not self.engine or not text or len(text) < 10:
             return {"is_nsfw": False, "confidence": 0.0, "categories": []}
         
         try:
-            labels = ["sexual content", "explicit adult content", "pornography", "safe content"]
-            result = self.classifier(text[:512], labels)
+            if nli_results is None:
+                nli_results = self.engine.run(self.nli_tasks(text, key))
+            result = nli_results[key]
             
             nsfw_categories = []
             max_nsfw_score = 0.0
             
             for label, score in zip(result['labels'], result['scores']):
-                if label != "safe content" and score > 0.5:
+                if label != "safe content" and score > self.NSFW_THRESHOLD:
                     nsfw_categories.append(label)
                     max_nsfw_score = max(max_nsfw_score, score)
             
@@ -33,3 +56,17 @@ class NSFWDetector:
             }
         except:
             return {"is_nsfw": False, "confidence": 0.0, "categories": []}
+    
+    def detect_batch(self, texts: list):
+        """Score several texts in one padded forward pass"""
+        if not self.engine:
+            return [self.detect(text) for text in texts]
+        
+        tasks = []
+        for i, text in enumerate(texts):
+            tasks.extend(self.nli_tasks(text, key=f"nsfw:{i}"))
+        try:
+            nli_results = self.engine.run(tasks)
+        except:
+            nli_results = {}
+        return [self.detect(text, nli_results, key=f"nsfw:{i}") for i, text in enumerate(texts)]
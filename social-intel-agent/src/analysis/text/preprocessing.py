@@ -0,0 +1,142 @@
+"""Text normalisation and tokenization shared by every text detector.
+
+Text is normalised once, then tokenized once per distinct tokenizer: the
+encodings are cached by tokenizer content, so detectors whose models share
+a vocabulary (and every NLI task over the same premise) reuse one encoding.
+Classifiers are fed the token ids directly and truncate in tokens.
+"""
+import hashlib
+import json
+import re
+import threading
+from collections import OrderedDict
+from contextlib import nullcontext
+
+ENCODING_CACHE_SIZE = 1024
+# Longest sequence fed to a classifier when the tokenizer reports no sensible limit
+DEFAULT_MAX_LENGTH = 512
+
+QUOTE_PATTERN = re.compile(r'^>.*$', re.MULTILINE)
+MARKDOWN_LINK_PATTERN = re.compile(r'\[([^\]]+)\]\([^\)]+\)')
+URL_PATTERN = re.compile(r'https?://\S+|www\.\S+')
+MENTION_PATTERN = re.compile(r'@\w+|\bu/\w+')
+DELETED_PATTERN = re.compile(r'\[(deleted|removed)\]', re.IGNORECASE)
+WHITESPACE_PATTERN = re.compile(r'\s+')
+
+def normalize_text(text: str) -> str:
+    """Strip quotes, links, URLs, mentions and deleted markers, and collapse whitespace.
+
+    Idempotent, so detectors can call it on text that is already normalised.
+    """
+    if not text:
+        return ""
+    # Quote blocks first, while line breaks still mark them
+    text = QUOTE_PATTERN.sub('', text)
+    # Markdown links keep their text, then bare URLs go
+    text = MARKDOWN_LINK_PATTERN.sub(r'\1', text)
+    text = URL_PATTERN.sub('', text)
+    text = MENTION_PATTERN.sub('', text)
+    text = DELETED_PATTERN.sub('', text)
+    return WHITESPACE_PATTERN.sub(' ', text).strip()
+
+
+class Encoding:
+    """Token ids of a text without special tokens, plus character offsets from fast tokenizers"""
+
+    def __init__(self, ids: list, offsets: list = None):
+        self.ids = ids
+        self.offsets = offsets
+
+
+_tokenizer_keys = {}
+_encodings = OrderedDict()
+_encodings_lock = threading.Lock()
+
+def tokenizer_key(tokenizer) -> str:
+    """Identity of a tokenizer's vocabulary and rules, equal for tokenizers that encode alike"""
+    key = _tokenizer_keys.get(id(tokenizer))
+    if key is None:
+        backend = getattr(tokenizer, "backend_tokenizer", None)
+        if backend is not None:
+            config = json.loads(backend.to_str())
+            # Truncation and padding are call-time state the pipelines change
+            config.pop("truncation", None)
+            config.pop("padding", None)
+            source = json.dumps(config, sort_keys=True)
+        else:
+            source = f"{type(tokenizer).__name__}:{getattr(tokenizer, 'name_or_path', '')}"
+        key = hashlib.sha1(source.encode("utf-8")).hexdigest()[:16]
+        _tokenizer_keys[id(tokenizer)] = key
+    return key
+
+def encode(tokenizer, text: str, lock=None) -> Encoding:
+    """Encoding of ``text``, tokenized at most once per distinct tokenizer.
+
+    ``lock`` is the owning model's lock; fast tokenizers must not be used
+    by two threads at once.
+    """
+    key = (tokenizer_key(tokenizer), text)
+    with _encodings_lock:
+        encoding = _encodings.get(key)
+        if encoding is not None:
+            _encodings.move_to_end(key)
+            return encoding
+
+    with lock or nullcontext():
+        if getattr(tokenizer, "is_fast", False):
+            encoded = tokenizer(text, add_special_tokens=False, return_offsets_mapping=True,
+                                truncation=False, verbose=False)
+            encoding = Encoding(encoded["input_ids"], [tuple(span) for span in encoded["offset_mapping"]])
+        else:
+            encoding = Encoding(tokenizer(text, add_special_tokens=False, truncation=False, verbose=False)["input_ids"])
+
+    store(tokenizer, text, encoding)
+    return encoding
+
+def store(tokenizer, text: str, encoding: Encoding):
+    """Record an encoding derived elsewhere, e.g. a window sliced from a document's encoding"""
+    key = (tokenizer_key(tokenizer), text)
+    with _encodings_lock:
+        _encodings[key] = encoding
+        _encodings.move_to_end(key)
+        while len(_encodings) > ENCODING_CACHE_SIZE:
+            _encodings.popitem(last=False)
+
+def max_length(tokenizer) -> int:
+    limit = getattr(tokenizer, "model_max_length", None) or DEFAULT_MAX_LENGTH
+    return min(limit, DEFAULT_MAX_LENGTH)
+
+def classify(pipe, texts: list) -> list:
+    """Top ``{"label", "score"}`` per text, like a text-classification pipeline call.
+
+    ``pipe`` is a shared pipeline from the model registry. The texts go
+    through the shared encodings and are truncated in tokens to the model's
+    limit before one padded forward pass.
+    """
+    # torch only where models run, so the scrapers can normalise text without it
+    import torch
+
+    tokenizer, model = pipe.tokenizer, pipe.model
+    budget = max_length(tokenizer) - tokenizer.num_special_tokens_to_add(pair=False)
+    sequences = [
+        tokenizer.build_inputs_with_special_tokens(encode(tokenizer, text, pipe.lock).ids[:budget])
+        for text in texts
+    ]
+
+    with pipe.lock, torch.inference_mode():
+        batch = tokenizer.pad({"input_ids": sequences}, padding=True, return_tensors="pt")
+        batch = {k: v.to(model.device) for k, v in batch.items()}
+        logits = model(**batch).logits.float().cpu()
+
+    config = model.config
+    # Same activation the pipeline picks for the model's problem type
+    if config.problem_type == "multi_label_classification" or config.num_labels == 1:
+        scores = logits.sigmoid()
+    else:
+        scores = logits.softmax(dim=-1)
+
+    results = []
+    for row in scores:
+        index = int(row.argmax())
+        results.append({"label": config.id2label[index], "score": row[index].item()})
+    return results
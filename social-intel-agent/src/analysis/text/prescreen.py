@@ -0,0 +1,234 @@
+"""Cheap pre-screen that lets clearly benign text skip the zero-shot NLI detectors.
+
+A single compiled regex over a harm lexicon plus a hashed-feature logistic
+regression decide whether text is confidently safe. Anything with a lexicon
+hit or a harm probability at or above the threshold goes through the full
+detector stack.
+
+Train and evaluate on the labelled fixture set (from social-intel-agent/):
+    python -m src.analysis.text.prescreen train
+    python -m src.analysis.text.prescreen evaluate [--threshold 0.2]
+"""
+import argparse
+import json
+import math
+import os
+import random
+import re
+import sys
+import threading
+import zlib
+from src.analysis.text.misinformation_detector import MisinformationDetector
+from src.analysis.social.social_media_analyzer import SocialMediaAnalyzer
+from src.config.settings import settings
+
+WEIGHTS_PATH = os.path.join(os.path.dirname(__file__), "prescreen_weights.json")
+FIXTURE_PATH = os.path.join(os.path.dirname(__file__), "..", "fixtures", "prescreen_labelled.jsonl")
+
+HASH_BUCKETS = 4096
+
+LEXICON = {
+    "slurs": [
+        "subhuman", "vermin", "cockroaches", "parasites", "savages", "scum", "filth",
+        "degenerates", "inbred", "retard", "retarded", "your kind", "go back to your country",
+        "go back to where you came from"
+    ],
+    "insult": [
+        "idiot", "stupid", "moron", "loser", "shut up", "pathetic", "worthless",
+        "hate you", "dumb", "kill yourself", "kys"
+    ],
+    "threat": [
+        "kill you", "i will kill", "gonna kill", "going to kill", "shoot you", "stab you",
+        "beat you up", "burn down", "you will pay", "watch your back", "i know where you live",
+        "blow up", "should be killed", "should die", "deserve to die", "hang them", "death to"
+    ],
+    "sexual": [
+        "porn", "nude", "nudes", "naked", "xxx", "sex video", "onlyfans", "nsfw", "horny",
+        "hookup", "hot singles", "erotic", "explicit photos"
+    ],
+    "scam": SocialMediaAnalyzer.PROMOTIONAL_PHRASES + SocialMediaAnalyzer.ENGAGEMENT_BAIT_PHRASES + [
+        "free iphone", "click here", "act now", "wire transfer", "crypto giveaway",
+        "guaranteed returns", "double your money", "claim your prize", "you have won",
+        "verify your account", "gift card"
+    ],
+    "conspiracy": (
+        MisinformationDetector.CONSPIRACY_PHRASES + MisinformationDetector.AUTHORITY_PHRASES
+        + SocialMediaAnalyzer.MISINFORMATION_PHRASES + [
+            "plandemic", "chemtrails", "microchip", "false flag", "crisis actors", "mind control",
+            "miracle cure"
+        ]
+    )
+}
+
+def compile_lexicon(lexicon: dict = LEXICON):
+    """One alternation with a named group per category, longest phrases first"""
+    groups = []
+    for category, phrases in lexicon.items():
+        escaped = sorted({r"\s+".join(map(re.escape, phrase.split())) for phrase in phrases}, key=len, reverse=True)
+        groups.append(f"(?P<{category}>{'|'.join(escaped)})")
+    return re.compile(r"\b(?:" + "|".join(groups) + r")\b", re.IGNORECASE)
+
+LEXICON_PATTERN = compile_lexicon()
+TOKEN_PATTERN = re.compile(r"[a-z0-9']+")
+
+def lexicon_hits(text: str) -> dict:
+    """``{category: [matched phrases]}`` for every lexicon match in ``text``"""
+    hits = {}
+    for match in LEXICON_PATTERN.finditer(text):
+        hits.setdefault(match.lastgroup, []).append(match.group(0).lower())
+    return hits
+
+def features(text: str, hits: dict = None) -> dict:
+    """Sparse hashed unigram/bigram counts plus lexicon category counts"""
+    tokens = TOKEN_PATTERN.findall(text.lower())
+    counts = {}
+    grams = [f"w:{token}" for token in tokens] + [f"b:{a}_{b}" for a, b in zip(tokens, tokens[1:])]
+    for gram in grams:
+        # crc32 rather than hash(), which is salted per process
+        index = zlib.crc32(gram.encode("utf-8")) % HASH_BUCKETS
+        counts[index] = counts.get(index, 0.0) + 1.0
+    # Length-normalise so long pages are not pushed towards either class
+    scale = 1.0 / math.sqrt(len(grams)) if grams else 1.0
+    vector = {index: value * scale for index, value in counts.items()}
+    for category, matches in (hits if hits is not None else lexicon_hits(text)).items():
+        vector[f"lex:{category}"] = float(len(matches))
+    return vector
+
+
+class Prescreener:
+    """Decides whether text is confidently safe, and counts how often it is"""
+
+    def __init__(self, weights_path: str = WEIGHTS_PATH, threshold: float = None):
+        self.threshold = threshold if threshold is not None else settings.prescreen_safe_threshold
+        self.bias = 0.0
+        self.weights = {}
+        self._lock = threading.Lock()
+        self._screened = 0
+        self._skipped = 0
+        self._category_hits = {category: 0 for category in LEXICON}
+        self.load(weights_path)
+
+    def load(self, path: str):
+        try:
+            with open(path) as f:
+                data = json.load(f)
+            self.bias = data["bias"]
+            self.weights = {self._key(key): value for key, value in data["weights"].items()}
+        except Exception:
+            # Without weights only the lexicon decides, and nothing is ever confidently safe
+            self.bias = 0.0
+            self.weights = {}
+
+    def harm_probability(self, vector: dict) -> float:
+        if not self.weights:
+            return 1.0
+        z = self.bias + sum(self.weights.get(key, 0.0) * value for key, value in vector.items())
+        return 1.0 / (1.0 + math.exp(-max(min(z, 30.0), -30.0)))
+
+    def screen(self, text: str) -> dict:
+        """Pre-screen verdict for ``text``; ``safe`` means the NLI detectors can be skipped"""
+        hits = lexicon_hits(text)
+        probability = self.harm_probability(features(text, hits))
+        safe = not hits and probability < self.threshold
+
+        with self._lock:
+            self._screened += 1
+            self._skipped += int(safe)
+            for category in hits:
+                self._category_hits[category] += 1
+
+        return {
+            "safe": safe,
+            "harm_probability": round(probability, 4),
+            "threshold": self.threshold,
+            "lexicon_hits": hits
+        }
+
+    def stats(self):
+        return {
+            "screened": self._screened,
+            "skipped": self._skipped,
+            "skip_rate": round(self._skipped / self._screened, 4) if self._screened else 0.0,
+            "threshold": self.threshold,
+            "lexicon_hits": dict(self._category_hits)
+        }
+
+    def _key(self, key: str):
+        return key if key.startswith("lex:") else int(key)
+
+
+def load_fixture(path: str = FIXTURE_PATH, split: str = None) -> list:
+    with open(path) as f:
+        rows = [json.loads(line) for line in f if line.strip()]
+    return [row for row in rows if split is None or row.get("split") == split]
+
+def train(rows: list, epochs: int = 60, learning_rate: float = 0.5, l2: float = 1e-4, seed: int = 13) -> dict:
+    """Plain SGD logistic regression over the sparse features"""
+    rng = random.Random(seed)
+    examples = [(features(row["text"]), float(row["harmful"])) for row in rows]
+    weights = {}
+    bias = 0.0
+    for epoch in range(epochs):
+        rng.shuffle(examples)
+        rate = learning_rate / (1.0 + epoch * 0.1)
+        for vector, label in examples:
+            z = bias + sum(weights.get(key, 0.0) * value for key, value in vector.items())
+            error = 1.0 / (1.0 + math.exp(-max(min(z, 30.0), -30.0))) - label
+            bias -= rate * error
+            for key, value in vector.items():
+                weights[key] = weights.get(key, 0.0) * (1.0 - rate * l2) - rate * error * value
+    return {
+        "hash_buckets": HASH_BUCKETS,
+        "bias": round(bias, 5),
+        "weights": {str(key): round(value, 5) for key, value in sorted(weights.items(), key=lambda item: str(item[0]))
+                    if abs(value) >= 1e-4}
+    }
+
+def evaluate(prescreener: Prescreener, rows: list) -> dict:
+    """Skip rate over all rows and false-negative rate over the harmful ones"""
+    skipped = 0
+    harmful = 0
+    missed = []
+    for row in rows:
+        safe = prescreener.screen(row["text"])["safe"]
+        skipped += int(safe)
+        if row["harmful"]:
+            harmful += 1
+            if safe:
+                missed.append(row["text"])
+    return {
+        "rows": len(rows),
+        "skip_rate": round(skipped / len(rows), 4) if rows else 0.0,
+        "false_negative_rate": round(len(missed) / harmful, 4) if harmful else 0.0,
+        "false_negatives": missed
+    }
+
+def main(argv: list = None) -> int:
+    parser = argparse.ArgumentParser(description="Train or evaluate the text pre-screen")
+    parser.add_argument("command", choices=["train", "evaluate"])
+    parser.add_argument("--data", default=FIXTURE_PATH, help="Labelled JSONL of {text, harmful, split}")
+    parser.add_argument("--weights", default=WEIGHTS_PATH)
+    parser.add_argument("--threshold", type=float, default=None)
+    args = parser.parse_args(argv)
+
+    if args.command == "train":
+        model = train(load_fixture(args.data, split="train"))
+        with open(args.weights, "w") as f:
+            json.dump(model, f, indent=0, sort_keys=True)
+        print(f"Wrote {len(model['weights'])} weights to {args.weights}")
+
+    prescreener = Prescreener(args.weights, threshold=args.threshold)
+    for split in ("train", "test"):
+        report = evaluate(prescreener, load_fixture(args.data, split=split))
+        print(f"{split:<5} rows={report['rows']:<4} skip_rate={report['skip_rate']:.3f} "
+              f"false_negative_rate={report['false_negative_rate']:.3f}")
+        for text in report["false_negatives"]:
+            print(f"      missed: {text}")
+    return 0
+
+
+# Global pre-screen instance
+prescreener = Prescreener()
+
+if __name__ == "__main__":
+    sys.exit(main())
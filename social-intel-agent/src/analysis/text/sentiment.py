@@ -1,12 +1,27 @@
-from transformers import pipeline
+from src.analysis.model_registry import model_registry
+from src.analysis.text import preprocessing
+from src.services.inference_cache import fingerprint
 
 class SentimentAnalyzer:
+    MODEL_ID = "distilbert-base-uncased-finetuned-sst-2-english"
+    
     def __init__(self):
-        self.classifier = pipeline("sentiment-analysis")
+        self.classifier = model_registry.get_pipeline("sentiment-analysis", self.MODEL_ID)
+    
+    def cache_fingerprint(self):
+        """Everything besides the text that determines this detector's output"""
+        return fingerprint(model=self.MODEL_ID, revision=self.classifier.revision)
     
     def analyze(self, text: str):
-        result = self.classifier(text)
-        return {
-            "label": result[0]["label"],
-            "score": result[0]["score"]
-        }
\ No newline at end of file
+        return self.analyze_batch([text])[0]
+    
+    def analyze_batch(self, texts: list):
+        """Score several texts in one padded forward pass"""
+        results = preprocessing.classify(self.classifier, texts)
+        return [
+            {
+                "label": result["label"],
+                "score": result["score"]
+            }
+            for result in results
+        ]
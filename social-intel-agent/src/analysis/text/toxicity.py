@@ -1,31 +1,59 @@
-from transformers import pipeline
+from src.analysis.model_registry import model_registry
+from src.analysis.text import preprocessing
+from src.services.inference_cache import fingerprint
 import re
 
 class ToxicityDetector:
+    MODEL_ID = "martin-ha/toxic-comment-model"
+    TOXIC_THRESHOLD = 0.5
+    # Confidence multiplier when the text talks about toxicity rather than being toxic
+    META_CONTEXT_FACTOR = 0.4
+    
     def __init__(self):
         try:
-            self.classifier = pipeline("text-classification", model="martin-ha/toxic-comment-model")
+            self.classifier = model_registry.get_pipeline("text-classification", self.MODEL_ID)
         except:
             self.classifier = None
     
+    def cache_fingerprint(self):
+        """Everything besides the text that determines this detector's output"""
+        if not self.classifier:
+            return None
+        return fingerprint(
+            model=self.MODEL_ID,
+            revision=self.classifier.revision,
+            threshold=self.TOXIC_THRESHOLD,
+            meta_context_factor=self.META_CONTEXT_FACTOR,
+            output_version=2
+        )
+    
     def detect(self, text: str):
+        return self.detect_batch([text])[0]
+    
+    def detect_batch(self, texts: list):
+        """Score several texts in one padded forward pass"""
         if not self.classifier:
-            return {"is_toxic": False, "confidence": 0.0}
+            return [{"is_toxic": False, "confidence": 0.0} for _ in texts]
         
+        results = preprocessing.classify(self.classifier, texts)
+        return [self._to_result(text, result) for text, result in zip(texts, results)]
+    
+    def _to_result(self, text: str, result):
         # Meta-context detection (Fix 2)
         meta_context = self._detect_meta_usage(text)
         
-        result = self.classifier(text[:512])
-        is_toxic = result[0]["label"] == "toxic"
-        confidence = result[0]["score"]
+        is_toxic = result["label"] == "toxic"
+        confidence = result["score"]
         
         # Reduce confidence if meta-context detected
         if meta_context and is_toxic:
-            confidence *= 0.4  # 60% reduction
+            confidence *= self.META_CONTEXT_FACTOR
         
         return {
-            "is_toxic": is_toxic and confidence > 0.5,
-            "confidence": confidence
+            "is_toxic": is_toxic and confidence > self.TOXIC_THRESHOLD,
+            "confidence": confidence,
+            # Probability of the toxic label, comparable across texts (used to pool document windows)
+            "toxic_score": confidence if is_toxic else 1.0 - confidence
         }
     
     def _detect_meta_usage(self, text: str) -> bool:
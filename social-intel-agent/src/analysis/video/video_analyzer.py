@@ -5,16 +5,145 @@ import requests
 from io import BytesIO
 from src.analysis.image.nsfw_image_detector import NSFWImageDetector
 from src.analysis.image.violence_detector import ViolenceDetector
+from src.analysis.image.religious_hate_detector import ReligiousHateDetector
 from src.analysis.image.ocr_extractor import OCRExtractor
+from src.analysis.image.preprocessing import PreparedImages
+from src.services.inference_executor import inference_executor
+from src.config.settings import settings
 from src.config.logger import setup_logger
 
 logger = setup_logger(__name__)
 
 class VideoAnalyzer:
-    def __init__(self):
-        self.nsfw_detector = NSFWImageDetector()
-        self.violence_detector = ViolenceDetector()
-        self.ocr_extractor = OCRExtractor()
+    def __init__(self, nsfw_detector=None, violence_detector=None, ocr_extractor=None, religious_hate_detector=None):
+        # Reuse the caller's detectors when given so weights are not duplicated
+        self.nsfw_detector = nsfw_detector or NSFWImageDetector()
+        self.violence_detector = violence_detector or ViolenceDetector()
+        self.ocr_extractor = ocr_extractor or OCRExtractor()
+        self.religious_hate_detector = religious_hate_detector or ReligiousHateDetector()
+    
+    async def analyze_video(self, path: str, max_keyframes: int = None, abandoned=None):
+        """Risk timeline of a local video file, one segment per detected scene.
+        
+        Frames are sampled at ``video_sample_fps`` and compared by colour
+        histogram with the current scene's first frame; a new scene starts
+        where the Bhattacharyya distance reaches ``video_scene_threshold``.
+        Decoding runs in the I/O pool and stops after ``video_max_seconds``
+        or once ``abandoned`` (a threading.Event) is set; only the scene
+        keyframes go to the inference pool, in batches, so model cost
+        follows the number of scenes rather than the video's length.
+        """
+        try:
+            keyframes, duration, truncated = await inference_executor.run_io(
+                self._sample_keyframes, path, max_keyframes or settings.video_max_keyframes, abandoned
+            )
+        except Exception as e:
+            logger.error(f"Video decoding failed: {e}")
+            return {"error": str(e)}
+        if not keyframes:
+            return {"error": "No frames could be decoded"}
+        
+        results = []
+        batch_size = settings.video_batch_size
+        for start in range(0, len(keyframes), batch_size):
+            batch = [frame for _, _, frame in keyframes[start:start + batch_size]]
+            results.extend(await inference_executor.run(self._analyze_frames, batch))
+        
+        timeline = []
+        for i, ((time, cut, _), (nsfw, violence, religious_hate, ocr)) in enumerate(zip(keyframes, results)):
+            end = keyframes[i + 1][0] if i + 1 < len(keyframes) else duration
+            timeline.append({
+                "segment": i,
+                "start": round(time, 2),
+                "end": round(end, 2),
+                "scene_change": round(cut, 3),
+                "nsfw": nsfw,
+                "violence": violence,
+                "religious_hate": religious_hate,
+                "ocr": ocr,
+                "risk_score": self._calculate_thumbnail_risk(nsfw, violence, ocr, religious_hate)
+            })
+        
+        peak = max(timeline, key=lambda segment: segment["risk_score"])
+        return {
+            "duration": round(duration, 2),
+            "truncated": truncated,
+            "segments": len(timeline),
+            "risk_score": peak["risk_score"],
+            "peak_segment": peak["segment"],
+            "timeline": timeline
+        }
+    
+    def _sample_keyframes(self, path: str, max_keyframes: int, abandoned=None):
+        """``(time, cut_distance, frame)`` at each scene start, the seconds decoded and whether decoding stopped early"""
+        capture = cv2.VideoCapture(path)
+        if not capture.isOpened():
+            raise ValueError(f"Cannot open video: {path}")
+        
+        keyframes = []
+        try:
+            fps = capture.get(cv2.CAP_PROP_FPS) or 25.0
+            step = max(int(round(fps / settings.video_sample_fps)), 1)
+            # FFmpeg decodes every grabbed frame, so decoding cost is bounded by length, not only by samples
+            max_frames = int(settings.video_max_seconds * fps)
+            reference = None
+            index = 0
+            truncated = False
+            while capture.grab():
+                if index >= max_frames or (abandoned is not None and abandoned.is_set()):
+                    truncated = True
+                    break
+                # grab() advances without converting the frame; only samples are retrieved
+                if index % step == 0:
+                    ok, frame = capture.retrieve()
+                    if not ok:
+                        break
+                    time = index / fps
+                    histogram = self._histogram(frame)
+                    distance = 1.0 if reference is None else cv2.compareHist(
+                        reference, histogram, cv2.HISTCMP_BHATTACHARYYA
+                    )
+                    if distance >= settings.video_scene_threshold and (
+                        not keyframes or time - keyframes[-1][0] >= settings.video_min_scene_seconds
+                    ):
+                        reference = histogram
+                        keyframes.append((time, distance, self._to_image(frame)))
+                        if len(keyframes) > max_keyframes:
+                            # Over the cap, the weakest cut merges into the scene before it
+                            weakest = min(range(1, len(keyframes)), key=lambda i: keyframes[i][1])
+                            del keyframes[weakest]
+                index += 1
+            duration = index / fps
+        finally:
+            capture.release()
+        return keyframes, duration, truncated
+    
+    def _histogram(self, frame):
+        """Normalised hue/saturation histogram of a downscaled BGR frame"""
+        small = cv2.resize(frame, (160, 90), interpolation=cv2.INTER_AREA)
+        hsv = cv2.cvtColor(small, cv2.COLOR_BGR2HSV)
+        histogram = cv2.calcHist([hsv], [0, 1], None, [32, 32], [0, 180, 0, 256])
+        return cv2.normalize(histogram, histogram).flatten()
+    
+    def _to_image(self, frame):
+        image = Image.fromarray(cv2.cvtColor(frame, cv2.COLOR_BGR2RGB))
+        image.thumbnail((settings.image_decode_size, settings.image_decode_size), Image.Resampling.BICUBIC)
+        return image
+    
+    def _analyze_frames(self, frames: list):
+        """``(nsfw, violence, religious_hate, ocr)`` per frame; one NSFW, CLIP and OCR batch each"""
+        prepared = PreparedImages(frames)
+        nsfw_results = self.nsfw_detector.detect_batch(prepared)
+        clip_scores = None
+        if self.violence_detector.scorer:
+            try:
+                clip_scores = self.violence_detector.scorer.score_images(prepared)
+            except Exception as e:
+                logger.error(f"CLIP scoring failed: {e}")
+        violence_results = self.violence_detector.detect_batch(prepared, clip_scores)
+        religious_results = self.religious_hate_detector.detect_batch(prepared, nsfw_results, clip_scores)
+        ocr_results = self.ocr_extractor.extract_batch([prepared.array(i) for i in range(len(prepared))], clip_scores)
+        return list(zip(nsfw_results, violence_results, religious_results, ocr_results))
     
     def analyze_video_thumbnail(self, thumbnail_url: str):
         """Analyze video thumbnail for harmful content"""
@@ -40,8 +169,8 @@ class VideoAnalyzer:
             logger.error(f"Thumbnail analysis failed: {e}")
             return {"error": str(e)}
     
-    def _calculate_thumbnail_risk(self, nsfw, violence, ocr):
-        """Calculate risk score for video thumbnail"""
+    def _calculate_thumbnail_risk(self, nsfw, violence, ocr, religious_hate=None):
+        """Calculate risk score for a video thumbnail or keyframe"""
         risk = 0
         
         if nsfw.get("is_explicit"):
@@ -55,4 +184,7 @@ class VideoAnalyzer:
         if violence.get("is_hateful_visual"):
             risk += violence.get("hate_score", 0) * 30
         
+        if religious_hate and religious_hate.get("is_religious_hate"):
+            risk += religious_hate.get("confidence", 0) * 30
+        
         return min(int(risk), 100)
\ No newline at end of file
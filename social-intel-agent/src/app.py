@@ -1,12 +1,80 @@
+import asyncio
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from src.routers import analyze, health, image_analyze, governance, contact
+from src.routers import analyze, health, image_analyze, video_analyze, governance, contact
 from src.config.logger import setup_logger
 from src.database.mongodb import mongodb
+from src.services.inference_executor import inference_executor
+from src.services.http_client import http_client
+from src.scraping.browser_pool import browser_pool
+
+# Logger
+logger = setup_logger(__name__)
+
+def _build_analysis_services():
+    """Construct every detector once; runs in a worker thread at startup"""
+    from src.services.universal_dispatcher import UniversalAnalysisDispatcher
+    from src.analysis.image.image_marker import ImageMarker
+
+    dispatcher = UniversalAnalysisDispatcher()
+    dispatcher.warm_up()
+    return dispatcher, ImageMarker()
+
+async def _load_models(app: FastAPI):
+    """Load and warm the models, then mark the app ready for traffic"""
+    app.state.readiness = "loading"
+    try:
+        dispatcher, image_marker = await asyncio.to_thread(_build_analysis_services)
+        app.state.dispatcher = dispatcher
+        app.state.image_marker = image_marker
+        app.state.ready = True
+        app.state.readiness = "ready"
+        logger.info("Analysis models loaded and warm, accepting traffic")
+    except Exception as e:
+        app.state.readiness = "failed"
+        app.state.readiness_error = str(e)
+        logger.error(f"Failed to load analysis models: {e}", exc_info=True)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    logger.info("Social Intelligence Agent started")
+    app.state.ready = False
+    app.state.readiness = "starting"
+    app.state.dispatcher = None
+    app.state.image_marker = None
+
+    # Try to connect to MongoDB
+    try:
+        await mongodb.connect()
+    except Exception as e:
+        logger.warning(f"MongoDB connection failed, running without database: {e}")
+
+    # Warm browsers for the Playwright adapters; they launch on first use otherwise
+    try:
+        await browser_pool.start()
+    except Exception as e:
+        logger.warning(f"Browser pool failed to start, will retry on first use: {e}")
+
+    # Models load in the background so liveness checks answer immediately;
+    # /health/ready stays 503 until they are warm
+    loader = asyncio.create_task(_load_models(app))
+
+    yield
+
+    if not loader.done():
+        loader.cancel()
+    if app.state.dispatcher:
+        await app.state.dispatcher.close()
+    await http_client.close()
+    await browser_pool.close()
+    inference_executor.shutdown()
+    await mongodb.disconnect()
 
 app = FastAPI(
     title="Social Intelligence Agent",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
 # CORS
@@ -20,9 +88,6 @@ app.add_middleware(
     max_age=3600,
 )
 
-# Logger
-logger = setup_logger(__name__)
-
 # Root endpoint
 @app.get("/")
 def root():
@@ -31,21 +96,7 @@ def root():
 # Routers
 app.include_router(analyze.router)
 app.include_router(image_analyze.router)
+app.include_router(video_analyze.router)
 app.include_router(health.router)
 app.include_router(governance.router)
 app.include_router(contact.router)
-
-# Startup event
-@app.on_event("startup")
-async def startup_event():
-    logger.info("Social Intelligence Agent started")
-    # Try to connect to MongoDB
-    try:
-        await mongodb.connect()
-    except Exception as e:
-        logger.warning(f"MongoDB connection failed, running without database: {e}")
-
-# Shutdown event
-@app.on_event("shutdown")
-async def shutdown_event():
-    await mongodb.disconnect()
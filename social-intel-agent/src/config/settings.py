@@ -8,9 +8,115 @@ class Settings(BaseSettings):
     huggingface_token: Optional[str] = None
     mongodb_uri: str = "mongodb://localhost:27017"
     environment: str = "development"
+
+    # Zero-shot NLI engine
+    nli_batch_size: int = 16
+    nli_max_length: int = 512
+
+    # Thread pools that keep inference and blocking I/O off the event loop
+    inference_max_workers: int = 4
+    inference_max_pending: int = 64
+    io_max_workers: int = 8
+
+    # Cross-request micro-batching in front of each text model
+    batch_max_size: int = 16
+    batch_max_wait_ms: int = 10
+    nli_batch_max_requests: int = 4
+
+    # POST /analyze/batch
+    batch_max_urls: int = 5000
+    batch_scrape_concurrency: int = 8
+    batch_max_in_flight: int = 32
+    batch_item_timeout: float = 60.0
+
+    # URL-level analysis result cache
+    result_cache_ttl_seconds: int = 3600
+    result_cache_max_entries: int = 1024
+    result_cache_mongodb: bool = False
+
+    # Analysis tiers: deep_analysis=false runs "fast", deep_analysis=true runs "deep"
+    analysis_tiers: dict = {
+        "fast": {"nli_model": "cross-encoder/nli-distilroberta-base", "images": False, "ocr": False},
+        "deep": {"nli_model": "facebook/bart-large-mnli", "images": True, "ocr": True, "max_images": 5}
+    }
+
+    # Lexical pre-screen; text scored below the threshold skips the zero-shot NLI detectors
+    prescreen_enabled: bool = True
+    prescreen_safe_threshold: float = 0.2
+
+    # Long documents are split into overlapping token windows and scores pooled per detector
+    document_max_chars: int = 20000
+    document_window_tokens: int = 256
+    document_window_stride: int = 32
+    document_max_windows: int = 8
+    document_pooling: str = "attention"  # "max", "mean" or "attention"
+    document_attention_temperature: float = 0.1
+
+    # Model backend: "torch" or "onnx" (int8 ONNX Runtime on CPU, needs optimum[onnxruntime])
+    inference_backend: str = "torch"
+    onnx_model_dir: str = ".cache/onnx"
+    onnx_quantize: bool = True
+    onnx_intra_op_threads: int = 0
+    onnx_inter_op_threads: int = 1
+
+    # Shared HTTP client: keep-alive pool, DNS cache and per-host connection limits
+    http_pool_size: int = 100
+    http_per_host_limit: int = 8
+    http_dns_ttl: int = 300
+    http_keepalive_timeout: float = 30.0
+    http_connect_timeout: float = 5.0
+    http_read_timeout: float = 10.0
+    http_total_timeout: float = 15.0
+    http_max_body_bytes: int = 5 * 1024 * 1024
+
+    # Playwright browser pool for JavaScript-rendered pages
+    browser_pool_size: int = 2
+    browser_max_pages: int = 50
+    browser_acquire_timeout: float = 30.0
+
+    # Image stage: concurrent downloads and batched detectors within a time budget
+    image_analysis_budget_seconds: float = 10.0
+    image_download_timeout: float = 5.0
+    image_download_concurrency: int = 8
+    image_max_bytes: int = 10 * 1024 * 1024
+    image_max_pixels: int = 50_000_000
+    # Only JPEGs decode below full size; other formats are refused past this many pixels
+    image_max_full_decode_pixels: int = 16_000_000
+    # Longer side images are decoded at; the model processors take it from here in one resize
+    image_decode_size: int = 512
+
+    # OCR only runs on images CLIP rates at least this likely to contain text
+    ocr_text_gate_enabled: bool = True
+    ocr_text_gate_threshold: float = 0.3
+
+    # Video: keyframes at scene changes, sampled at a fixed rate and capped per video
+    video_sample_fps: float = 2.0
+    video_scene_threshold: float = 0.35
+    video_min_scene_seconds: float = 1.0
+    video_max_keyframes: int = 32
+    video_batch_size: int = 16
+    video_max_bytes: int = 200 * 1024 * 1024
+    video_download_timeout: float = 60.0
+    # Only the first video_max_seconds are decoded; the whole analysis is abandoned after the timeout
+    video_max_seconds: float = 600.0
+    video_analysis_timeout: float = 120.0
+
+    # Perceptual-hash index of image results; near-duplicates within the distance skip the models
+    image_hash_cache_enabled: bool = True
+    image_hash_cache_path: str = ".cache/image_hash_cache.sqlite3"
+    image_hash_cache_max_entries: int = 100000
+    image_hash_max_distance: int = 8
+
+    # Per-detector inference cache, shared on disk by every worker
+    inference_cache_enabled: bool = True
+    inference_cache_path: str = ".cache/inference_cache.sqlite3"
+    inference_cache_max_entries: int = 200000
+
+    # CLIP label embeddings are computed once and persisted here
+    clip_embedding_cache_dir: str = ".cache/clip_text_embeddings"
     
     class Config:
         env_file = ".env"
         extra = "allow"
 
-settings = Settings()
\ No newline at end of file
+settings = Settings()
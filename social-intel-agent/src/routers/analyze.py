@@ -1,8 +1,14 @@
-from fastapi import APIRouter, HTTPException
-from pydantic import BaseModel
-from src.services.universal_dispatcher import UniversalAnalysisDispatcher
+from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel, ValidationError
+from typing import List
+from src.routers.dependencies import get_dispatcher
+from src.services.batch_analysis import BatchAnalysisService
+from src.services.result_cache import result_cache
 from src.database.mongodb import mongodb
+from src.config.settings import settings
 import asyncio
+import json
 from datetime import datetime
 import uuid
 
@@ -13,17 +19,21 @@ class AnalyzeRequest(BaseModel):
     deep_analysis: bool = False
 
 @router.post("/")
-async def analyze_content(request: AnalyzeRequest):
+async def analyze_content(request: AnalyzeRequest, dispatcher=Depends(get_dispatcher)):
     try:
-        # Try real AI analysis with 60 second timeout
-        dispatcher = UniversalAnalysisDispatcher()
+        # Try real AI analysis with 60 second timeout; repeat URLs are served
+        # from the result cache and concurrent duplicates share one analysis
         result = await asyncio.wait_for(
-            dispatcher.analyze(request.url, request.deep_analysis),
+            result_cache.get_or_compute(
+                request.url,
+                request.deep_analysis,
+                lambda: dispatcher.analyze(request.url, request.deep_analysis)
+            ),
             timeout=60.0
         )
         
-        # Save to MongoDB if connected (don't wait for response)
-        if mongodb.client:
+        # Save fresh analyses to MongoDB if connected
+        if mongodb.client and not result.get("cache", {}).get("hit"):
             try:
                 await mongodb.save_analysis(result.copy())
             except Exception as e:
@@ -40,6 +50,73 @@ async def analyze_content(request: AnalyzeRequest):
         print(f"⚠️ Analysis failed: {e} - returning demo response")
         return generate_demo_response(request.url)
 
+class BatchAnalyzeRequest(BaseModel):
+    urls: List[str]
+    deep_analysis: bool = False
+
+@router.post("/batch")
+async def analyze_batch(request: Request, dispatcher=Depends(get_dispatcher)):
+    """
+    Analyze many URLs and stream one JSON report per line as each finishes
+    
+    - **JSON body**: `{"urls": [...], "deep_analysis": false}`
+    - **multipart upload**: a `file` field with one URL per line, either as a
+      JSON string or an object with a `url` key, plus an optional
+      `deep_analysis` form field
+    """
+    urls, deep_analysis = await _read_batch_request(request)
+    if not urls:
+        raise HTTPException(status_code=400, detail="No URLs supplied")
+    if len(urls) > settings.batch_max_urls:
+        raise HTTPException(status_code=413, detail=f"At most {settings.batch_max_urls} URLs per batch")
+    
+    service = BatchAnalysisService(dispatcher, cache=result_cache)
+    
+    async def ndjson():
+        async for report in service.stream(urls, deep_analysis):
+            if mongodb.client and report.get("status") == "completed" and not report.get("cache", {}).get("hit"):
+                try:
+                    await mongodb.save_analysis(report.copy())
+                except Exception as e:
+                    print(f"Failed to save to MongoDB: {e}")
+            yield json.dumps(report, default=str) + "\n"
+    
+    return StreamingResponse(ndjson(), media_type="application/x-ndjson")
+
+async def _read_batch_request(request: Request):
+    """Return (urls, deep_analysis) from a JSON body or an uploaded JSONL file"""
+    content_type = request.headers.get("content-type", "")
+    
+    if content_type.startswith("multipart/form-data"):
+        form = await request.form()
+        upload = form.get("file")
+        if upload is None or isinstance(upload, str):
+            raise HTTPException(status_code=400, detail="Upload a JSONL file in the 'file' field")
+        deep_analysis = str(form.get("deep_analysis", "false")).lower() in ("1", "true", "yes")
+        return _parse_jsonl((await upload.read()).decode("utf-8", errors="replace")), deep_analysis
+    
+    try:
+        body = BatchAnalyzeRequest(**(await request.json()))
+    except (ValueError, ValidationError) as e:
+        raise HTTPException(status_code=422, detail=f"Invalid batch request: {e}")
+    return [url.strip() for url in body.urls if url.strip()], body.deep_analysis
+
+def _parse_jsonl(content: str):
+    urls = []
+    for line_number, line in enumerate(content.splitlines(), start=1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            item = json.loads(line)
+        except json.JSONDecodeError:
+            raise HTTPException(status_code=422, detail=f"Line {line_number} is not valid JSON")
+        url = item.get("url") if isinstance(item, dict) else item
+        if not isinstance(url, str) or not url.strip():
+            raise HTTPException(status_code=422, detail=f"Line {line_number} has no URL")
+        urls.append(url.strip())
+    return urls
+
 def generate_demo_response(url: str):
     """Generate demo response when AI models fail or timeout"""
     return {
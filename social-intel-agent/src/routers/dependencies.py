@@ -0,0 +1,19 @@
+from fastapi import HTTPException, Request
+
+def _require_ready(request: Request):
+    if not getattr(request.app.state, "ready", False):
+        raise HTTPException(
+            status_code=503,
+            detail="Analysis models are still loading. Please retry shortly.",
+            headers={"Retry-After": "10"}
+        )
+
+def get_dispatcher(request: Request):
+    """Shared UniversalAnalysisDispatcher built during app startup"""
+    _require_ready(request)
+    return request.app.state.dispatcher
+
+def get_image_marker(request: Request):
+    """Shared ImageMarker built during app startup"""
+    _require_ready(request)
+    return request.app.state.image_marker
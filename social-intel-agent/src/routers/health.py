@@ -1,7 +1,72 @@
-from fastapi import APIRouter
+from fastapi import APIRouter, Request
+from fastapi.responses import JSONResponse
+from src.analysis.model_registry import model_registry
+from src.services.inference_executor import inference_executor
+from src.services.result_cache import result_cache
+from src.services.inference_cache import inference_cache
+from src.services.image_hash_cache import image_hash_cache
+from src.analysis.text.prescreen import prescreener
 
 router = APIRouter(tags=["health"])
 
 @router.get("/health")
 async def health_check():
-    return {"status": "healthy", "service": "social-intel-agent"}
\ No newline at end of file
+    return {"status": "healthy", "service": "social-intel-agent"}
+
+@router.get("/health/ready")
+async def readiness_check(request: Request):
+    """Ready only once every analysis model is loaded and warm"""
+    state = request.app.state
+    body = {
+        "ready": getattr(state, "ready", False),
+        "state": getattr(state, "readiness", "starting")
+    }
+    if getattr(state, "readiness_error", None):
+        body["error"] = state.readiness_error
+    return JSONResponse(body, status_code=200 if body["ready"] else 503)
+
+@router.get("/health/models")
+async def loaded_models():
+    """Models loaded in this worker and the memory their weights use"""
+    return model_registry.stats()
+
+@router.get("/health/executor")
+async def executor_stats():
+    """Inference and blocking I/O pool sizes and current load"""
+    return inference_executor.stats()
+
+@router.get("/health/batching")
+async def batching_stats(request: Request):
+    """Queue depth and batch fill ratio of each model's micro-batcher"""
+    dispatcher = getattr(request.app.state, "dispatcher", None)
+    if dispatcher is None:
+        return {}
+    return dispatcher.batch_stats()
+
+@router.get("/health/cache")
+async def cache_stats():
+    """Hit, miss and occupancy counters of the analysis result cache"""
+    return result_cache.stats()
+
+@router.get("/health/inference-cache")
+async def inference_cache_stats():
+    """Size and hit counters of the on-disk per-detector inference cache"""
+    return inference_cache.stats()
+
+@router.get("/health/image-cache")
+async def image_cache_stats():
+    """Size and hit counters of the perceptual-hash image result cache"""
+    return image_hash_cache.stats()
+
+@router.get("/health/prescreen")
+async def prescreen_stats():
+    """How much text the lexical pre-screen let skip the NLI detectors"""
+    return prescreener.stats()
+
+@router.get("/health/pipeline")
+async def pipeline_graph(request: Request):
+    """Detector nodes, their inputs and estimated costs, in scheduling order"""
+    dispatcher = getattr(request.app.state, "dispatcher", None)
+    if dispatcher is None:
+        return []
+    return dispatcher.graph.describe()
@@ -1,11 +1,9 @@
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, Depends, HTTPException
 from pydantic import BaseModel
-from src.analysis.image.image_extractor import ImageExtractor
-from src.analysis.image.nsfw_image_detector import NSFWImageDetector
-from src.analysis.image.violence_detector import ViolenceDetector
-from src.analysis.image.religious_hate_detector import ReligiousHateDetector
-from src.analysis.image.ocr_extractor import OCRExtractor
-from src.analysis.image.image_marker import ImageMarker
+from src.routers.dependencies import get_dispatcher, get_image_marker
+from src.services.inference_executor import inference_executor
+from src.services.image_hash_cache import image_hash_cache
+from src.analysis.image.perceptual_hash import image_hashes
 from src.config.logger import setup_logger
 
 router = APIRouter()
@@ -15,21 +13,23 @@ class ImageAnalyzeRequest(BaseModel):
     image_url: str
 
 @router.post("/analyze-image/")
-async def analyze_image(request: ImageAnalyzeRequest):
+async def analyze_image(
+    request: ImageAnalyzeRequest,
+    dispatcher=Depends(get_dispatcher),
+    marker=Depends(get_image_marker)
+):
     """Analyze a single image URL"""
     try:
         logger.info(f"Analyzing image: {request.image_url}")
         
-        # Initialize detectors
-        extractor = ImageExtractor()
-        nsfw_detector = NSFWImageDetector()
-        violence_detector = ViolenceDetector()
-        religious_hate_detector = ReligiousHateDetector()
-        ocr_extractor = OCRExtractor()
-        marker = ImageMarker()
+        # Detectors are shared with the dispatcher and built once at startup
+        nsfw_detector = dispatcher.nsfw_image_detector
+        violence_detector = dispatcher.violence_detector
+        religious_hate_detector = dispatcher.religious_hate_detector
+        ocr_extractor = dispatcher.ocr_extractor
         
         # Download image
-        image = extractor.download_image(request.image_url)
+        image = await dispatcher.image_pipeline.download(request.image_url)
         
         if image is None:
             return {
@@ -37,20 +37,42 @@ async def analyze_image(request: ImageAnalyzeRequest):
                 "message": "Failed to download image"
             }
         
-        # Run all detectors
-        logger.info("Running NSFW detection...")
-        nsfw = nsfw_detector.detect(image)
-        logger.info(f"NSFW result: {nsfw.get('is_nsfw')}, confidence: {nsfw.get('confidence')}")
-        
-        logger.info("Running violence detection...")
-        violence = violence_detector.detect(image)
-        
-        logger.info("Running religious hate detection...")
-        religious_hate = religious_hate_detector.detect(image, nsfw)
-        
-        logger.info("Running OCR extraction...")
-        ocr = ocr_extractor.extract_text(image)
-        logger.info(f"OCR result: text='{ocr.get('text', '')[:50]}', confidence={ocr.get('confidence')}")
+        # Reposts of an image analysed before reuse its results
+        hashes = await inference_executor.run(image_hashes, image)
+        cached = await inference_executor.run_io(image_hash_cache.get, hashes)
+        
+        if cached:
+            stored, distance, row_id = cached
+            logger.info(f"Near-duplicate of a cached image (distance {distance}), skipping detectors")
+            nsfw, violence, religious_hate = stored["nsfw"], stored["violence"], stored["religious_hate"]
+            ocr = stored.get("ocr")
+            clip_scores = None
+        else:
+            row_id = None
+            # Run all detectors
+            logger.info("Running NSFW detection...")
+            nsfw = await inference_executor.run(nsfw_detector.detect, image)
+            logger.info(f"NSFW result: {nsfw.get('is_nsfw')}, confidence: {nsfw.get('confidence')}")
+            
+            # One CLIP image embedding serves both the violence and religious hate label sets
+            clip_scores = await inference_executor.run(dispatcher.score_image_with_clip, image)
+            
+            logger.info("Running violence detection...")
+            violence = await inference_executor.run(violence_detector.detect, image, clip_scores)
+            
+            logger.info("Running religious hate detection...")
+            religious_hate = await inference_executor.run(religious_hate_detector.detect, image, nsfw, clip_scores)
+            ocr = None
+        
+        if ocr is None:
+            logger.info("Running OCR extraction...")
+            # Skipped when CLIP is confident the image holds no text
+            ocr = (await inference_executor.run(ocr_extractor.extract_batch, [image], [clip_scores]))[0]
+            logger.info(f"OCR result: text='{ocr.get('text', '')[:50]}', confidence={ocr.get('confidence')}")
+            # A cached entry that only gained OCR is updated in place
+            await inference_executor.run_io(image_hash_cache.put, hashes, {
+                "nsfw": nsfw, "violence": violence, "religious_hate": religious_hate, "ocr": ocr
+            }, row_id)
         
         # Calculate confidence-based risk score
         risk_score = 0
@@ -95,7 +117,7 @@ async def analyze_image(request: ImageAnalyzeRequest):
         }
         
         # Mark image with detections
-        marked_image = marker.mark_image(image, detections)
+        marked_image = await inference_executor.run(marker.mark_image, image, detections)
         
         # Categorize image
         categorization = marker.categorize_image(detections)
@@ -170,6 +192,7 @@ async def analyze_image(request: ImageAnalyzeRequest):
                 "confidence": ocr.get('confidence', 0.0)
             },
             "marked_image": marked_image,
+            "cache": {"hit": bool(cached), "distance": cached[1] if cached else None},
             "categorization": categorization,
             "report": report
         }
@@ -0,0 +1,85 @@
+import asyncio
+import os
+import tempfile
+import threading
+from fastapi import APIRouter, Depends, File, Form, HTTPException, UploadFile
+from src.routers.dependencies import get_dispatcher
+from src.services.http_client import http_client
+from src.config.settings import settings
+from src.config.logger import setup_logger
+
+router = APIRouter()
+logger = setup_logger(__name__)
+
+CHUNK_SIZE = 1024 * 1024
+
+@router.post("/analyze-video/")
+async def analyze_video(
+    file: UploadFile = File(None),
+    video_url: str = Form(None),
+    dispatcher=Depends(get_dispatcher)
+):
+    """Analyze an uploaded video file or a video URL, scene by scene"""
+    if file is None and not video_url:
+        raise HTTPException(status_code=400, detail="Provide a video file or video_url")
+
+    # OpenCV reads from disk, so the video is spooled to a temporary file under the size cap
+    handle, path = tempfile.mkstemp(suffix=".video")
+    try:
+        with os.fdopen(handle, "wb") as target:
+            if file is not None:
+                saved = await _save_upload(file, target)
+            else:
+                saved = await _save_download(video_url, target)
+        if not saved:
+            raise HTTPException(status_code=413, detail=f"Video larger than {settings.video_max_bytes} bytes")
+
+        logger.info(f"Analyzing video: {file.filename if file is not None else video_url}")
+        abandoned = threading.Event()
+        try:
+            result = await asyncio.wait_for(
+                dispatcher.video_analyzer.analyze_video(path, abandoned=abandoned), settings.video_analysis_timeout
+            )
+        except asyncio.TimeoutError:
+            # Stops the decoder loop; a keyframe batch already on a model finishes on its own
+            abandoned.set()
+            raise HTTPException(status_code=504, detail=f"Video analysis exceeded {settings.video_analysis_timeout}s")
+        if "error" in result:
+            return {"status": "error", "message": result["error"]}
+
+        return {
+            "status": "success",
+            "source": file.filename if file is not None else video_url,
+            **result
+        }
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Video analysis failed: {str(e)}", exc_info=True)
+        raise HTTPException(status_code=500, detail=str(e))
+    finally:
+        os.remove(path)
+
+async def _save_upload(file: UploadFile, target) -> bool:
+    written = 0
+    while chunk := await file.read(CHUNK_SIZE):
+        written += len(chunk)
+        if written > settings.video_max_bytes:
+            return False
+        target.write(chunk)
+    return True
+
+async def _save_download(url: str, target) -> bool:
+    async with http_client.stream(url, timeout=settings.video_download_timeout) as response:
+        if response.status != 200:
+            raise HTTPException(status_code=400, detail=f"Video download failed with HTTP {response.status}")
+        length = response.headers.get("Content-Length")
+        if length and length.isdigit() and int(length) > settings.video_max_bytes:
+            return False
+        written = 0
+        async for chunk in response.content.iter_chunked(CHUNK_SIZE):
+            written += len(chunk)
+            if written > settings.video_max_bytes:
+                return False
+            target.write(chunk)
+    return True
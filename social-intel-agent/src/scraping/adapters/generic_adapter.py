@@ -1,8 +1,8 @@
-from playwright.async_api import async_playwright
+from src.scraping.browser_pool import browser_pool
 from .base_adapter import BaseAdapter
 from bs4 import BeautifulSoup
 import trafilatura
-import requests
+from src.services.http_client import http_client
 
 class GenericAdapter(BaseAdapter):
     """Generic web adapter with fallback methods"""
@@ -10,7 +10,7 @@ class GenericAdapter(BaseAdapter):
     async def extract(self, url: str):
         """Extract content with multiple fallback methods"""
         
-        # Method 1: Try trafilatura with requests first (faster)
+        # Method 1: Try trafilatura over the shared HTTP client first (faster)
         try:
             return await self._extract_trafilatura(url)
         except:
@@ -39,7 +39,7 @@ class GenericAdapter(BaseAdapter):
         headers = {
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
         }
-        response = requests.get(url, headers=headers, timeout=10)
+        response = await http_client.get(url, headers=headers)
         
         # Use trafilatura for main content
         text = trafilatura.extract(response.content) or ""
@@ -74,55 +74,44 @@ class GenericAdapter(BaseAdapter):
     
     async def _extract_playwright(self, url: str):
         """Playwright extraction for JavaScript sites"""
-        async with async_playwright() as p:
-            browser = await p.chromium.launch(headless=True)
-            context = await browser.new_context(
-                user_agent='Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
-            )
-            page = await context.new_page()
-            
-            # Add stealth
-            await page.add_init_script("""
-                Object.defineProperty(navigator, 'webdriver', {get: () => undefined})
-            """)
-            
+        # Pooled pages come with stealth and resource blocking set up
+        async with browser_pool.page() as page:
             await page.goto(url, timeout=15000, wait_until='domcontentloaded')
             await page.wait_for_timeout(3000)  # Wait for JS to load
             
             html_content = await page.content()
-            await browser.close()
-            
-            # Check if JavaScript is disabled message
-            if "javascript is disabled" in html_content.lower():
-                raise ValueError("Site requires JavaScript and blocks automated access")
-            
-            # Use trafilatura on the rendered HTML
-            text = trafilatura.extract(html_content) or ""
-            
-            # Parse with BeautifulSoup for metadata
-            soup = BeautifulSoup(html_content, 'html.parser')
-            
-            title = ""
-            if soup.title:
-                title = soup.title.string or ""
-            
-            meta_desc = ""
-            meta_tag = soup.find("meta", attrs={"name": "description"})
-            if not meta_tag:
-                meta_tag = soup.find("meta", property="og:description")
-            if meta_tag:
-                meta_desc = meta_tag.get("content", "")
-            
-            if len(text) < 20:
-                raise ValueError("Insufficient content extracted from rendered page")
-            
-            return self._create_unified_output(
-                url=url,
-                platform="generic",
-                title=title,
-                author="",
-                published_at="",
-                text=text,
-                meta_description=meta_desc,
-                media=[]
-            )
+        
+        # Check if JavaScript is disabled message
+        if "javascript is disabled" in html_content.lower():
+            raise ValueError("Site requires JavaScript and blocks automated access")
+        
+        # Use trafilatura on the rendered HTML
+        text = trafilatura.extract(html_content) or ""
+        
+        # Parse with BeautifulSoup for metadata
+        soup = BeautifulSoup(html_content, 'html.parser')
+        
+        title = ""
+        if soup.title:
+            title = soup.title.string or ""
+        
+        meta_desc = ""
+        meta_tag = soup.find("meta", attrs={"name": "description"})
+        if not meta_tag:
+            meta_tag = soup.find("meta", property="og:description")
+        if meta_tag:
+            meta_desc = meta_tag.get("content", "")
+        
+        if len(text) < 20:
+            raise ValueError("Insufficient content extracted from rendered page")
+        
+        return self._create_unified_output(
+            url=url,
+            platform="generic",
+            title=title,
+            author="",
+            published_at="",
+            text=text,
+            meta_description=meta_desc,
+            media=[]
+        )
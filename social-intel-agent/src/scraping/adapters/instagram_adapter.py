@@ -1,4 +1,5 @@
-from playwright.async_api import async_playwright, TimeoutError as PlaywrightTimeout
+from playwright.async_api import TimeoutError as PlaywrightTimeout
+from src.scraping.browser_pool import browser_pool
 from .base_adapter import BaseAdapter
 from bs4 import BeautifulSoup
 import asyncio
@@ -9,18 +10,12 @@ class InstagramAdapter(BaseAdapter):
     async def extract(self, url: str):
         """Extract Instagram post using Playwright"""
         try:
-            async with async_playwright() as p:
-                browser = await p.chromium.launch(headless=True)
-                context = await browser.new_context(
-                    user_agent='Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36'
-                )
-                page = await context.new_page()
-                
+            user_agent = 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36'
+            async with browser_pool.page(user_agent=user_agent) as page:
                 try:
                     await page.goto(url, timeout=10000, wait_until='domcontentloaded')
                     content = await page.content()
                 except PlaywrightTimeout:
-                    await browser.close()
                     return self._create_unified_output(
                         url=url,
                         platform="instagram",
@@ -31,34 +26,32 @@ class InstagramAdapter(BaseAdapter):
                         meta_description="",
                         media=[]
                     )
-                
-                await browser.close()
-                
-                soup = BeautifulSoup(content, 'html.parser')
-                
-                # Extract from meta tags
-                title = ""
-                text = ""
-                author = ""
-                
-                og_title = soup.find("meta", property="og:title")
-                if og_title:
-                    title = og_title.get("content", "")
-                
-                og_desc = soup.find("meta", property="og:description")
-                if og_desc:
-                    text = og_desc.get("content", "")
-                
-                return self._create_unified_output(
-                    url=url,
-                    platform="instagram",
-                    title=title or "Instagram Post",
-                    author=author,
-                    published_at="",
-                    text=text or "Instagram post content",
-                    meta_description=text[:200] if text else "",
-                    media=[]
-                )
+            
+            soup = BeautifulSoup(content, 'html.parser')
+            
+            # Extract from meta tags
+            title = ""
+            text = ""
+            author = ""
+            
+            og_title = soup.find("meta", property="og:title")
+            if og_title:
+                title = og_title.get("content", "")
+            
+            og_desc = soup.find("meta", property="og:description")
+            if og_desc:
+                text = og_desc.get("content", "")
+            
+            return self._create_unified_output(
+                url=url,
+                platform="instagram",
+                title=title or "Instagram Post",
+                author=author,
+                published_at="",
+                text=text or "Instagram post content",
+                meta_description=text[:200] if text else "",
+                media=[]
+            )
         except Exception as e:
             return self._create_unified_output(
                 url=url,
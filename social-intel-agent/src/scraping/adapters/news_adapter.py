@@ -1,6 +1,6 @@
-import requests
 import trafilatura
 from bs4 import BeautifulSoup
+from src.services.http_client import http_client
 from .base_adapter import BaseAdapter
 
 class NewsAdapter(BaseAdapter):
@@ -9,7 +9,7 @@ class NewsAdapter(BaseAdapter):
     async def extract(self, url: str):
         """Extract news article content"""
         headers = {'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36'}
-        response = requests.get(url, headers=headers, timeout=10)
+        response = await http_client.get(url, headers=headers)
         response.raise_for_status()
         
         html = response.text
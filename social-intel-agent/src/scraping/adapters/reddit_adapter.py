@@ -1,5 +1,6 @@
-import requests
 import re
+from src.analysis.text.preprocessing import normalize_text
+from src.services.http_client import http_client
 from .base_adapter import BaseAdapter
 
 class RedditAdapter(BaseAdapter):
@@ -10,7 +11,7 @@ class RedditAdapter(BaseAdapter):
         json_url = url.rstrip('/') + '.json'
         
         headers = {'User-Agent': 'Mozilla/5.0 (compatible; ContentAnalyzer/1.0)'}
-        response = requests.get(json_url, headers=headers, timeout=10)
+        response = await http_client.get(json_url, headers=headers)
         response.raise_for_status()
         
         data = response.json()
@@ -73,29 +74,14 @@ class RedditAdapter(BaseAdapter):
         if not text:
             return ""
         
-        # Remove usernames (u/username)
-        text = re.sub(r'u/\w+', '', text)
-        
         # Remove subreddit mentions (r/subreddit)
         text = re.sub(r'r/\w+', '', text)
         
-        # Remove quote blocks (lines starting with >)
-        text = re.sub(r'^>.*$', '', text, flags=re.MULTILINE)
-        
-        # Remove [deleted] and [removed]
-        text = re.sub(r'\[(deleted|removed)\]', '', text, flags=re.IGNORECASE)
-        
         # Remove HTML entities
         text = re.sub(r'&\w+;', '', text)
         
-        # Remove markdown links but keep text
-        text = re.sub(r'\[([^\]]+)\]\([^\)]+\)', r'\1', text)
-        
-        # Remove URLs
-        text = re.sub(r'http\S+|www\.\S+', '', text)
-        
-        # Remove excessive whitespace
-        text = re.sub(r'\s+', ' ', text)
+        # Quotes, markdown links, URLs, usernames, [deleted]/[removed] and whitespace
+        text = normalize_text(text)
         
         # Remove metadata patterns
         text = re.sub(r'Edit:.*$', '', text, flags=re.IGNORECASE)
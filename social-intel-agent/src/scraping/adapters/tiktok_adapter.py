@@ -1,4 +1,4 @@
-from playwright.async_api import async_playwright
+from src.scraping.browser_pool import browser_pool
 from .base_adapter import BaseAdapter
 from bs4 import BeautifulSoup
 
@@ -7,38 +7,32 @@ class TikTokAdapter(BaseAdapter):
     
     async def extract(self, url: str):
         """Extract TikTok video using Playwright"""
-        async with async_playwright() as p:
-            browser = await p.chromium.launch(headless=True)
-            context = await browser.new_context(
-                user_agent='Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36'
-            )
-            page = await context.new_page()
-            
+        user_agent = 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36'
+        async with browser_pool.page(user_agent=user_agent) as page:
             await page.goto(url, timeout=15000, wait_until='domcontentloaded')
             content = await page.content()
-            await browser.close()
-            
-            soup = BeautifulSoup(content, 'html.parser')
-            
-            # Extract from meta tags
-            title = ""
-            text = ""
-            
-            og_title = soup.find("meta", property="og:title")
-            if og_title:
-                title = og_title.get("content", "")
-            
-            og_desc = soup.find("meta", property="og:description")
-            if og_desc:
-                text = og_desc.get("content", "")
-            
-            return self._create_unified_output(
-                url=url,
-                platform="tiktok",
-                title=title,
-                author="",
-                published_at="",
-                text=text,
-                meta_description=text[:200],
-                media=[]
-            )
+        
+        soup = BeautifulSoup(content, 'html.parser')
+        
+        # Extract from meta tags
+        title = ""
+        text = ""
+        
+        og_title = soup.find("meta", property="og:title")
+        if og_title:
+            title = og_title.get("content", "")
+        
+        og_desc = soup.find("meta", property="og:description")
+        if og_desc:
+            text = og_desc.get("content", "")
+        
+        return self._create_unified_output(
+            url=url,
+            platform="tiktok",
+            title=title,
+            author="",
+            published_at="",
+            text=text,
+            meta_description=text[:200],
+            media=[]
+        )
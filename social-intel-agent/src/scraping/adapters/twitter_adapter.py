@@ -1,8 +1,8 @@
-from playwright.async_api import async_playwright
+from src.scraping.browser_pool import browser_pool
 from .base_adapter import BaseAdapter
 from bs4 import BeautifulSoup
 import re
-import requests
+from src.services.http_client import http_client
 
 class TwitterAdapter(BaseAdapter):
     """Twitter/X adapter with fallback methods"""
@@ -39,7 +39,7 @@ class TwitterAdapter(BaseAdapter):
         headers = {
             'User-Agent': 'Mozilla/5.0 (compatible; Googlebot/2.1; +http://www.google.com/bot.html)'
         }
-        response = requests.get(url, headers=headers, timeout=10)
+        response = await http_client.get(url, headers=headers)
         soup = BeautifulSoup(response.content, 'html.parser')
         
         # Extract from meta tags
@@ -62,71 +62,60 @@ class TwitterAdapter(BaseAdapter):
     
     async def _extract_playwright(self, url: str):
         """Playwright extraction with stealth"""
-        async with async_playwright() as p:
-            browser = await p.chromium.launch(headless=True)
-            context = await browser.new_context(
-                user_agent='Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
-            )
-            page = await context.new_page()
-            
-            # Add stealth
-            await page.add_init_script("""
-                Object.defineProperty(navigator, 'webdriver', {get: () => undefined})
-            """)
-            
+        # Pooled pages come with stealth and resource blocking set up
+        async with browser_pool.page() as page:
             await page.goto(url, timeout=15000, wait_until='domcontentloaded')
             await page.wait_for_timeout(2000)  # Wait for content to load
             
             html_content = await page.content()
-            await browser.close()
-            
-            soup = BeautifulSoup(html_content, 'html.parser')
-            
-            # Check if blocked
-            page_text = soup.get_text().lower()
-            if any(x in page_text for x in ["javascript is disabled", "sign in to x", "log in to twitter"]):
-                raise ValueError("Twitter/X blocked access")
-            
-            # Extract tweet content
-            text = ""
-            author = ""
-            
-            # Try multiple selectors
-            tweet_selectors = [
-                '[data-testid="tweetText"]',
-                '[data-testid="tweet"] span',
-                'article div[lang]'
-            ]
-            
-            for selector in tweet_selectors:
-                elements = soup.select(selector)
-                if elements:
-                    text = ' '.join([elem.get_text().strip() for elem in elements[:3]])
-                    if len(text) > 10:
-                        break
-            
-            # Extract author
-            author_selectors = [
-                '[data-testid="User-Name"]',
-                'article div[dir="ltr"] span'
-            ]
-            
-            for selector in author_selectors:
-                elem = soup.select_one(selector)
-                if elem:
-                    author = elem.get_text().strip()
+        
+        soup = BeautifulSoup(html_content, 'html.parser')
+        
+        # Check if blocked
+        page_text = soup.get_text().lower()
+        if any(x in page_text for x in ["javascript is disabled", "sign in to x", "log in to twitter"]):
+            raise ValueError("Twitter/X blocked access")
+        
+        # Extract tweet content
+        text = ""
+        author = ""
+        
+        # Try multiple selectors
+        tweet_selectors = [
+            '[data-testid="tweetText"]',
+            '[data-testid="tweet"] span',
+            'article div[lang]'
+        ]
+        
+        for selector in tweet_selectors:
+            elements = soup.select(selector)
+            if elements:
+                text = ' '.join([elem.get_text().strip() for elem in elements[:3]])
+                if len(text) > 10:
                     break
-            
-            if not text or len(text) < 10:
-                raise ValueError("Unable to extract tweet content")
-            
-            return self._create_unified_output(
-                url=url,
-                platform="twitter",
-                title=text[:100],
-                author=author or "Twitter User",
-                published_at="",
-                text=text,
-                meta_description=text[:200],
-                media=[]
-            )
+        
+        # Extract author
+        author_selectors = [
+            '[data-testid="User-Name"]',
+            'article div[dir="ltr"] span'
+        ]
+        
+        for selector in author_selectors:
+            elem = soup.select_one(selector)
+            if elem:
+                author = elem.get_text().strip()
+                break
+        
+        if not text or len(text) < 10:
+            raise ValueError("Unable to extract tweet content")
+        
+        return self._create_unified_output(
+            url=url,
+            platform="twitter",
+            title=text[:100],
+            author=author or "Twitter User",
+            published_at="",
+            text=text,
+            meta_description=text[:200],
+            media=[]
+        )
@@ -0,0 +1,179 @@
+import asyncio
+from contextlib import asynccontextmanager
+from urllib.parse import urlparse
+from playwright.async_api import async_playwright
+from src.config.settings import settings
+from src.config.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+DEFAULT_USER_AGENT = (
+    'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
+)
+
+# Text extraction never needs these; skipping them is most of a page's bytes
+BLOCKED_RESOURCE_TYPES = {"image", "media", "font"}
+
+BLOCKED_HOSTS = (
+    "google-analytics.com", "googletagmanager.com", "doubleclick.net", "googlesyndication.com",
+    "adservice.google.com", "connect.facebook.net", "amazon-adsystem.com", "scorecardresearch.com",
+    "hotjar.com", "segment.io", "taboola.com", "outbrain.com", "criteo.com", "quantserve.com"
+)
+
+STEALTH_SCRIPT = """
+    Object.defineProperty(navigator, 'webdriver', {get: () => undefined})
+"""
+
+async def _block_resources(route):
+    request = route.request
+    host = urlparse(request.url).hostname or ""
+    if request.resource_type in BLOCKED_RESOURCE_TYPES or any(
+        host == blocked or host.endswith("." + blocked) for blocked in BLOCKED_HOSTS
+    ):
+        await route.abort()
+    else:
+        await route.continue_()
+
+
+class _PooledBrowser:
+    """One Chromium process with a context per user agent, reused until its page budget is spent"""
+
+    def __init__(self, browser):
+        self.browser = browser
+        self.contexts = {}
+        self.pages = 0
+
+    async def context(self, user_agent: str):
+        context = self.contexts.get(user_agent)
+        if context is None:
+            context = await self.browser.new_context(user_agent=user_agent)
+            await context.add_init_script(STEALTH_SCRIPT)
+            await context.route("**/*", _block_resources)
+            self.contexts[user_agent] = context
+        return context
+
+
+class BrowserPool:
+    """Long-lived headless Chromium browsers shared by the Playwright adapters.
+
+    ``size`` browsers are launched once, at app startup or on first use.
+    Each serves one page at a time from a per-user-agent context whose
+    cookies are cleared between pages, and is relaunched after
+    ``max_pages`` pages or when it has crashed, so memory leaks stay
+    bounded. Relaunches after a page run in the background, so the request
+    that spent the budget does not wait on Chromium starting. Images, fonts,
+    media and known trackers are blocked by route.
+    """
+
+    def __init__(self, size: int = None, max_pages: int = None):
+        self.size = size or settings.browser_pool_size
+        self.max_pages = max_pages or settings.browser_max_pages
+        self._playwright = None
+        self._idle = None
+        self._start_lock = None
+        self._restarts = 0
+        self._pages = 0
+        self._recycling = set()
+
+    async def start(self):
+        """Launch the browsers; safe to call more than once"""
+        if self._start_lock is None:
+            self._start_lock = asyncio.Lock()
+        async with self._start_lock:
+            if self._idle is not None:
+                return
+            self._playwright = await async_playwright().start()
+            idle = asyncio.Queue()
+            try:
+                for _ in range(self.size):
+                    idle.put_nowait(_PooledBrowser(await self._launch()))
+            except Exception:
+                while not idle.empty():
+                    await idle.get_nowait().browser.close()
+                await self._playwright.stop()
+                self._playwright = None
+                raise
+            self._idle = idle
+            logger.info(f"Browser pool started with {self.size} browser(s)")
+
+    @asynccontextmanager
+    async def page(self, user_agent: str = None):
+        """A fresh page on a pooled browser; it is closed and the browser returned on exit"""
+        if self._idle is None:
+            await self.start()
+        pooled = await asyncio.wait_for(self._idle.get(), settings.browser_acquire_timeout)
+        page = None
+        try:
+            if not pooled.browser.is_connected():
+                pooled = await self._replace(pooled)
+            context = await pooled.context(user_agent or DEFAULT_USER_AGENT)
+            page = await context.new_page()
+            yield page
+        finally:
+            pooled.pages += 1
+            self._pages += 1
+            try:
+                if page is not None:
+                    await page.close()
+                for context in pooled.contexts.values():
+                    await context.clear_cookies()
+                retire = pooled.pages >= self.max_pages or not pooled.browser.is_connected()
+            except Exception as e:
+                logger.warning(f"Browser recycle failed, relaunching: {e}")
+                retire = True
+            if retire:
+                task = asyncio.ensure_future(self._recycle(pooled))
+                self._recycling.add(task)
+                task.add_done_callback(self._recycling.discard)
+            else:
+                self._idle.put_nowait(pooled)
+
+    async def close(self):
+        if self._idle is None:
+            return
+        # Relaunches in flight land in the idle queue and are closed with the rest
+        await asyncio.gather(*self._recycling, return_exceptions=True)
+        while not self._idle.empty():
+            pooled = self._idle.get_nowait()
+            try:
+                await pooled.browser.close()
+            except Exception:
+                pass
+        self._idle = None
+        await self._playwright.stop()
+        self._playwright = None
+
+    def stats(self):
+        return {
+            "size": self.size,
+            "max_pages": self.max_pages,
+            "started": self._idle is not None,
+            "idle": self._idle.qsize() if self._idle is not None else 0,
+            "pages": self._pages,
+            "restarts": self._restarts,
+            "recycling": len(self._recycling)
+        }
+
+    async def _launch(self):
+        return await self._playwright.chromium.launch(headless=True)
+
+    async def _recycle(self, pooled: _PooledBrowser):
+        # Back to the queue once relaunched; checkouts meanwhile go to the other browsers
+        self._idle.put_nowait(await self._replace(pooled))
+
+    async def _replace(self, pooled: _PooledBrowser) -> _PooledBrowser:
+        try:
+            await pooled.browser.close()
+        except Exception:
+            pass
+        self._restarts += 1
+        try:
+            return _PooledBrowser(await self._launch())
+        except Exception as e:
+            # Keep the dead slot; the next checkout tries to relaunch it again
+            logger.error(f"Browser relaunch failed: {e}")
+            return pooled
+
+
+# Global browser pool instance
+browser_pool = BrowserPool()
@@ -0,0 +1,38 @@
+from src.config.settings import settings
+
+class AnalysisTier:
+    """Models and stages used for one depth of analysis"""
+
+    def __init__(self, name: str, nli_model: str, images: bool = False, ocr: bool = False, max_images: int = 0):
+        self.name = name
+        self.nli_model = nli_model
+        self.images = images
+        self.ocr = ocr and images
+        self.max_images = max_images if images else 0
+
+    def describe(self):
+        return {
+            "name": self.name,
+            "nli_model": self.nli_model,
+            "images": self.images,
+            "ocr": self.ocr,
+            "max_images": self.max_images
+        }
+
+
+# Tiers the ``deep_analysis`` request flag maps to; any others are optional extras
+REQUIRED_TIERS = ("fast", "deep")
+
+def load_tiers(config: dict = None) -> dict:
+    """Tiers declared in ``settings.analysis_tiers``, keyed by name"""
+    config = config or settings.analysis_tiers
+    missing = [name for name in REQUIRED_TIERS if name not in config]
+    if missing:
+        raise ValueError(
+            f"ANALYSIS_TIERS must declare the {', '.join(REQUIRED_TIERS)} tiers; missing: {', '.join(missing)}"
+        )
+    return {name: AnalysisTier(name, **options) for name, options in config.items()}
+
+def tier_for(deep_analysis: bool) -> str:
+    """Name of the tier a request's ``deep_analysis`` flag selects"""
+    return "deep" if deep_analysis else "fast"
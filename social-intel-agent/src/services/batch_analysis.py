@@ -0,0 +1,60 @@
+import asyncio
+from src.config.settings import settings
+from src.config.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+class BatchAnalysisService:
+    """Analyzes many URLs with bounded concurrency, yielding reports as they finish.
+
+    Scraping is limited to ``scrape_concurrency`` URLs at a time. Up to
+    ``max_in_flight`` scraped items are analyzed together; their detector
+    calls meet in the dispatcher's micro-batchers and run as shared model
+    batches.
+    """
+
+    def __init__(self, dispatcher, scrape_concurrency: int = None, max_in_flight: int = None,
+                 item_timeout: float = None, cache=None):
+        self.dispatcher = dispatcher
+        self.cache = cache
+        self.scrape_concurrency = scrape_concurrency or settings.batch_scrape_concurrency
+        self.max_in_flight = max_in_flight or settings.batch_max_in_flight
+        self.item_timeout = item_timeout or settings.batch_item_timeout
+
+    async def stream(self, urls: list, deep_analysis: bool = False):
+        """Yield one report per URL in completion order"""
+        scrape_slots = asyncio.Semaphore(self.scrape_concurrency)
+        in_flight = asyncio.Semaphore(self.max_in_flight)
+
+        async def analyze_one(url: str):
+            async with in_flight:
+                try:
+                    compute = lambda: self._analyze(url, deep_analysis, scrape_slots)
+                    if self.cache:
+                        pending = self.cache.get_or_compute(url, deep_analysis, compute)
+                    else:
+                        pending = compute()
+                    return await asyncio.wait_for(pending, timeout=self.item_timeout)
+                except asyncio.TimeoutError:
+                    return self.dispatcher.error_report(url, f"Analysis timed out after {self.item_timeout:.0f}s")
+                except Exception as e:
+                    logger.error(f"Batch item {url} failed: {e}")
+                    return self.dispatcher.error_report(url, str(e))
+
+        tasks = [asyncio.create_task(analyze_one(url)) for url in urls]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                yield await next_done
+        finally:
+            # Client went away or the stream was closed early
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+
+    async def _analyze(self, url: str, deep_analysis: bool, scrape_slots):
+        async with scrape_slots:
+            try:
+                extracted_data = await self.dispatcher.scraper.scrape(url)
+            except Exception as e:
+                return self.dispatcher.error_report(url, str(e))
+        return await self.dispatcher.analyze_extracted(url, extracted_data, deep_analysis)
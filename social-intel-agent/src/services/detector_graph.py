@@ -0,0 +1,120 @@
+import asyncio
+import time
+from src.config.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+class DetectorNode:
+    """One analysis stage: what it needs, what it costs and when it can be skipped.
+
+    ``run(context)`` is a coroutine function returning the node's result.
+    ``context`` holds the request inputs plus the result of every finished
+    node under its name. ``skip_if(context)`` is checked once all inputs are
+    done; a skipped node's result comes from ``on_skip(context)``.
+    """
+
+    def __init__(self, name: str, run, inputs: list = None, cost: float = 1.0, skip_if=None, on_skip=None):
+        self.name = name
+        self.run = run
+        self.inputs = list(inputs or [])
+        self.cost = cost
+        self.skip_if = skip_if
+        self.on_skip = on_skip
+
+
+class DetectorGraph:
+    """Runs detector nodes as soon as their inputs are ready.
+
+    Independent nodes run concurrently; when several become ready together
+    the most expensive starts first so it overlaps with the cheap ones. Skip
+    predicates let cheap upstream results avoid expensive model calls.
+    """
+
+    def __init__(self, nodes: list):
+        self.nodes = {node.name: node for node in nodes}
+        self.order = self._topological_order()
+
+    async def run(self, context: dict):
+        """Run every node; returns ``(context, timings)``"""
+        started = time.perf_counter()
+        timings = {}
+        done = set()
+        running = {}
+        pending = list(self.order)
+
+        try:
+            while pending or running:
+                ready = [name for name in pending if all(dep in done for dep in self.nodes[name].inputs)]
+                for name in sorted(ready, key=lambda n: self.nodes[n].cost, reverse=True):
+                    pending.remove(name)
+                    node = self.nodes[name]
+                    if node.skip_if and node.skip_if(context):
+                        context[name] = node.on_skip(context) if node.on_skip else None
+                        timings[name] = self._timing(node, "skipped", started)
+                        done.add(name)
+                        continue
+                    running[asyncio.ensure_future(self._run_node(node, context))] = name
+
+                if not running:
+                    continue
+
+                finished, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+                for task in finished:
+                    name = running.pop(task)
+                    result, node_started, node_ms = task.result()
+                    context[name] = result
+                    timings[name] = self._timing(self.nodes[name], "ran", started, node_started, node_ms)
+                    done.add(name)
+        finally:
+            for task in running:
+                task.cancel()
+
+        return context, {
+            "total_ms": round((time.perf_counter() - started) * 1000, 2),
+            "nodes": {name: timings[name] for name in self.order if name in timings},
+            "skipped": [name for name in self.order if timings.get(name, {}).get("status") == "skipped"]
+        }
+
+    def describe(self):
+        return [
+            {"name": name, "inputs": self.nodes[name].inputs, "cost": self.nodes[name].cost,
+             "conditional": self.nodes[name].skip_if is not None}
+            for name in self.order
+        ]
+
+    async def _run_node(self, node: DetectorNode, context: dict):
+        node_started = time.perf_counter()
+        try:
+            result = await node.run(context)
+        except Exception as e:
+            logger.error(f"Detector node {node.name} failed: {e}")
+            raise
+        return result, node_started, (time.perf_counter() - node_started) * 1000
+
+    def _timing(self, node: DetectorNode, status: str, graph_started: float, node_started: float = None,
+                node_ms: float = 0.0):
+        timing = {"status": status, "cost": node.cost, "ms": round(node_ms, 2)}
+        if node_started is not None:
+            timing["started_at_ms"] = round((node_started - graph_started) * 1000, 2)
+        return timing
+
+    def _topological_order(self) -> list:
+        order = []
+        state = {}
+
+        def visit(name, path):
+            if name not in self.nodes:
+                raise ValueError(f"Detector node {path[-1]} depends on unknown node {name}")
+            if state.get(name) == "done":
+                return
+            if state.get(name) == "visiting":
+                raise ValueError(f"Detector graph has a cycle: {' -> '.join(path + [name])}")
+            state[name] = "visiting"
+            for dep in self.nodes[name].inputs:
+                visit(dep, path + [name])
+            state[name] = "done"
+            order.append(name)
+
+        for name in self.nodes:
+            visit(name, [])
+        return order
@@ -0,0 +1,128 @@
+import asyncio
+import json
+from contextlib import asynccontextmanager
+import aiohttp
+from src.config.settings import settings
+from src.config.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+class HttpError(Exception):
+    """Non-success HTTP status"""
+
+    def __init__(self, status: int, url: str):
+        super().__init__(f"HTTP {status} for {url}")
+        self.status = status
+
+
+class ResponseTooLarge(Exception):
+    """The response body passed the caller's byte cap"""
+
+
+class HttpResponse:
+    """Fully read response, shaped like the parts of ``requests.Response`` the adapters use"""
+
+    def __init__(self, url: str, status: int, headers, content: bytes, charset: str = None):
+        self.url = url
+        self.status_code = status
+        self.headers = headers
+        self.content = content
+        self.encoding = charset or "utf-8"
+
+    @property
+    def text(self) -> str:
+        return self.content.decode(self.encoding, errors="replace")
+
+    def json(self):
+        return json.loads(self.content)
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise HttpError(self.status_code, self.url)
+
+
+class HttpClient:
+    """One pooled async HTTP session per process.
+
+    Connections are kept alive and reused across requests, DNS answers are
+    cached for ``http_dns_ttl`` seconds and each host gets at most
+    ``http_per_host_limit`` concurrent connections. Bodies are streamed and
+    abandoned once they pass the byte cap. aiohttp speaks HTTP/1.1 only;
+    keep-alive reuse is what removes the per-request handshakes.
+    """
+
+    def __init__(self):
+        self._session = None
+        self._loop = None
+        self._requests = 0
+        self._failures = 0
+
+    def session(self) -> aiohttp.ClientSession:
+        # Created lazily so it binds to the serving event loop
+        loop = asyncio.get_running_loop()
+        if self._session is None or self._session.closed or self._loop is not loop:
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(
+                    limit=settings.http_pool_size,
+                    limit_per_host=settings.http_per_host_limit,
+                    ttl_dns_cache=settings.http_dns_ttl,
+                    keepalive_timeout=settings.http_keepalive_timeout
+                ),
+                timeout=self._timeout()
+            )
+            self._loop = loop
+        return self._session
+
+    @asynccontextmanager
+    async def stream(self, url: str, headers: dict = None, timeout: float = None):
+        """Open ``url`` and yield the aiohttp response without reading the body"""
+        self._requests += 1
+        opened = False
+        try:
+            async with self.session().get(url, headers=headers, timeout=self._timeout(timeout)) as response:
+                opened = True
+                yield response
+        except Exception:
+            # Only failures to open the request count; the caller's own exceptions pass through
+            if not opened:
+                self._failures += 1
+            raise
+
+    async def get(self, url: str, headers: dict = None, timeout: float = None, max_bytes: int = None) -> HttpResponse:
+        """GET ``url`` and read the body, raising ResponseTooLarge past ``max_bytes``"""
+        max_bytes = max_bytes or settings.http_max_body_bytes
+        async with self.stream(url, headers=headers, timeout=timeout) as response:
+            length = response.headers.get("Content-Length")
+            if length and length.isdigit() and int(length) > max_bytes:
+                raise ResponseTooLarge(f"{url} declares {length} bytes, over {max_bytes}")
+            body = bytearray()
+            async for chunk in response.content.iter_chunked(64 * 1024):
+                body.extend(chunk)
+                if len(body) > max_bytes:
+                    raise ResponseTooLarge(f"{url} is over {max_bytes} bytes")
+            return HttpResponse(str(response.url), response.status, response.headers, bytes(body), response.charset)
+
+    def stats(self):
+        return {
+            "requests": self._requests,
+            "failures": self._failures,
+            "pool_size": settings.http_pool_size,
+            "per_host_limit": settings.http_per_host_limit,
+            "session_open": self._session is not None and not self._session.closed
+        }
+
+    async def close(self):
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    def _timeout(self, total: float = None) -> aiohttp.ClientTimeout:
+        return aiohttp.ClientTimeout(
+            total=total or settings.http_total_timeout,
+            connect=settings.http_connect_timeout,
+            sock_read=settings.http_read_timeout
+        )
+
+
+# Global HTTP client instance
+http_client = HttpClient()
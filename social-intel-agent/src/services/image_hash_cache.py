@@ -0,0 +1,263 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+from src.analysis.image.perceptual_hash import hamming
+from src.config.settings import settings
+from src.config.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+class BKTree:
+    """Metric tree over 64-bit hashes for Hamming-radius queries"""
+
+    def __init__(self):
+        self.root = None
+        self.size = 0
+
+    def add(self, value: int, item):
+        self.size += 1
+        if self.root is None:
+            self.root = [value, [item], {}]
+            return
+        node = self.root
+        while True:
+            distance = hamming(value, node[0])
+            if distance == 0:
+                node[1].append(item)
+                return
+            child = node[2].get(distance)
+            if child is None:
+                node[2][distance] = [value, [item], {}]
+                return
+            node = child
+
+    def search(self, value: int, radius: int) -> list:
+        """``(distance, item)`` for every item within ``radius`` of ``value``, nearest first"""
+        found = []
+        stack = [self.root] if self.root is not None else []
+        while stack:
+            node = stack.pop()
+            distance = hamming(value, node[0])
+            if distance <= radius:
+                found.extend((distance, item) for item in node[1])
+            # Triangle inequality: only children in [d - r, d + r] can hold matches
+            for edge, child in node[2].items():
+                if distance - radius <= edge <= distance + radius:
+                    stack.append(child)
+        return sorted(found, key=lambda match: match[0])
+
+
+class ImageHashCache:
+    """Persistent perceptual-hash index from images to their detector results.
+
+    Reposted memes and banners come back under new URLs, crops and
+    recompressions; a pHash within ``max_distance`` whose dHash also agrees
+    reuses the stored NSFW, violence, religious hate and OCR results without
+    any model call. Rows live in SQLite, shared by every worker; each
+    process keeps a BK-tree over the pHashes of rows written under its own
+    detector fingerprint and picks up other workers' rows incrementally.
+    Rows from other fingerprints are never matched and age out through LRU
+    eviction; ``purge_stale`` deletes them explicitly.
+    """
+
+    EVICT_CHECK_EVERY = 200
+    # As in InferenceCache: hits only mark stale rows for an LRU refresh, written in batches
+    TOUCH_INTERVAL_SECONDS = 300
+    TOUCH_FLUSH_EVERY = 256
+
+    def __init__(self, path: str = None, max_entries: int = None, max_distance: int = None, enabled: bool = None):
+        self.path = path or settings.image_hash_cache_path
+        self.max_entries = max_entries or settings.image_hash_cache_max_entries
+        self.max_distance = settings.image_hash_max_distance if max_distance is None else max_distance
+        self.enabled = settings.image_hash_cache_enabled if enabled is None else enabled
+        self.fingerprint = None
+        self._conn = None
+        self._lock = threading.Lock()
+        self._tree = BKTree()
+        self._dhashes = {}
+        self._last_id = 0
+        self._dead = 0
+        self._writes_since_check = 0
+        self._touched = {}
+        self._hits = 0
+        self._misses = 0
+
+    def register(self, detector_fingerprint: str):
+        """Record the image detectors' fingerprint; only rows written under it are indexed"""
+        with self._lock:
+            self.fingerprint = detector_fingerprint
+            self._reset_index()
+
+    def purge_stale(self):
+        """Delete rows written under any other fingerprint than the registered one"""
+        conn = self._connection()
+        if conn is None or self.fingerprint is None:
+            return 0
+        with self._lock:
+            deleted = conn.execute("DELETE FROM images WHERE fingerprint != ?", (self.fingerprint,)).rowcount
+            conn.commit()
+        if deleted:
+            logger.info(f"Image hash cache dropped {deleted} stale entries")
+        return deleted
+
+    def get(self, hashes: tuple):
+        """``(result, distance, row_id)`` of the nearest stored near-duplicate, or None"""
+        conn = self._connection()
+        if conn is None or self.fingerprint is None:
+            return None
+        phash, dhash = hashes
+        with self._lock:
+            self._sync(conn)
+            for distance, row_id in self._tree.search(phash, self.max_distance):
+                stored_dhash = self._dhashes.get(row_id)
+                if stored_dhash is None or hamming(dhash, stored_dhash) > self.max_distance:
+                    continue
+                row = conn.execute("SELECT value, last_access FROM images WHERE id = ?", (row_id,)).fetchone()
+                if row is None:
+                    # Evicted by another worker; the tree is compacted once enough ids are dead
+                    if self._dhashes.pop(row_id, None) is not None:
+                        self._dead += 1
+                    continue
+                now = time.time()
+                if now - row[1] > self.TOUCH_INTERVAL_SECONDS:
+                    self._touched[row_id] = now
+                    if len(self._touched) >= self.TOUCH_FLUSH_EVERY:
+                        self._flush_touched(conn)
+                        conn.commit()
+                self._hits += 1
+                value = json.loads(row[0])
+                self._compact_if_needed(conn)
+                return value, distance, row_id
+            self._misses += 1
+            self._compact_if_needed(conn)
+        return None
+
+    def put(self, hashes: tuple, result: dict, row_id: int = None):
+        """Store ``result``; with the ``row_id`` of a ``get`` match, that row is updated in place.
+        
+        Updating the matched row (e.g. when a cached result gains OCR) keeps
+        one row per image, so later near-duplicates of it find the OCR too.
+        """
+        conn = self._connection()
+        if conn is None or self.fingerprint is None:
+            return
+        phash, dhash = hashes
+        with self._lock:
+            if row_id is not None:
+                updated = conn.execute(
+                    "UPDATE images SET value = ?, last_access = ? WHERE id = ? AND fingerprint = ?",
+                    (json.dumps(result, default=str), time.time(), row_id, self.fingerprint)
+                ).rowcount
+                if updated:
+                    self._touched.pop(row_id, None)
+                    self._flush_touched(conn)
+                    conn.commit()
+                    return
+            # New image, or the matched row was evicted meanwhile
+            conn.execute(
+                "INSERT INTO images (phash, dhash, fingerprint, value, last_access) VALUES (?, ?, ?, ?, ?)",
+                (f"{phash:016x}", f"{dhash:016x}", self.fingerprint, json.dumps(result, default=str), time.time())
+            )
+            # Pending LRU refreshes ride along with the write
+            self._flush_touched(conn)
+            conn.commit()
+            self._sync(conn)
+            self._writes_since_check += 1
+            if self._writes_since_check >= self.EVICT_CHECK_EVERY:
+                self._writes_since_check = 0
+                self._evict(conn)
+
+    def stats(self):
+        stats = {
+            "enabled": self.enabled,
+            "path": self.path,
+            "max_entries": self.max_entries,
+            "max_distance": self.max_distance,
+            "hits": self._hits,
+            "misses": self._misses,
+            "indexed": len(self._dhashes),
+            "tree_size": self._tree.size
+        }
+        conn = self._connection()
+        if conn is not None:
+            with self._lock:
+                stats["entries"] = conn.execute("SELECT COUNT(*) FROM images").fetchone()[0]
+        return stats
+
+    def _sync(self, conn):
+        """Index rows added since the last sync, including other workers'"""
+        rows = conn.execute(
+            "SELECT id, phash, dhash FROM images WHERE id > ? AND fingerprint = ? ORDER BY id",
+            (self._last_id, self.fingerprint)
+        ).fetchall()
+        for row_id, phash, dhash in rows:
+            self._tree.add(int(phash, 16), row_id)
+            self._dhashes[row_id] = int(dhash, 16)
+            self._last_id = row_id
+
+    def _reset_index(self):
+        self._tree = BKTree()
+        self._dhashes = {}
+        self._last_id = 0
+        self._dead = 0
+
+    def _compact_if_needed(self, conn):
+        """Rebuild the tree from the surviving rows once a quarter of its ids are dead"""
+        if self._dead and self._dead >= len(self._dhashes) // 4:
+            self._reset_index()
+            self._sync(conn)
+
+    def _flush_touched(self, conn):
+        if self._touched:
+            conn.executemany(
+                "UPDATE images SET last_access = ? WHERE id = ?",
+                [(accessed, row_id) for row_id, accessed in self._touched.items()]
+            )
+            self._touched = {}
+
+    def _evict(self, conn):
+        count = conn.execute("SELECT COUNT(*) FROM images").fetchone()[0]
+        if count <= self.max_entries:
+            return
+        excess = count - int(self.max_entries * 0.9)
+        evicted = [row[0] for row in conn.execute(
+            "SELECT id FROM images ORDER BY last_access LIMIT ?", (excess,)
+        ).fetchall()]
+        conn.executemany("DELETE FROM images WHERE id = ?", [(row_id,) for row_id in evicted])
+        conn.commit()
+        # BK-trees cannot delete, so the index is rebuilt from the rows that are left
+        self._reset_index()
+        self._sync(conn)
+        logger.info(f"Image hash cache evicted {excess} least recently used entries")
+
+    def _connection(self):
+        if not self.enabled:
+            return None
+        if self._conn is not None:
+            return self._conn
+        with self._lock:
+            if self._conn is None:
+                try:
+                    os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+                    conn = sqlite3.connect(self.path, timeout=5.0, check_same_thread=False)
+                    # WAL lets every gunicorn worker read while one writes
+                    conn.execute("PRAGMA journal_mode=WAL")
+                    conn.execute("PRAGMA synchronous=NORMAL")
+                    conn.execute(
+                        "CREATE TABLE IF NOT EXISTS images ("
+                        "id INTEGER PRIMARY KEY AUTOINCREMENT, phash TEXT NOT NULL, dhash TEXT NOT NULL, "
+                        "fingerprint TEXT NOT NULL, value TEXT NOT NULL, last_access REAL NOT NULL)"
+                    )
+                    conn.execute("CREATE INDEX IF NOT EXISTS images_last_access ON images (last_access)")
+                    conn.commit()
+                    self._conn = conn
+                except Exception as e:
+                    logger.error(f"Image hash cache disabled, could not open {self.path}: {e}")
+                    self.enabled = False
+        return self._conn
+
+
+# Global image hash cache instance
+image_hash_cache = ImageHashCache()
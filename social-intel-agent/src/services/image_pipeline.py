@@ -0,0 +1,183 @@
+import asyncio
+import threading
+from src.analysis.image.perceptual_hash import image_hashes
+from src.analysis.image.preprocessing import PreparedImages
+from src.services.image_hash_cache import image_hash_cache
+from src.services.inference_executor import inference_executor
+from src.config.settings import settings
+from src.config.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+class ImageAnalysisPipeline:
+    """Downloads, decodes and scores a page's images within a time budget.
+
+    Downloads run concurrently over the shared HTTP client, decoding runs
+    off the event loop, and the decoded images go through NSFW and CLIP as
+    one batch each, then OCR as one batch over the images CLIP expects to
+    hold text. Perceptual near-duplicates of earlier images reuse
+    their stored results. Whatever has not finished when the budget runs out
+    is reported with ``status: "not_analyzed"`` instead of failing the request.
+    """
+
+    CACHED_KEYS = ("nsfw", "violence", "religious_hate", "ocr")
+
+    def __init__(self, image_extractor, nsfw_detector, violence_detector, religious_hate_detector,
+                 ocr_extractor, clip_scorer=None):
+        self.image_extractor = image_extractor
+        self.nsfw_detector = nsfw_detector
+        self.violence_detector = violence_detector
+        self.religious_hate_detector = religious_hate_detector
+        self.ocr_extractor = ocr_extractor
+        self.clip_scorer = clip_scorer
+        self._download_slots = None
+
+    async def analyze(self, image_urls: list, ocr: bool = True, budget_seconds: float = None) -> list:
+        """One entry per URL, in order; analysed entries carry every detector's result"""
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + (budget_seconds or settings.image_analysis_budget_seconds)
+        remaining = lambda: max(deadline - loop.time(), 0.0)
+        entries = {url: self._not_analyzed(url, "deadline") for url in image_urls}
+
+        # Stage 1: concurrent downloads, decoded in the inference pool
+        downloads = {asyncio.ensure_future(self.download(url)): url for url in dict.fromkeys(image_urls)}
+        if not downloads:
+            return []
+        done, pending = await asyncio.wait(downloads, timeout=remaining())
+        for task in pending:
+            task.cancel()
+
+        images = []
+        for task in done:
+            url = downloads[task]
+            image = None if task.exception() else task.result()
+            if image is None:
+                entries[url] = self._not_analyzed(url, "download_failed")
+            else:
+                images.append((url, image))
+        images.sort(key=lambda item: image_urls.index(item[0]))
+        if not images:
+            return [entries[url] for url in image_urls]
+        # Every model's input comes from one preprocessing pass over the decoded images
+        prepared = PreparedImages([image for _, image in images])
+        positions = {url: i for i, (url, _) in enumerate(images)}
+
+        # Near-duplicates of images seen before reuse their stored results
+        lookups = await inference_executor.run_io(self._lookup_all, [image for _, image in images])
+        results = {}
+        row_ids = {}
+        clip_scores = {}
+        for (url, _), (hashes, cached) in zip(images, lookups):
+            if cached is not None:
+                stored, distance, row_id = cached
+                results[url] = {**stored, "cache": {"hit": True, "distance": distance}}
+                row_ids[url] = row_id
+        misses = [(url, image) for url, image in images if url not in results]
+
+        if misses:
+            # Stage 2: NSFW and CLIP over every new image in one batch
+            batch = prepared if len(misses) == len(images) else PreparedImages([image for _, image in misses])
+            abandoned = threading.Event()
+            try:
+                scored = await asyncio.wait_for(inference_executor.run(self._score_batch, batch, abandoned), remaining())
+            except asyncio.TimeoutError:
+                # The worker cannot be interrupted mid-model; it stops before its next detector
+                abandoned.set()
+                logger.warning(f"Image budget spent before scoring {len(misses)} image(s)")
+                scored = []
+            for (url, _), (nsfw, violence, religious_hate, scores) in zip(misses, scored):
+                results[url] = {"nsfw": nsfw, "violence": violence, "religious_hate": religious_hate,
+                                "ocr": None, "cache": {"hit": False}}
+                clip_scores[url] = scores
+
+        # Stage 3: OCR over every image still without text, in one batch; the
+        # CLIP scores from stage 2 let images without visible text skip it
+        needs_ocr = [(url, prepared.array(positions[url]), clip_scores.get(url)) for url, _ in images
+                     if url in results and results[url]["ocr"] is None]
+        ocr_added = set()
+        if ocr and needs_ocr:
+            for (url, _, _), ocr_result in zip(needs_ocr, await self._ocr(needs_ocr, remaining)):
+                if ocr_result.get("status") != "not_analyzed":
+                    results[url]["ocr"] = ocr_result
+                    ocr_added.add(url)
+
+        new_entries = []
+        for (url, _), (hashes, _) in zip(images, lookups):
+            if url not in results:
+                continue
+            result = results[url]
+            # New images are stored; cached ones that now also have OCR update their matched row
+            if not result["cache"]["hit"] or url in ocr_added:
+                new_entries.append((hashes, {key: result[key] for key in self.CACHED_KEYS}, row_ids.get(url)))
+            entries[url] = {
+                "url": url,
+                "status": "analyzed",
+                **result,
+                "ocr": result["ocr"] if result["ocr"] is not None else self._no_ocr(ocr)
+            }
+        if new_entries:
+            await inference_executor.run_io(self._store_all, new_entries)
+
+        return [entries[url] for url in image_urls]
+
+    async def download(self, url: str):
+        """Decoded image at ``url`` over the shared HTTP client, or None"""
+        if self._download_slots is None:
+            # Created lazily so it binds to the serving event loop
+            self._download_slots = asyncio.Semaphore(settings.image_download_concurrency)
+        async with self._download_slots:
+            return await self.image_extractor.download_image(url)
+
+    def _score_batch(self, prepared: PreparedImages, abandoned: threading.Event = None) -> list:
+        """``(nsfw, violence, religious_hate, clip_scores)`` per image, or [] once ``abandoned`` is set"""
+        nsfw_results = self.nsfw_detector.detect_batch(prepared)
+        if abandoned is not None and abandoned.is_set():
+            return []
+        # One CLIP forward pass over the batch serves both the violence and religious hate label sets
+        clip_scores = None
+        if self.clip_scorer:
+            try:
+                clip_scores = self.clip_scorer.score_images(prepared)
+            except Exception as e:
+                logger.error(f"CLIP scoring failed: {e}")
+        violence_results = self.violence_detector.detect_batch(prepared, clip_scores)
+        religious_results = self.religious_hate_detector.detect_batch(prepared, nsfw_results, clip_scores)
+        return list(zip(nsfw_results, violence_results, religious_results, clip_scores or [None] * len(prepared)))
+
+    def _lookup_all(self, images: list) -> list:
+        """``(hashes, cached)`` per image; ``cached`` is ``(result, distance, row_id)`` or None"""
+        lookups = []
+        for image in images:
+            hashes = image_hashes(image)
+            try:
+                cached = image_hash_cache.get(hashes)
+            except Exception as e:
+                logger.warning(f"Image hash cache lookup failed: {e}")
+                cached = None
+            lookups.append((hashes, cached))
+        return lookups
+
+    def _store_all(self, entries: list):
+        for hashes, result, row_id in entries:
+            try:
+                image_hash_cache.put(hashes, result, row_id)
+            except Exception as e:
+                logger.warning(f"Image hash cache write failed: {e}")
+
+    async def _ocr(self, images: list, remaining) -> list:
+        try:
+            return await asyncio.wait_for(
+                inference_executor.run(self.ocr_extractor.extract_batch,
+                                       [array for _, array, _ in images], [scores for _, _, scores in images]),
+                remaining()
+            )
+        except asyncio.TimeoutError:
+            logger.warning(f"Image budget spent before OCR of {len(images)} image(s)")
+            return [{"text": "", "confidence": 0.0, "status": "not_analyzed"} for _ in images]
+
+    def _no_ocr(self, requested: bool):
+        # OCR was requested but missed the budget, or the tier does not run it
+        return {"text": "", "confidence": 0.0, **({"status": "not_analyzed"} if requested else {})}
+
+    def _not_analyzed(self, url: str, reason: str):
+        return {"url": url, "status": "not_analyzed", "reason": reason}
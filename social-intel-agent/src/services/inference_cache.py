@@ -0,0 +1,175 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from src.config.settings import settings
+from src.config.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+def text_hash(text: str) -> str:
+    """Hash of the whitespace-normalised text a detector actually sees"""
+    return hashlib.sha256(" ".join(text.split()).encode("utf-8")).hexdigest()
+
+def fingerprint(**parts) -> str:
+    """Stable digest of model ids, revisions and thresholds behind a detector's output"""
+    return hashlib.sha256(json.dumps(parts, sort_keys=True, default=str).encode("utf-8")).hexdigest()[:16]
+
+
+class InferenceCache:
+    """On-disk per-detector result cache shared by every worker on the host.
+
+    Entries are keyed by detector namespace, the detector's fingerprint
+    (model id, revision and thresholds) and the hash of the input text.
+    When a fingerprint changes, old rows can never be hit again and age out
+    through LRU eviction; other workers or deploys sharing the file with a
+    different model configuration keep their own rows. ``purge_stale``
+    deletes them explicitly.
+    """
+
+    EVICT_CHECK_EVERY = 500
+    # Hits only mark a row for an LRU refresh when its last_access is this stale,
+    # and marked rows are written in batches, so reads stay read-only transactions
+    TOUCH_INTERVAL_SECONDS = 300
+    TOUCH_FLUSH_EVERY = 256
+
+    def __init__(self, path: str = None, max_entries: int = None, enabled: bool = None):
+        self.path = path or settings.inference_cache_path
+        self.max_entries = max_entries or settings.inference_cache_max_entries
+        self.enabled = settings.inference_cache_enabled if enabled is None else enabled
+        self._conn = None
+        self._lock = threading.Lock()
+        self._fingerprints = {}
+        self._writes_since_check = 0
+        self._touched = {}
+        self._hits = 0
+        self._misses = 0
+
+    def register(self, namespace: str, detector_fingerprint: str):
+        """Record the current fingerprint of ``namespace``; it is part of every key"""
+        self._fingerprints[namespace] = detector_fingerprint
+
+    def purge_stale(self, namespace: str):
+        """Delete rows of ``namespace`` written under any other fingerprint than the registered one"""
+        conn = self._connection()
+        if conn is None or namespace not in self._fingerprints:
+            return 0
+        with self._lock:
+            deleted = conn.execute(
+                "DELETE FROM entries WHERE namespace = ? AND fingerprint != ?",
+                (namespace, self._fingerprints[namespace])
+            ).rowcount
+            conn.commit()
+        if deleted:
+            logger.info(f"Inference cache dropped {deleted} stale {namespace} entries")
+        return deleted
+
+    def get(self, namespace: str, text: str):
+        """Cached result for ``text`` or None"""
+        conn = self._connection()
+        if conn is None or namespace not in self._fingerprints:
+            return None
+        key = self._key(namespace, text)
+        with self._lock:
+            row = conn.execute("SELECT value, last_access FROM entries WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                self._misses += 1
+                return None
+            now = time.time()
+            if now - row[1] > self.TOUCH_INTERVAL_SECONDS:
+                self._touched[key] = now
+                if len(self._touched) >= self.TOUCH_FLUSH_EVERY:
+                    self._flush_touched(conn)
+                    conn.commit()
+        self._hits += 1
+        return json.loads(row[0])
+
+    def put(self, namespace: str, text: str, result):
+        conn = self._connection()
+        if conn is None or namespace not in self._fingerprints:
+            return
+        with self._lock:
+            conn.execute(
+                "INSERT OR REPLACE INTO entries (key, namespace, fingerprint, value, last_access) VALUES (?, ?, ?, ?, ?)",
+                (self._key(namespace, text), namespace, self._fingerprints[namespace],
+                 json.dumps(result, default=str), time.time())
+            )
+            # Pending LRU refreshes ride along with the write
+            self._flush_touched(conn)
+            conn.commit()
+            self._writes_since_check += 1
+            if self._writes_since_check >= self.EVICT_CHECK_EVERY:
+                self._writes_since_check = 0
+                self._evict(conn)
+
+    def stats(self):
+        stats = {
+            "enabled": self.enabled,
+            "path": self.path,
+            "max_entries": self.max_entries,
+            "hits": self._hits,
+            "misses": self._misses,
+            "namespaces": dict(self._fingerprints)
+        }
+        conn = self._connection()
+        if conn is not None:
+            with self._lock:
+                stats["entries"] = conn.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+        return stats
+
+    def _key(self, namespace: str, text: str) -> str:
+        return hashlib.sha256(f"{namespace}\0{self._fingerprints[namespace]}\0{text_hash(text)}".encode()).hexdigest()
+
+    def _flush_touched(self, conn):
+        if self._touched:
+            conn.executemany(
+                "UPDATE entries SET last_access = ? WHERE key = ?",
+                [(accessed, key) for key, accessed in self._touched.items()]
+            )
+            self._touched = {}
+
+    def _evict(self, conn):
+        count = conn.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+        if count <= self.max_entries:
+            return
+        # Trim to 90% so eviction does not run on every subsequent write
+        excess = count - int(self.max_entries * 0.9)
+        conn.execute(
+            "DELETE FROM entries WHERE key IN (SELECT key FROM entries ORDER BY last_access LIMIT ?)",
+            (excess,)
+        )
+        conn.commit()
+        logger.info(f"Inference cache evicted {excess} least recently used entries")
+
+    def _connection(self):
+        if not self.enabled:
+            return None
+        if self._conn is not None:
+            return self._conn
+        with self._lock:
+            if self._conn is None:
+                try:
+                    os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+                    conn = sqlite3.connect(self.path, timeout=5.0, check_same_thread=False)
+                    # WAL lets every gunicorn worker read while one writes
+                    conn.execute("PRAGMA journal_mode=WAL")
+                    conn.execute("PRAGMA synchronous=NORMAL")
+                    conn.execute(
+                        "CREATE TABLE IF NOT EXISTS entries ("
+                        "key TEXT PRIMARY KEY, namespace TEXT NOT NULL, fingerprint TEXT NOT NULL, "
+                        "value TEXT NOT NULL, last_access REAL NOT NULL)"
+                    )
+                    conn.execute("CREATE INDEX IF NOT EXISTS entries_last_access ON entries (last_access)")
+                    conn.execute("CREATE INDEX IF NOT EXISTS entries_namespace ON entries (namespace, fingerprint)")
+                    conn.commit()
+                    self._conn = conn
+                except Exception as e:
+                    logger.error(f"Inference cache disabled, could not open {self.path}: {e}")
+                    self.enabled = False
+        return self._conn
+
+
+# Global inference cache instance
+inference_cache = InferenceCache()
@@ -0,0 +1,76 @@
+import asyncio
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from src.config.settings import settings
+from src.config.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+class InferenceExecutor:
+    """Bounded thread pools so model inference never runs on the event loop.
+
+    PyTorch releases the GIL inside its kernels, so independent detectors
+    make real progress in parallel. ``max_pending`` caps how many calls may
+    wait for a worker; beyond that callers queue on the event loop instead
+    of piling work into the pool.
+    """
+
+    def __init__(self, max_workers: int = None, max_pending: int = None, io_max_workers: int = None):
+        self.max_workers = max_workers or settings.inference_max_workers
+        self.max_pending = max_pending or settings.inference_max_pending
+        self.io_max_workers = io_max_workers or settings.io_max_workers
+        self._inference_pool = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="inference")
+        self._io_pool = ThreadPoolExecutor(max_workers=self.io_max_workers, thread_name_prefix="blocking-io")
+        self._slots = asyncio.Semaphore(self.max_workers + self.max_pending)
+        self._in_flight = 0
+
+    async def run(self, fn, *args, **kwargs):
+        """Run a CPU-bound model call in the inference pool.
+        
+        The slot is held until the call itself finishes, not until the caller
+        stops waiting: a caller that times out or is cancelled cannot stop a
+        running thread, so it keeps counting against the pool's concurrency.
+        """
+        loop = asyncio.get_running_loop()
+        await self._slots.acquire()
+        self._in_flight += 1
+        try:
+            future = self._inference_pool.submit(functools.partial(fn, *args, **kwargs))
+        except BaseException:
+            self._release()
+            raise
+        future.add_done_callback(lambda _: self._release_threadsafe(loop))
+        return await asyncio.wrap_future(future)
+
+    def _release(self):
+        self._in_flight -= 1
+        self._slots.release()
+
+    def _release_threadsafe(self, loop):
+        try:
+            loop.call_soon_threadsafe(self._release)
+        except RuntimeError:
+            # Event loop already closed at shutdown
+            pass
+
+    async def run_io(self, fn, *args, **kwargs):
+        """Run a blocking I/O or decode call in the I/O pool"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._io_pool, functools.partial(fn, *args, **kwargs))
+
+    def stats(self):
+        return {
+            "inference_workers": self.max_workers,
+            "inference_max_pending": self.max_pending,
+            "inference_in_flight": self._in_flight,
+            "io_workers": self.io_max_workers
+        }
+
+    def shutdown(self):
+        self._inference_pool.shutdown(wait=False, cancel_futures=True)
+        self._io_pool.shutdown(wait=False, cancel_futures=True)
+        logger.info("Inference executor shut down")
+
+
+# Global inference executor instance
+inference_executor = InferenceExecutor()
@@ -0,0 +1,115 @@
+import asyncio
+import time
+from src.services.inference_executor import inference_executor
+from src.config.settings import settings
+from src.config.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+class MicroBatcher:
+    """Coalesces concurrent single-item requests into model batches.
+
+    Callers ``await submit(item)``; a background worker collects queued
+    items until ``max_batch_size`` is reached or the oldest item has waited
+    ``max_wait_ms``, runs ``batch_fn(items)`` once in the inference pool and
+    hands each caller its own result. ``batch_fn`` must return one result
+    per item, in order.
+    """
+
+    def __init__(self, name: str, batch_fn, max_batch_size: int = None, max_wait_ms: int = None):
+        self.name = name
+        self.batch_fn = batch_fn
+        self.max_batch_size = max_batch_size or settings.batch_max_size
+        self.max_wait = (max_wait_ms if max_wait_ms is not None else settings.batch_max_wait_ms) / 1000
+        self._queue = None
+        self._worker = None
+        self._batches = 0
+        self._items = 0
+        self._total_wait = 0.0
+        self._total_batch_seconds = 0.0
+        self._failures = 0
+
+    async def submit(self, item):
+        """Queue ``item`` and wait for its result from the next batch"""
+        self._ensure_worker()
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((item, future, time.perf_counter()))
+        return await future
+
+    async def submit_many(self, items: list):
+        """Queue several items at once; they may be split across batches"""
+        return list(await asyncio.gather(*(self.submit(item) for item in items)))
+
+    def stats(self):
+        batches = self._batches or 1
+        avg_batch = self._items / batches if self._batches else 0.0
+        return {
+            "name": self.name,
+            "queue_depth": self._queue.qsize() if self._queue else 0,
+            "max_batch_size": self.max_batch_size,
+            "max_wait_ms": round(self.max_wait * 1000, 1),
+            "batches": self._batches,
+            "items": self._items,
+            "avg_batch_size": round(avg_batch, 2),
+            "fill_ratio": round(avg_batch / self.max_batch_size, 3) if self._batches else 0.0,
+            "avg_queue_wait_ms": round(self._total_wait / (self._items or 1) * 1000, 2),
+            "avg_batch_ms": round(self._total_batch_seconds / batches * 1000, 2),
+            "failed_batches": self._failures
+        }
+
+    async def close(self):
+        if self._worker and not self._worker.done():
+            self._worker.cancel()
+            try:
+                await self._worker
+            except asyncio.CancelledError:
+                pass
+        self._worker = None
+
+    def _ensure_worker(self):
+        if self._queue is None:
+            self._queue = asyncio.Queue()
+        if self._worker is None or self._worker.done():
+            self._worker = asyncio.create_task(self._run(), name=f"micro-batcher-{self.name}")
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            deadline = loop.time() + self.max_wait
+
+            # Fill the batch until it is full or the first item's deadline passes
+            while len(batch) < self.max_batch_size:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), remaining))
+                except asyncio.TimeoutError:
+                    break
+
+            await self._flush(batch)
+
+    async def _flush(self, batch: list):
+        items = [item for item, _, _ in batch]
+        started = time.perf_counter()
+        try:
+            results = await inference_executor.run(self.batch_fn, items)
+            if len(results) != len(items):
+                raise ValueError(f"{self.name} batch returned {len(results)} results for {len(items)} items")
+        except Exception as e:
+            self._failures += 1
+            logger.error(f"Batch {self.name} of {len(items)} failed: {e}")
+            for _, future, _ in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        finally:
+            self._batches += 1
+            self._items += len(items)
+            self._total_batch_seconds += time.perf_counter() - started
+            self._total_wait += sum(started - queued_at for _, _, queued_at in batch)
+
+        for (_, future, _), result in zip(batch, results):
+            if not future.done():
+                future.set_result(result)
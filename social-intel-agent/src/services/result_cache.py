@@ -0,0 +1,176 @@
+import asyncio
+import copy
+import time
+from collections import OrderedDict
+from datetime import datetime, timezone
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+from src.database.mongodb import mongodb
+from src.config.settings import settings
+from src.config.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+# Query parameters that only track the click and never change the content
+TRACKING_PARAMS = {"fbclid", "gclid", "igshid", "igsh", "mc_cid", "mc_eid", "ref_src", "ref_url", "si", "feature"}
+
+def normalize_url(url: str) -> str:
+    """Canonical form of ``url`` so trivially different links share a cache entry"""
+    url = url.strip()
+    if "://" not in url:
+        url = "https://" + url
+    parts = urlsplit(url)
+
+    scheme = parts.scheme.lower()
+    host = (parts.hostname or "").lower()
+    if host.startswith("www."):
+        host = host[4:]
+    port = parts.port
+    if port and not ((scheme == "http" and port == 80) or (scheme == "https" and port == 443)):
+        host = f"{host}:{port}"
+
+    path = parts.path.rstrip("/") or "/"
+    query = sorted(
+        (key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if not key.lower().startswith("utm_") and key.lower() not in TRACKING_PARAMS
+    )
+    return urlunsplit((scheme, host, path, urlencode(query), ""))
+
+
+class AnalysisResultCache:
+    """TTL + LRU cache of full analysis reports keyed by normalized URL.
+
+    Concurrent requests for a URL that is already being analyzed await the
+    same computation instead of starting another one. An optional MongoDB
+    collection acts as a second tier shared by all workers.
+    """
+
+    def __init__(self, ttl_seconds: int = None, max_entries: int = None, use_mongodb: bool = None):
+        self.ttl_seconds = ttl_seconds or settings.result_cache_ttl_seconds
+        self.max_entries = max_entries or settings.result_cache_max_entries
+        self.use_mongodb = settings.result_cache_mongodb if use_mongodb is None else use_mongodb
+        self._entries = OrderedDict()
+        self._in_flight = {}
+        self._mongo_index_ready = False
+        self._hits = {"memory": 0, "mongodb": 0, "coalesced": 0}
+        self._misses = 0
+
+    def cache_key(self, url: str, deep_analysis: bool) -> str:
+        return f"{normalize_url(url)}|deep={int(bool(deep_analysis))}"
+
+    async def get_or_compute(self, url: str, deep_analysis: bool, compute):
+        """Return a cached report for ``url`` or the result of ``await compute()``"""
+        key = self.cache_key(url, deep_analysis)
+
+        cached = self._get_memory(key)
+        if cached:
+            self._hits["memory"] += 1
+            return self._annotate(cached[1], hit=True, stored_at=cached[0], tier="memory")
+
+        task = self._in_flight.get(key)
+        if task is not None:
+            self._hits["coalesced"] += 1
+            report, stored_at, tier = await asyncio.shield(task)
+            return self._annotate(report, hit=tier is not None, stored_at=stored_at, tier=tier or "coalesced")
+
+        task = asyncio.ensure_future(self._load_or_compute(key, compute))
+        self._in_flight[key] = task
+        task.add_done_callback(lambda _: self._in_flight.pop(key, None))
+
+        # Shielded so a timed-out caller does not cancel the work other callers share
+        report, stored_at, tier = await asyncio.shield(task)
+        return self._annotate(report, hit=tier is not None, stored_at=stored_at, tier=tier)
+
+    def stats(self):
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "ttl_seconds": self.ttl_seconds,
+            "in_flight": len(self._in_flight),
+            "hits": dict(self._hits),
+            "misses": self._misses,
+            "mongodb_tier": self.use_mongodb
+        }
+
+    async def _load_or_compute(self, key: str, compute):
+        stored = await self._get_mongodb(key)
+        if stored:
+            self._hits["mongodb"] += 1
+            self._put_memory(key, stored[1], stored[0])
+            return stored[1], stored[0], "mongodb"
+
+        self._misses += 1
+        report = await compute()
+        stored_at = time.time()
+        if report.get("status") == "completed":
+            self._put_memory(key, report, stored_at)
+            await self._put_mongodb(key, report, stored_at)
+        return report, stored_at, None
+
+    def _get_memory(self, key: str):
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if time.time() - entry[0] > self.ttl_seconds:
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return entry
+
+    def _put_memory(self, key: str, report: dict, stored_at: float):
+        self._entries[key] = (stored_at, report)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    async def _get_mongodb(self, key: str):
+        collection = self._collection()
+        if collection is None:
+            return None
+        try:
+            doc = await collection.find_one({"_id": key})
+            if not doc:
+                return None
+            # PyMongo returns naive UTC datetimes
+            stored_at = doc["stored_at"].replace(tzinfo=timezone.utc).timestamp()
+            if time.time() - stored_at > self.ttl_seconds:
+                return None
+            return stored_at, doc["report"]
+        except Exception as e:
+            logger.warning(f"Result cache lookup in MongoDB failed: {e}")
+            return None
+
+    async def _put_mongodb(self, key: str, report: dict, stored_at: float):
+        collection = self._collection()
+        if collection is None:
+            return
+        try:
+            if not self._mongo_index_ready:
+                # MongoDB drops expired entries on its own
+                await collection.create_index("stored_at", expireAfterSeconds=self.ttl_seconds)
+                self._mongo_index_ready = True
+            await collection.replace_one(
+                {"_id": key},
+                {"_id": key, "report": copy.deepcopy(report), "stored_at": datetime.utcfromtimestamp(stored_at)},
+                upsert=True
+            )
+        except Exception as e:
+            logger.warning(f"Result cache write to MongoDB failed: {e}")
+
+    def _collection(self):
+        if not self.use_mongodb or mongodb.db is None:
+            return None
+        return mongodb.db.analysis_cache
+
+    def _annotate(self, report: dict, hit: bool, stored_at: float, tier: str = None):
+        annotated = copy.deepcopy(report)
+        annotated["cache"] = {
+            "hit": hit,
+            "tier": tier,
+            "age_seconds": round(time.time() - stored_at, 1) if hit else 0.0,
+            "cached_at": (datetime.utcfromtimestamp(stored_at).isoformat() if hit else None)
+        }
+        return annotated
+
+
+# Global result cache instance
+result_cache = AnalysisResultCache()
@@ -6,6 +6,10 @@ from src.analysis.text.content_classifier import ContentClassifier
 from src.analysis.text.intent_detector import IntentDetector
 from src.analysis.text.nsfw_detector import NSFWDetector
 from src.analysis.text.misinformation_detector import MisinformationDetector
+from src.analysis.text.nli_engine import get_nli_engine
+from src.analysis.text.prescreen import prescreener
+from src.analysis.text.preprocessing import normalize_text
+from src.analysis.text.document_windows import DocumentAggregator, split_windows
 from src.analysis.image.image_extractor import ImageExtractor
 from src.analysis.image.nsfw_image_detector import NSFWImageDetector
 from src.analysis.image.violence_detector import ViolenceDetector
@@ -14,7 +18,17 @@ from src.analysis.image.ocr_extractor import OCRExtractor
 from src.analysis.video.video_analyzer import VideoAnalyzer
 from src.analysis.social.social_media_analyzer import SocialMediaAnalyzer
 from src.analysis.scoring.risk_score import RiskScorer
+from src.services.inference_executor import inference_executor
+from src.services.micro_batcher import MicroBatcher
+from src.services.inference_cache import inference_cache, fingerprint
+from src.services.analysis_tiers import load_tiers, tier_for
+from src.services.detector_graph import DetectorGraph, DetectorNode
+from src.services.image_pipeline import ImageAnalysisPipeline
+from src.services.image_hash_cache import image_hash_cache
+from src.config.settings import settings
 from src.config.logger import setup_logger
+import asyncio
+import functools
 import uuid
 from datetime import datetime
 
@@ -23,6 +37,11 @@ logger = setup_logger(__name__)
 class UniversalAnalysisDispatcher:
     """Universal analysis dispatcher with complete AI analysis"""
     
+    # Content categories are skipped for reporting at or above this intent confidence...
+    REPORTING_CONFIDENCE = 0.6
+    # ...when neither toxicity nor hate speech is flagged above this confidence
+    LOW_HARM_CONFIDENCE = 0.3
+    
     def __init__(self):
         self.scraper = UniversalScraperService()
         self.sentiment_analyzer = SentimentAnalyzer()
@@ -36,18 +55,86 @@ class UniversalAnalysisDispatcher:
         self.nsfw_image_detector = NSFWImageDetector()
         self.violence_detector = ViolenceDetector()
         self.religious_hate_detector = ReligiousHateDetector()
+        self.clip_scorer = self.violence_detector.scorer
         self.ocr_extractor = OCRExtractor()
-        self.video_analyzer = VideoAnalyzer()
+        self.video_analyzer = VideoAnalyzer(
+            nsfw_detector=self.nsfw_image_detector,
+            violence_detector=self.violence_detector,
+            ocr_extractor=self.ocr_extractor,
+            religious_hate_detector=self.religious_hate_detector
+        )
+        self.image_pipeline = ImageAnalysisPipeline(
+            self.image_extractor,
+            self.nsfw_image_detector,
+            self.violence_detector,
+            self.religious_hate_detector,
+            self.ocr_extractor,
+            clip_scorer=self.clip_scorer
+        )
         self.social_media_analyzer = SocialMediaAnalyzer()
         self.risk_scorer = RiskScorer()
-    
+        self.document_aggregator = DocumentAggregator(
+            self.content_classifier,
+            toxic_threshold=self.toxicity_detector.TOXIC_THRESHOLD,
+            nsfw_threshold=self.nsfw_detector.NSFW_THRESHOLD
+        )
+        
+        # Each tier runs the zero-shot detectors on its own NLI model
+        self.tiers = load_tiers()
+        self.nli_engines = {}
+        for tier in self.tiers.values():
+            try:
+                self.nli_engines[tier.name] = get_nli_engine(tier.nli_model)
+            except Exception as e:
+                logger.error(f"NLI engine {tier.nli_model} for tier {tier.name} unavailable: {e}")
+                self.nli_engines[tier.name] = None
+        
+        # Concurrent requests share forward passes through per-model micro-batchers
+        self.batchers = {
+            "sentiment": MicroBatcher("sentiment", self.sentiment_analyzer.analyze_batch),
+            "toxicity": MicroBatcher("toxicity", self.toxicity_detector.detect_batch),
+            "hate_speech": MicroBatcher("hate_speech", self.hate_speech_detector.detect_batch),
+            "nsfw": MicroBatcher("nsfw", self.nsfw_detector.detect_batch)
+        }
+        for name, engine in self.nli_engines.items():
+            self.batchers[f"nli:{name}"] = MicroBatcher(
+                f"nli:{name}",
+                functools.partial(self._run_nli_batch, engine),
+                max_batch_size=settings.nli_batch_max_requests
+            )
+        self._register_cache_fingerprints()
+        self.graph = self._build_graph()
+
+    def warm_up(self):
+        """Run every text model once so the first real request is not slow"""
+        sample = "This is a short warm-up sentence used to initialise the analysis models."
+        self.sentiment_analyzer.analyze(sample)
+        self.toxicity_detector.detect(sample)
+        self.hate_speech_detector.detect(sample)
+        self.nsfw_detector.detect(sample)
+        for tier_name in self.tiers:
+            nli_results = self._run_nli(sample, tier_name)
+            self.content_classifier.classify(sample, nli_results)
+            self.intent_detector.detect(sample, nli_results)
+            self.misinformation_detector.detect(sample, nli_results)
+            self.social_media_analyzer.analyze_social_content(sample, "generic", nli_results)
+        logger.info("Analysis models warmed up")
+
     async def analyze(self, url: str, deep_analysis: bool = False):
         """Complete analysis pipeline"""
         try:
             # Step 1: Extract content
             logger.info(f"Starting analysis for {url}")
             extracted_data = await self.scraper.scrape(url)
-            
+        except Exception as e:
+            logger.error(f"Analysis failed: {str(e)}")
+            return self.error_report(url, str(e))
+        
+        return await self.analyze_extracted(url, extracted_data, deep_analysis)
+    
+    async def analyze_extracted(self, url: str, extracted_data: dict, deep_analysis: bool = False):
+        """Analysis pipeline for content that has already been scraped"""
+        try:
             text_content = extracted_data.get("text", "").strip()
             
             if not text_content or len(text_content) < 10:
@@ -60,76 +147,37 @@ class UniversalAnalysisDispatcher:
                     "message": "No meaningful text content found"
                 }
             
-            # Truncate for analysis
-            analysis_text = text_content[:512]
-            
-            # Step 2: Sentiment analysis
-            logger.info("Analyzing sentiment")
-            sentiment = self.sentiment_analyzer.analyze(analysis_text)
-            
-            # Step 3: Toxicity detection
-            logger.info("Detecting toxicity")
-            toxicity = self.toxicity_detector.detect(analysis_text)
-            
-            # Step 4: Hate speech detection
-            logger.info("Detecting hate speech")
-            hate_speech = self.hate_speech_detector.detect(analysis_text)
-            
-            # Step 5: Content classification
-            logger.info("Classifying content categories")
-            content_categories = self.content_classifier.classify(analysis_text)
-            
-            # Step 6: Intent detection
-            logger.info("Detecting intent")
-            intent = self.intent_detector.detect(analysis_text)
-            
-            # Step 7: NSFW detection
-            logger.info("Detecting NSFW content")
-            nsfw = self.nsfw_detector.detect(analysis_text)
+            # Normalised once for every detector; long documents are analysed as
+            # overlapping windows, up to a hard size cap
+            analysis_text = normalize_text(text_content)[:settings.document_max_chars]
+            tier = self.tiers[tier_for(deep_analysis)]
+            logger.info(f"Using {tier.name} analysis tier")
             
-            # Step 7.5: Misinformation detection
-            logger.info("Detecting misinformation")
-            misinformation = self.misinformation_detector.detect(analysis_text)
-            
-            # Step 7.6: Social media analysis
-            logger.info("Analyzing social media patterns")
-            platform = extracted_data.get("detected_platform", "unknown")
-            social_analysis = self.social_media_analyzer.analyze_social_content(analysis_text, platform)
-            
-            # Step 8: Image analysis with OCR text analysis
-            logger.info("Analyzing images")
-            image_analysis = []
-            try:
-                html = extracted_data.get('html', '')
-                base_url = extracted_data.get('base_url', url)
-                logger.info(f"HTML length: {len(html) if html else 0}, Base URL: {base_url}")
-                
-                if html:
-                    image_urls = self.image_extractor.extract_images(html, base_url)
-                    
-                    # Skip image analysis for faster response
-                    logger.info(f"Skipping image analysis for faster response. Found {len(image_urls)} images")
-                else:
-                    logger.warning("No HTML content available for image extraction")
-            except Exception as e:
-                logger.error(f"Image analysis failed: {str(e)}", exc_info=True)
-            
-
-            
-            # Step 10: Calculate risk score
-            analysis_data = {
-                "sentiment": sentiment,
-                "toxicity": toxicity,
-                "hate_speech": hate_speech,
-                "content_categories": content_categories,
-                "intent": intent,
-                "nsfw": nsfw,
-                "misinformation": misinformation,
-                "social_analysis": social_analysis,
-                "image_analysis": image_analysis
+            # Steps 1.5-10 run as a dependency graph: independent detectors run
+            # concurrently, batched with other in-flight requests, and conditional
+            # nodes are skipped when cheaper upstream results make them unnecessary
+            context = {
+                "url": url,
+                "text": analysis_text,
+                "platform": extracted_data.get("detected_platform", "unknown"),
+                "extracted_data": extracted_data,
+                "tier": tier
             }
+            context, timings = await self.graph.run(context)
             
-            risk_assessment = self.risk_scorer.calculate(analysis_data)
+            sentiment = context["sentiment"]
+            toxicity = context["toxicity"]
+            hate_speech = context["hate_speech"]
+            content_categories = context["content_categories"]
+            intent = context["intent"]
+            nsfw = context["nsfw"]
+            misinformation = context["misinformation"]
+            social_analysis = context["social_analysis"]
+            image_analysis = context["image_analysis"]
+            risk_assessment = context["risk_assessment"]
+            language_analysis = context["language_analysis"]
+            prescreen = context["prescreen"]
+            windows, total_windows = context["windows"]
             
             # Calculate combined risk
             image_risk = self._calculate_combined_image_risk(image_analysis)
@@ -138,10 +186,8 @@ class UniversalAnalysisDispatcher:
             combined_level = self._get_risk_level(combined_risk)
             
             # Step 11: Generate report
-            logger.info(f"Generating report with {len(image_analysis)} images, combined risk: {combined_risk}")
-            
-            # Detect language
-            language_analysis = self._detect_language(analysis_text)
+            analyzed_images = sum(1 for img in image_analysis if img.get("status") == "analyzed")
+            logger.info(f"Generating report with {analyzed_images}/{len(image_analysis)} images analyzed, combined risk: {combined_risk}")
             
             report = {
                 "analysis_id": str(uuid.uuid4()),
@@ -149,6 +195,13 @@ class UniversalAnalysisDispatcher:
                 "url": url,
                 "platform": extracted_data.get("detected_platform", "unknown"),
                 "status": "completed",
+                "analysis_tier": self._describe_tier(tier),
+                "prescreen": self._describe_prescreen(prescreen, timings["skipped"]),
+                "pipeline": timings,
+                "document": self._describe_document(
+                    windows, total_windows, len(text_content) > len(analysis_text),
+                    [sentiment, toxicity, hate_speech, content_categories, nsfw, misinformation]
+                ),
                 "metadata": {
                     "title": extracted_data.get("title", ""),
                     "author": extracted_data.get("author", ""),
@@ -182,13 +235,369 @@ class UniversalAnalysisDispatcher:
             
         except Exception as e:
             logger.error(f"Analysis failed: {str(e)}")
+            return self.error_report(url, str(e))
+    
+    def error_report(self, url: str, message: str):
+        """Report returned when a URL cannot be analyzed"""
+        return {
+            "analysis_id": str(uuid.uuid4()),
+            "timestamp": datetime.utcnow().isoformat(),
+            "url": url,
+            "status": "error",
+            "message": message
+        }
+    
+    def _nli_tasks(self, text: str):
+        """Every zero-shot detector's hypotheses for ``text``"""
+        return self.content_classifier.nli_tasks(text) + self._core_nli_tasks(text)
+    
+    def _core_nli_tasks(self, text: str):
+        """Hypotheses that always run; content categories are scored separately and may be skipped"""
+        return (
+            self.intent_detector.nli_tasks(text)
+            + self.misinformation_detector.nli_tasks(text)
+            + self.social_media_analyzer.nli_tasks(text)
+        )
+    
+    def _run_nli(self, text: str, tier_name: str = "deep"):
+        """Score every zero-shot detector's hypotheses for ``text`` in one batched pass"""
+        return self._run_nli_batch(self.nli_engines.get(tier_name), [self._nli_tasks(text)])[0]
+    
+    def _run_nli_batch(self, engine, task_lists: list):
+        """Fused NLI pass of ``engine`` over the task lists of several requests"""
+        if not engine or not any(task_lists):
+            return [{} for _ in task_lists]
+        try:
+            return engine.run_many(task_lists)
+        except Exception as e:
+            logger.error(f"Fused NLI scoring failed: {e}")
+            return [{} for _ in task_lists]
+    
+    def _register_cache_fingerprints(self):
+        """Tie each cache namespace to the models and thresholds currently loaded"""
+        fingerprints = {
+            "sentiment": self.sentiment_analyzer.cache_fingerprint(),
+            "toxicity": self.toxicity_detector.cache_fingerprint(),
+            "hate_speech": self.hate_speech_detector.cache_fingerprint(),
+            "nsfw": self.nsfw_detector.cache_fingerprint()
+        }
+        for tier_name, engine in self.nli_engines.items():
+            if not engine:
+                continue
+            # Raw NLI scores are cached; the detectors apply their thresholds afterwards
+            model = {"model": engine.model_id, "revision": engine.revision, "max_length": engine.max_length}
+            fingerprints[f"nli:{tier_name}"] = fingerprint(
+                **model,
+                intent=self.intent_detector.INTENT_LABELS,
+                misinformation=self.misinformation_detector.MISINFO_LABELS,
+                social=self.social_media_analyzer.SOCIAL_LABELS
+            )
+            fingerprints[f"nli:{tier_name}:categories"] = fingerprint(
+                **model, categories=self.content_classifier.CATEGORY_HYPOTHESES
+            )
+        for name, detector_fingerprint in fingerprints.items():
+            if detector_fingerprint:
+                try:
+                    inference_cache.register(name, detector_fingerprint)
+                except Exception as e:
+                    logger.warning(f"Inference cache unavailable for {name}: {e}")
+        
+        # Image results are reused across near-duplicate images while the image models are unchanged
+        nsfw_classifier = self.nsfw_image_detector.classifier
+        try:
+            image_hash_cache.register(fingerprint(
+                nsfw_model=self.nsfw_image_detector.MODEL_ID,
+                nsfw_revision=nsfw_classifier.revision if nsfw_classifier else None,
+                clip_model=self.clip_scorer.model_id if self.clip_scorer else None,
+                clip_backend=self.clip_scorer.encoder.backend if self.clip_scorer else None,
+                clip_revision=self.clip_scorer.encoder.revision if self.clip_scorer else None,
+                violence=self.violence_detector.VIOLENCE_LABELS + self.violence_detector.HATE_LABELS
+                + self.violence_detector.SPAM_LABELS + self.violence_detector.SAFE_LABELS,
+                religious=self.religious_hate_detector.SYMBOL_LABELS + self.religious_hate_detector.HATE_LABELS
+                + self.religious_hate_detector.EXTREMIST_LABELS,
+                ocr_gate=[self.ocr_extractor.TEXT_LABELS, self.ocr_extractor.NO_TEXT_LABELS,
+                          settings.ocr_text_gate_enabled, settings.ocr_text_gate_threshold]
+            ))
+        except Exception as e:
+            logger.warning(f"Image hash cache unavailable: {e}")
+    
+    async def _cached_submit(self, name: str, text: str, item=None, batcher: str = None):
+        """Cached output of detector ``name`` for ``text``, batching the model call on a miss"""
+        cached = await inference_executor.run_io(inference_cache.get, name, text)
+        if cached is not None:
+            return cached
+        
+        result = await self.batchers[batcher or name].submit(text if item is None else item)
+        # Never persist the defaults detectors return when inference failed
+        if (name.startswith("nli:") and not result) or (name == "nsfw" and "scores" not in result):
+            return result
+        await inference_executor.run_io(inference_cache.put, name, text, result)
+        return result
+    
+    def _build_graph(self):
+        """Analysis stages as a dependency graph; costs are rough relative CPU times"""
+        text_nodes = ["sentiment", "toxicity", "hate_speech", "content_categories", "intent",
+                      "nsfw", "misinformation", "social_analysis"]
+        skipped = lambda name: functools.partial(self._skipped_result, name)
+        return DetectorGraph([
+            # Step 1.5: Lexicon + linear pre-screen; confidently safe text skips the NLI detectors
+            DetectorNode("prescreen", self._node_prescreen, cost=0.05),
+            # Token-aware windows over the document; short text is a single window
+            DetectorNode("windows", self._node_windows, cost=0.1),
+            # Step 2: Sentiment analysis
+            DetectorNode("sentiment", functools.partial(self._node_windowed, "sentiment"), inputs=["windows"], cost=1.0),
+            # Step 3: Toxicity detection
+            DetectorNode("toxicity", functools.partial(self._node_windowed, "toxicity"), inputs=["windows"], cost=1.0),
+            # Step 4: Hate speech detection
+            DetectorNode("hate_speech", functools.partial(self._node_windowed, "hate_speech"), inputs=["windows"],
+                         cost=1.5),
+            # Step 7: NSFW detection
+            DetectorNode("nsfw", functools.partial(self._node_windowed, "nsfw"), inputs=["prescreen", "windows"],
+                         cost=2.0, skip_if=self._prescreen_safe, on_skip=skipped("nsfw")),
+            # Steps 6, 7.5, 7.6 share one fused zero-shot pass of the tier's model
+            DetectorNode("nli", self._node_nli, inputs=["prescreen", "windows"], cost=6.0,
+                         skip_if=self._prescreen_safe, on_skip=lambda ctx: []),
+            # Step 6: Intent detection
+            DetectorNode("intent", self._node_intent, inputs=["nli"], cost=0.01,
+                         skip_if=self._prescreen_safe, on_skip=skipped("intent")),
+            # Step 7.5: Misinformation detection
+            DetectorNode("misinformation", self._node_misinformation, inputs=["nli"], cost=0.01,
+                         skip_if=self._prescreen_safe, on_skip=skipped("misinformation")),
+            # Step 7.6: Social media analysis
+            DetectorNode("social_analysis", self._node_social, inputs=["nli"], cost=0.01,
+                         skip_if=self._prescreen_safe, on_skip=skipped("social_analysis")),
+            # Step 5: Content classification, unnecessary for plain low-harm reporting
+            DetectorNode("content_categories", self._node_content_categories,
+                         inputs=["prescreen", "windows", "intent", "toxicity", "hate_speech"], cost=4.0,
+                         skip_if=self._skip_content_categories, on_skip=skipped("content_categories")),
+            # Step 8: Image analysis with OCR within a time budget, deep tier only
+            DetectorNode("image_analysis", self._node_images, cost=8.0,
+                         skip_if=lambda ctx: not ctx["tier"].images, on_skip=lambda ctx: []),
+            # Step 10: Calculate risk score
+            DetectorNode("risk_assessment", self._node_risk, inputs=text_nodes + ["image_analysis"], cost=0.01),
+            # Detect language
+            DetectorNode("language_analysis", lambda ctx: inference_executor.run(self._detect_language, ctx["text"]),
+                         cost=0.2)
+        ])
+    
+    async def _node_prescreen(self, ctx):
+        if not settings.prescreen_enabled:
+            return None
+        return prescreener.screen(ctx["text"])
+    
+    async def _node_windows(self, ctx):
+        classifier = self.sentiment_analyzer.classifier
+        return await inference_executor.run(
+            split_windows, ctx["text"], getattr(classifier, "tokenizer", None), lock=getattr(classifier, "lock", None)
+        )
+    
+    async def _node_windowed(self, name: str, ctx):
+        """Detector ``name`` over every window, batched together, pooled into one result"""
+        windows = ctx["windows"][0]
+        results = await asyncio.gather(*(self._cached_submit(name, window.text) for window in windows))
+        return self.document_aggregator.aggregate(name, list(results), windows)
+    
+    async def _node_nli(self, ctx):
+        """Per-window zero-shot scores; the windows join the same fused batches"""
+        tier_name = ctx["tier"].name
+        return list(await asyncio.gather(*(
+            self._cached_submit(f"nli:{tier_name}", window.text, self._core_nli_tasks(window.text))
+            for window in ctx["windows"][0]
+        )))
+    
+    async def _node_intent(self, ctx):
+        windows = ctx["windows"][0]
+        results = [self.intent_detector.detect(window.text, nli) for window, nli in zip(windows, ctx["nli"])]
+        return self.document_aggregator.aggregate("intent", results, windows)
+    
+    async def _node_misinformation(self, ctx):
+        windows = ctx["windows"][0]
+        results = [self.misinformation_detector.detect(window.text, nli) for window, nli in zip(windows, ctx["nli"])]
+        return self.document_aggregator.aggregate("misinformation", results, windows)
+    
+    async def _node_social(self, ctx):
+        windows = ctx["windows"][0]
+        results = [
+            self.social_media_analyzer.analyze_social_content(window.text, ctx["platform"], nli)
+            for window, nli in zip(windows, ctx["nli"])
+        ]
+        return self.document_aggregator.aggregate("social_analysis", results, windows)
+    
+    async def _node_content_categories(self, ctx):
+        tier_name = ctx["tier"].name
+        windows = ctx["windows"][0]
+        nli_results = await asyncio.gather(*(
+            self._cached_submit(
+                f"nli:{tier_name}:categories",
+                window.text,
+                self.content_classifier.nli_tasks(window.text),
+                batcher=f"nli:{tier_name}"
+            )
+            for window in windows
+        ))
+        results = [self.content_classifier.classify(window.text, nli) for window, nli in zip(windows, nli_results)]
+        return self.document_aggregator.aggregate("content_categories", results, windows)
+    
+    async def _node_images(self, ctx):
+        image_analysis = []
+        try:
+            html = ctx["extracted_data"].get('html', '')
+            base_url = ctx["extracted_data"].get('base_url', ctx["url"])
+            logger.info(f"HTML length: {len(html) if html else 0}, Base URL: {base_url}")
+            
+            if html:
+                image_urls = self.image_extractor.extract_images(html, base_url)
+                image_analysis = await self.image_pipeline.analyze(image_urls[:ctx["tier"].max_images], ocr=ctx["tier"].ocr)
+                analyzed = [entry for entry in image_analysis if entry["status"] == "analyzed"]
+                ocr_analyses = await self._analyze_ocr_texts([entry["ocr"] for entry in analyzed])
+                for entry, ocr_analysis in zip(analyzed, ocr_analyses):
+                    entry["ocr_analysis"] = ocr_analysis
+                    entry["image_risk_score"] = self._calculate_image_risk(
+                        entry["nsfw"], entry["violence"], entry["religious_hate"], entry["ocr"], ocr_analysis
+                    )
+            else:
+                logger.warning("No HTML content available for image extraction")
+        except Exception as e:
+            logger.error(f"Image analysis failed: {str(e)}", exc_info=True)
+        return image_analysis
+    
+    async def _analyze_ocr_texts(self, ocr_results: list) -> list:
+        """Text detectors and risk score for each image's OCR text, None where there is too little text.
+        
+        Every distinct caption of the page is submitted at once, so each model
+        sees them in one micro-batch; reposted captions come from the
+        inference cache and identical ones within the page run once.
+        """
+        texts = [normalize_text(ocr.get("text", "")) if ocr else "" for ocr in ocr_results]
+        unique = [text for text in dict.fromkeys(texts) if len(text) > 10]
+        if not unique:
+            return [None] * len(texts)
+        
+        names = ("sentiment", "toxicity", "hate_speech", "nsfw")
+        try:
+            outputs = await asyncio.gather(*(
+                self._cached_submit(name, text) for text in unique for name in names
+            ))
+        except Exception as e:
+            logger.error(f"OCR text analysis failed: {e}")
+            return [None] * len(texts)
+        
+        analyses = {}
+        for i, text in enumerate(unique):
+            results = dict(zip(names, outputs[i * len(names):(i + 1) * len(names)]))
+            analyses[text] = {
+                **results,
+                "text_length": len(text),
+                "risk_assessment": self.risk_scorer.calculate(results)
+            }
+        return [analyses.get(text) for text in texts]
+    
+    async def _node_risk(self, ctx):
+        analysis_data = {
+            "sentiment": ctx["sentiment"],
+            "toxicity": ctx["toxicity"],
+            "hate_speech": ctx["hate_speech"],
+            "content_categories": ctx["content_categories"],
+            "intent": ctx["intent"],
+            "nsfw": ctx["nsfw"],
+            "misinformation": ctx["misinformation"],
+            "social_analysis": ctx["social_analysis"],
+            "image_analysis": ctx["image_analysis"]
+        }
+        return self.risk_scorer.calculate(analysis_data)
+    
+    def _prescreen_safe(self, ctx) -> bool:
+        prescreen = ctx.get("prescreen")
+        return bool(prescreen and prescreen["safe"])
+    
+    def _skip_content_categories(self, ctx) -> bool:
+        """Fine-grained categories add nothing to confidently reported, low-harm text"""
+        if self._prescreen_safe(ctx):
+            return True
+        intent = ctx["intent"]
+        return (
+            intent.get("intent") == "reporting"
+            and intent.get("confidence", 0) >= self.REPORTING_CONFIDENCE
+            and self._is_low_harm(ctx["toxicity"], "is_toxic")
+            and self._is_low_harm(ctx["hate_speech"], "is_hate_speech")
+        )
+    
+    def _is_low_harm(self, result: dict, flag: str) -> bool:
+        return not result.get(flag) or result.get("confidence", 0) < self.LOW_HARM_CONFIDENCE
+    
+    def _skipped_result(self, name: str, ctx):
+        """Stand-in result of a detector the graph skipped"""
+        if name == "nsfw":
+            return {"is_nsfw": False, "confidence": 0.0, "categories": [], "skipped": True}
+        if name == "content_categories":
+            return {**self.content_classifier._get_default_result(), "skipped": True}
+        if name == "intent":
+            return {"intent": "unknown", "confidence": 0.0, "skipped": True}
+        if name == "misinformation":
+            return {"is_misinformation": False, "confidence": 0.0, "skipped": True}
+        if name == "social_analysis":
             return {
-                "analysis_id": str(uuid.uuid4()),
-                "timestamp": datetime.utcnow().isoformat(),
-                "url": url,
-                "status": "error",
-                "message": str(e)
+                "social_patterns": [],
+                "engagement_intent": self.social_media_analyzer._determine_engagement_intent(ctx["text"], ctx["platform"]),
+                "platform_specific": self.social_media_analyzer._platform_specific_analysis(ctx["text"], ctx["platform"]),
+                "skipped": True
             }
+        return None
+    
+    def _describe_prescreen(self, prescreen, skipped_nodes: list):
+        if prescreen is None:
+            return {"enabled": False}
+        return {
+            "enabled": True,
+            "safe": prescreen["safe"],
+            "harm_probability": prescreen["harm_probability"],
+            "lexicon_hits": prescreen["lexicon_hits"],
+            "skipped_detectors": [name for name in skipped_nodes if name != "nli"] if prescreen["safe"] else []
+        }
+    
+    def _describe_document(self, windows: list, total_windows: int, truncated: bool, results: list):
+        """Windows analysed and the spans that crossed a detector's threshold"""
+        spans = [span for result in results for span in result.get("document", {}).get("offending_spans", [])]
+        return {
+            "windows": len(windows),
+            "total_windows": total_windows,
+            "truncated": truncated or total_windows > len(windows),
+            "pooling": self.document_aggregator.pooling,
+            "offending_spans": sorted(spans, key=lambda span: (span["start"], -span["score"]))
+        }
+    
+    def _describe_tier(self, tier):
+        """The tier and the models that produced a report"""
+        models = {
+            "sentiment": self.sentiment_analyzer.MODEL_ID,
+            "toxicity": self.toxicity_detector.MODEL_ID,
+            "hate_speech": self.hate_speech_detector.MODEL_ID,
+            "nsfw": self.nsfw_detector.MODEL_ID,
+            "zero_shot": tier.nli_model
+        }
+        if tier.images:
+            models["nsfw_image"] = self.nsfw_image_detector.MODEL_ID
+            models["clip"] = self.clip_scorer.model_id if self.clip_scorer else None
+        if tier.ocr:
+            models["ocr"] = "easyocr"
+        return {"name": tier.name, "models": models}
+    
+    def batch_stats(self):
+        return {name: batcher.stats() for name, batcher in self.batchers.items()}
+    
+    async def close(self):
+        for batcher in self.batchers.values():
+            await batcher.close()
+    
+    def score_image_with_clip(self, image):
+        """Embed ``image`` once and score every registered CLIP label set against it"""
+        if not self.clip_scorer or image is None:
+            return None
+        try:
+            return self.clip_scorer.score_images([image])[0]
+        except Exception as e:
+            logger.error(f"CLIP scoring failed: {e}")
+            return None
     
     def _generate_summary(self, risk, sentiment, toxicity, hate_speech, content_categories, intent, nsfw, image_analysis):
         """Generate human-readable summary"""
@@ -253,9 +662,8 @@ class UniversalAnalysisDispatcher:
         return " ".join(summary_parts) if summary_parts else "Content analyzed successfully."
     
     def _calculate_combined_image_risk(self, image_analysis):
-        if not image_analysis:
-            return 0
-        scores = [img.get('image_risk_score', 0) for img in image_analysis]
+        # Images that missed the budget are reported but not scored
+        scores = [img['image_risk_score'] for img in image_analysis if img.get('status') == 'analyzed']
         return int(sum(scores) / len(scores)) if scores else 0
     
     def _calculate_image_risk(self, nsfw, violence, religious_hate, ocr, ocr_analysis):